@@ -7,6 +7,9 @@ load_dotenv()
 
 from utils.data_loader import load_data
 from utils.openrouter_client import init_openrouter_client
+from utils.mail_outbox import ensure_outbox_worker
+from utils.metrics import ensure_metrics_server
+from db.database import STORAGE_BACKEND
 
 from components.sidebar import render_sidebar
 from components.expander import render_expanders
@@ -15,6 +18,9 @@ from components.base_invitation import render_base_invitation_section
 from components.company_info import render_company_info_section
 from components.generate_ainvite import render_generate_section
 from components.display_ainvite import render_generated_mail_display
+from components.bulk_campaign import render_bulk_campaign_section
+from components.mail_history import render_mail_history_section
+from components.admin_panel import render_admin_panel
 
 from components.login_ui import render_login_form
 from utils.session_manager import is_user_logged_in, get_current_user, clear_user_session
@@ -32,12 +38,13 @@ def handle_logout():
 
 def render_main_app():
     # Check if required environment variables are set
-    if not os.getenv("SUPABASE_URL") or not os.getenv("SUPABASE_KEY"):
+    if STORAGE_BACKEND == "supabase" and (not os.getenv("SUPABASE_URL") or not os.getenv("SUPABASE_KEY")):
         st.error("❌ Supabase configuration missing. Please check SUPABASE_URL and SUPABASE_KEY in environment variables.")
         return
     
     data = load_data()
     coordinators = data.get('coordinators', [])
+    coordinator_index = data.get('coordinator_index')
     base_message_template = data.get('base_message', '')
     
     if not coordinators:
@@ -46,6 +53,10 @@ def render_main_app():
     
     client = init_openrouter_client()
     
+    # Resume delivery of anything still queued from a previous run
+    ensure_outbox_worker()
+    ensure_metrics_server()
+    
     current_user = get_current_user()
     
     col1, col2 = st.columns([3, 1])
@@ -68,7 +79,7 @@ def render_main_app():
     
     st.divider()
     
-    company_name, selected_coordinator, additional_info, num_bullet_points = render_company_info_section(coordinators)
+    company_name, selected_coordinator, additional_info, num_bullet_points = render_company_info_section(coordinator_index)
     
     st.divider()
     
@@ -78,6 +89,14 @@ def render_main_app():
     
     render_generated_mail_display(company_name, selected_coordinator)
     
+    st.divider()
+    
+    render_bulk_campaign_section(coordinators, base_message, client)
+    
+    render_mail_history_section(current_user)
+    
+    render_admin_panel(current_user)
+    
     render_sidebar(selected_coordinator, company_name)
     render_expanders()
     render_footer_markdown()
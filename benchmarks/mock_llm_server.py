@@ -0,0 +1,202 @@
+"""OpenAI-compatible stand-in for OpenRouter, for offline benchmarks.
+
+Serves POST /v1/chat/completions (plain and SSE streaming) with configurable
+latency and error injection. Generation requests get a well-formed invitation
+with the requested bullet count; validation requests get their draft back.
+
+    python -m benchmarks.mock_llm_server --port 8099 --latency lognormal:0.8:0.4 --error-rate 0.05
+"""
+import re
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CANNED_SKILLS = [
+    "Data Science & Analytics",
+    "Machine Learning & AI",
+    "Cloud & DevOps",
+    "Web and App Development",
+    "Embedded Systems",
+    "Database Management",
+    "Cybersecurity",
+]
+
+class LatencyModel:
+    """Response delay in seconds: 'fixed:S', 'uniform:LO:HI' or 'lognormal:MEDIAN:SIGMA'"""
+
+    def __init__(self, spec="fixed:0"):
+        kind, *params = spec.split(':')
+        self.kind = kind
+        self.params = [float(p) for p in params]
+        if kind not in ('fixed', 'uniform', 'lognormal'):
+            raise ValueError(f"Unknown latency distribution: {spec}")
+
+    def sample(self):
+        if self.kind == 'fixed':
+            return self.params[0] if self.params else 0.0
+        if self.kind == 'uniform':
+            return random.uniform(*self.params)
+        median, sigma = self.params
+        return random.lognormvariate(0, sigma) * median
+
+def _field(prompt, name, default=""):
+    match = re.search(rf'^{name}:\s*(.+)$', prompt, re.MULTILINE)
+    return match.group(1).strip() if match else default
+
+def canned_invitation(prompt):
+    company = _field(prompt, "Company", "your organization")
+    bullets_match = re.search(r'\d+', _field(prompt, "Bullets", "6"))
+    bullets = int(bullets_match.group()) if bullets_match else 6
+
+    skills = "\n".join(f"✅ {skill}" for skill in (CANNED_SKILLS * 2)[:bullets])
+    return f"""Dear Recruitment Team,
+Greetings from the Jadavpur University Placement Cell!
+
+We are excited to invite {company} to participate in our Campus Recruitment Drive for the 2026 graduating batch. Your work across engineering and analytics makes {company} a natural partner for our students, and we would be delighted to host your team on campus this season.
+
+Being a NAAC A-Grade Tier-1 institution and consistently ranked among the top engineering and research universities in India (NIRF 2024: 2nd State University, 12th in Engineering), our students bring strong expertise across:
+
+{skills}
+
+Our graduates combine strong fundamentals with hands-on project experience, and they are well prepared to contribute to {company} from day one.
+
+For coordination, please feel free to reach out:
+📧 Email: officer.placement@jadavpuruniversity.in, jupgcsit2026@gmail.com
+📧 CC: [COORDINATOR_EMAIL]
+
+We look forward to a fruitful collaboration with {company}!
+
+Best Regards,
+[COORDINATOR_NAME]
+Placement Coordinator, [COORDINATOR_DEPARTMENT]
+Jadavpur Placement Cell
+📞 [COORDINATOR_PHONE]"""
+
+def canned_response(messages):
+    prompt = messages[-1].get('content', '') if messages else ''
+    if "EMAIL:\n" in prompt:
+        return prompt.split("EMAIL:\n", 1)[1]
+    return canned_invitation(prompt)
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this delayed ACKs add ~40ms per response
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        config = self.server.config
+        request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        with self.server.counter_lock:
+            self.server.requests += 1
+
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send_json(404, {'error': {'message': f'Unknown path {self.path}'}})
+            return
+
+        time.sleep(config['latency'].sample())
+
+        if random.random() < config['error_rate']:
+            status = random.choice(config['error_statuses'])
+            headers = {'Retry-After': str(config['retry_after'])} if status == 429 else None
+            self._send_json(status, {'error': {'message': 'Injected failure', 'code': status}}, headers)
+            return
+
+        content = canned_response(request.get('messages', []))
+        prompt_tokens = sum(len(m.get('content', '')) for m in request.get('messages', [])) // 4
+        completion_tokens = len(content) // 4
+        base = {'id': f"mock-{self.server.requests}", 'created': int(time.time()), 'model': request.get('model', 'mock')}
+
+        if request.get('stream'):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Connection', 'close')
+            self.end_headers()
+
+            words = re.findall(r'\S+\s*|\s+', content)
+            for word in words:
+                chunk = dict(base, object='chat.completion.chunk', choices=[
+                    {'index': 0, 'delta': {'content': word}, 'finish_reason': None}
+                ])
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+                if config['token_delay']:
+                    self.wfile.flush()
+                    time.sleep(config['token_delay'])
+
+            final = dict(base, object='chat.completion.chunk', choices=[{'index': 0, 'delta': {}, 'finish_reason': 'stop'}])
+            self.wfile.write(f"data: {json.dumps(final)}\n\n".encode('utf-8'))
+            if (request.get('stream_options') or {}).get('include_usage'):
+                usage_chunk = dict(base, object='chat.completion.chunk', choices=[], usage={
+                    'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                    'total_tokens': prompt_tokens + completion_tokens
+                })
+                self.wfile.write(f"data: {json.dumps(usage_chunk)}\n\n".encode('utf-8'))
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+            self.close_connection = True
+            return
+
+        self._send_json(200, dict(
+            base,
+            object='chat.completion',
+            choices=[{'index': 0, 'message': {'role': 'assistant', 'content': content}, 'finish_reason': 'stop'}],
+            usage={'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                   'total_tokens': prompt_tokens + completion_tokens}
+        ))
+
+def start_mock_server(host="127.0.0.1", port=0, latency="fixed:0", error_rate=0.0, error_statuses=(429, 500, 503),
+                      retry_after=1, token_delay=0.0):
+    """Start the server on a background thread; returns it (base URL in server.base_url)"""
+    server = ThreadingHTTPServer((host, port), MockLLMHandler)
+    server.daemon_threads = True
+    server.config = {
+        'latency': LatencyModel(latency),
+        'error_rate': error_rate,
+        'error_statuses': list(error_statuses),
+        'retry_after': retry_after,
+        'token_delay': token_delay,
+    }
+    server.requests = 0
+    server.counter_lock = threading.Lock()
+    server.base_url = f"http://{host}:{server.server_address[1]}/v1"
+
+    threading.Thread(target=server.serve_forever, name="mock-llm-server", daemon=True).start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8099)
+    parser.add_argument('--latency', default='fixed:0.5', help="fixed:S, uniform:LO:HI or lognormal:MEDIAN:SIGMA")
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--retry-after', type=float, default=1)
+    parser.add_argument('--token-delay', type=float, default=0.0, help="Seconds between streamed tokens")
+    args = parser.parse_args()
+
+    server = start_mock_server(args.host, args.port, args.latency, args.error_rate,
+                               retry_after=args.retry_after, token_delay=args.token_delay)
+    print(f"Mock LLM server listening on {server.base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+"""End-to-end generation benchmark against the local mock LLM server.
+
+Drives the real pipeline - create_improved_prompt -> completion ->
+create_validation_prompt -> completion -> post_process_mail - at each
+concurrency level and reports p50/p95/p99 latency and throughput, overall and
+per stage. Run from the repository root:
+
+    python -m benchmarks.run_benchmark --concurrency 1 4 16 --requests 64 --latency lognormal:0.8:0.4
+
+Pass --base-url to benchmark another OpenAI-compatible server instead of the
+built-in mock.
+"""
+import os
+import sys
+import time
+import tempfile
+import argparse
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+
+# Keep benchmark completions out of the real generation cache
+os.environ.setdefault("GENERATION_CACHE_PATH", os.path.join(tempfile.mkdtemp(prefix="letsconnect-bench-"), "cache.sqlite3"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openai import OpenAI
+
+from benchmarks.mock_llm_server import start_mock_server
+from utils.async_openrouter import get_resilient_client, percentile
+from utils.invitation_generator import generate_initial_draft, validate_draft, finalize_invitation
+
+BENCHMARK_COORDINATOR = {
+    'name': "Benchmark Coordinator",
+    'phone': "+91 90000 00000",
+    'email': "benchmark.coordinator@example.com",
+    'department': "MCA",
+}
+
+BENCHMARK_COMPANIES = [
+    ("Tata Consultancy Services", "IT services and consulting"),
+    ("Infosys", "Digital transformation and cloud"),
+    ("Razorpay", "Fintech payments platform"),
+    ("Zomato", "Food delivery and consumer internet"),
+    ("Siemens", "Industrial automation and embedded systems"),
+    ("Flipkart", "E-commerce at scale"),
+    ("Deloitte", ""),
+    ("Freshworks", "SaaS customer engagement"),
+]
+
+STAGES = ('generate', 'validate', 'post_process')
+
+def run_pipeline(client, index, num_bullet_points, stream):
+    """One invitation through every stage; returns per-stage and total seconds"""
+    company_name, additional_info = BENCHMARK_COMPANIES[index % len(BENCHMARK_COMPANIES)]
+    # Vary the name so no two requests share a prompt
+    company_name = f"{company_name} {index}"
+    on_token = (lambda text: None) if stream else None
+    timings = {}
+
+    started = time.perf_counter()
+    draft, _ = generate_initial_draft(
+        client, company_name, BENCHMARK_COORDINATOR, additional_info, "", num_bullet_points,
+        force_regenerate=True, on_token=on_token
+    )
+    timings['generate'] = time.perf_counter() - started
+
+    stage_started = time.perf_counter()
+    validated, _ = validate_draft(client, draft, company_name, BENCHMARK_COORDINATOR, num_bullet_points, force_regenerate=True)
+    timings['validate'] = time.perf_counter() - stage_started
+
+    stage_started = time.perf_counter()
+    finalize_invitation(validated, company_name, BENCHMARK_COORDINATOR, num_bullet_points)
+    timings['post_process'] = time.perf_counter() - stage_started
+
+    timings['total'] = time.perf_counter() - started
+    return timings
+
+def run_level(client, concurrency, requests, num_bullet_points, stream):
+    def task(index):
+        try:
+            return run_pipeline(client, index, num_bullet_points, stream)
+        except Exception as e:
+            return {'error': str(e)}
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(task, range(requests)))
+    elapsed = time.perf_counter() - started
+
+    succeeded = [r for r in results if 'error' not in r]
+    return {
+        'concurrency': concurrency,
+        'requests': requests,
+        'errors': len(results) - len(succeeded),
+        'elapsed': elapsed,
+        'throughput': len(succeeded) / elapsed if elapsed else 0.0,
+        'latency': {
+            stage: [r[stage] for r in succeeded]
+            for stage in STAGES + ('total',)
+        },
+        'first_error': next((r['error'] for r in results if 'error' in r), None),
+    }
+
+def _ms(seconds):
+    return "-" if seconds is None else f"{seconds * 1000:.1f}"
+
+def print_report(levels):
+    print()
+    print(f"{'conc':>5} {'reqs':>5} {'errs':>5} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for level in levels:
+        total = level['latency']['total']
+        print(f"{level['concurrency']:>5} {level['requests']:>5} {level['errors']:>5} {level['throughput']:>8.2f} "
+              f"{_ms(percentile(total, 0.5)):>9} {_ms(percentile(total, 0.95)):>9} {_ms(percentile(total, 0.99)):>9}")
+
+    print()
+    print("Per stage (p50 / p95 / p99 ms):")
+    for level in levels:
+        parts = []
+        for stage in STAGES:
+            samples = level['latency'][stage]
+            parts.append(f"{stage} {_ms(percentile(samples, 0.5))} / {_ms(percentile(samples, 0.95))} / {_ms(percentile(samples, 0.99))}")
+        print(f"  concurrency {level['concurrency']}: " + "; ".join(parts))
+        if level['first_error']:
+            print(f"    first error: {level['first_error']}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--requests', type=int, default=32, help="Invitations per concurrency level")
+    parser.add_argument('--bullets', type=int, default=6)
+    parser.add_argument('--stream', action='store_true', help="Stream the generation call like the UI does")
+    parser.add_argument('--latency', default='lognormal:0.3:0.5', help="Mock latency: fixed:S, uniform:LO:HI or lognormal:MEDIAN:SIGMA")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Share of mock responses that fail with 429/500/503")
+    parser.add_argument('--retry-after', type=float, default=0.2, help="Retry-After sent with injected 429s")
+    parser.add_argument('--token-delay', type=float, default=0.0, help="Seconds between streamed tokens")
+    parser.add_argument('--base-url', help="Benchmark this server instead of starting the mock")
+    parser.add_argument('--verbose', action='store_true', help="Show the pipeline's own log lines")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        server = start_mock_server(latency=args.latency, error_rate=args.error_rate,
+                                   retry_after=args.retry_after, token_delay=args.token_delay)
+        base_url = server.base_url
+        print(f"Mock LLM server on {base_url} (latency {args.latency}, error rate {args.error_rate:.0%})")
+
+    client = OpenAI(base_url=base_url, api_key=os.getenv("OPENROUTER_API_KEY", "benchmark"))
+
+    levels = []
+    for concurrency in args.concurrency:
+        print(f"Running {args.requests} invitations at concurrency {concurrency}...")
+        with contextlib.redirect_stdout(sys.stdout if args.verbose else open(os.devnull, 'w')):
+            levels.append(run_level(client, concurrency, args.requests, args.bullets, args.stream))
+
+    print_report(levels)
+
+    stats = get_resilient_client(client).stats()
+    print()
+    print(f"Resilient client: {stats['calls']} calls, {stats['retries']} retries, "
+          f"{stats['hedges']} hedges ({stats['hedge_wins']} won), {stats['deadline_exceeded']} deadlines exceeded")
+    if server:
+        print(f"Mock server handled {server.requests} HTTP requests")
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
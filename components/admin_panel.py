@@ -0,0 +1,76 @@
+import os
+import streamlit as st
+from utils.async_openrouter import percentile
+from utils.tracing import get_tracer, RingBufferSink, PrometheusSink, LATENCY_BUCKETS
+
+def get_admin_emails():
+    return {e.strip().lower() for e in os.getenv("ADMIN_EMAILS", "").split(",") if e.strip()}
+
+def is_admin(current_user):
+    return bool(current_user) and (current_user.get('email') or '').lower() in get_admin_emails()
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 1)
+
+def _bucket_label(bound):
+    return f"≤{bound * 1000:g}ms" if bound < 1 else f"≤{bound:g}s"
+
+def latency_histogram(durations, buckets=LATENCY_BUCKETS):
+    """Span counts per latency bucket, with a final overflow bucket"""
+    counts = [0] * (len(buckets) + 1)
+    for duration in durations:
+        index = next((i for i, bound in enumerate(buckets) if duration <= bound), len(buckets))
+        counts[index] += 1
+    labels = [_bucket_label(b) for b in buckets] + [f">{buckets[-1]:g}s"]
+    # Charts sort categories alphabetically; the index prefix keeps buckets in order
+    return {'Latency': [f"{i:02d} {label}" for i, label in enumerate(labels)], 'Spans': counts}
+
+def render_admin_panel(current_user):
+    """Per-stage latency of recent requests; only shown to ADMIN_EMAILS"""
+    if not is_admin(current_user):
+        return
+
+    with st.expander("🛠️ Admin: Pipeline Latency"):
+        tracer = get_tracer()
+        ring_buffer = tracer.find_sink(RingBufferSink)
+
+        if ring_buffer is None:
+            st.info("Add 'memory' to TRACE_SINKS to see recent spans here.")
+            return
+
+        spans = ring_buffer.spans()
+        if not spans:
+            st.info("No spans recorded yet - generate or send an invitation first.")
+            return
+
+        stages = {}
+        for span in spans:
+            stages.setdefault(span['name'], []).append(span)
+
+        st.dataframe(
+            [
+                {
+                    'Stage': name,
+                    'Calls': len(stage_spans),
+                    'Errors': sum(1 for s in stage_spans if not s['ok']),
+                    'p50 (ms)': _ms(percentile([s['duration'] for s in stage_spans], 0.5)),
+                    'p95 (ms)': _ms(percentile([s['duration'] for s in stage_spans], 0.95)),
+                    'p99 (ms)': _ms(percentile([s['duration'] for s in stage_spans], 0.99)),
+                    'Max (ms)': _ms(max(s['duration'] for s in stage_spans)),
+                }
+                for name, stage_spans in sorted(stages.items())
+            ],
+            use_container_width=True
+        )
+        st.caption(f"Last {len(spans)} spans since startup")
+
+        stage = st.selectbox("Stage", options=sorted(stages), key="admin_trace_stage")
+        st.bar_chart(latency_histogram([s['duration'] for s in stages[stage]]), x='Latency', y='Spans')
+
+        errors = [s for s in stages[stage] if not s['ok']][-5:]
+        for span in reversed(errors):
+            st.caption(f"❌ {span['error']} {span['attributes']}")
+
+        prometheus = tracer.find_sink(PrometheusSink)
+        if prometheus and st.checkbox("Show Prometheus exposition", key="admin_show_prometheus"):
+            st.code(prometheus.render(), language="text")
@@ -1,4 +1,6 @@
 import streamlit as st
+from utils.template_engine import TemplateError
+from utils.invitation_templates import compile_base_message, BASE_MESSAGE_PLACEHOLDERS
 
 def render_base_invitation_section(base_message_template):
     """Render the Base Invitation Message section"""
@@ -9,7 +11,12 @@ def render_base_invitation_section(base_message_template):
         label="Base Invitation Message",
         value=base_message_template,
         height=400,
-        help="Use placeholders like {company_name}, {name}, {contact}, {cc_email} for personalization"
+        help="Use placeholders like {company_name}, {name}, {contact}, {cc_email}, {department} for personalization"
     )
     
+    try:
+        compile_base_message(base_message)
+    except TemplateError as e:
+        st.warning(f"⚠️ {e}. Allowed: {', '.join('{' + p + '}' for p in BASE_MESSAGE_PLACEHOLDERS)}")
+    
     return base_message
\ No newline at end of file
@@ -0,0 +1,242 @@
+import os
+import re
+import json
+import streamlit as st
+from utils.batch_generator import parse_batch_file, run_batch_generation, load_results, resolve_coordinator, DEFAULT_MAX_WORKERS
+from utils.email_sender import queue_email_with_env_credentials
+from utils.mail_outbox import get_mail_outbox
+
+CAMPAIGN_OUTPUT_DIR = "campaigns"
+
+def render_bulk_campaign_section(coordinators, base_message, client):
+    """Render the Bulk Campaign section for generating invitations from a CSV/JSONL file"""
+    with st.expander("📦 Bulk Campaign Mode"):
+        st.markdown("""
+        Upload a **CSV** or **JSONL** file with one company per row. Supported columns:
+        `company_name`, `additional_info`, `coordinator` (name or email), `num_bullet_points` (4-7),
+        and optionally `hr_email` to send the generated invitations in bulk. Sends are queued
+        in the mail outbox and delivered in the background within the daily sending quota.
+
+        Results are appended to the output file as they finish, so re-running the same
+        campaign skips companies that were already generated.
+        """)
+
+        uploaded_file = st.file_uploader(
+            "Campaign File",
+            type=["csv", "jsonl"],
+            help="One row per company to invite"
+        )
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            campaign_name = st.text_input(
+                "Campaign Name",
+                value="placement_campaign",
+                help="Used as the output file name, re-use it to resume a campaign"
+            )
+
+        with col2:
+            max_workers = st.slider(
+                "Parallel Workers",
+                min_value=1,
+                max_value=16,
+                value=DEFAULT_MAX_WORKERS,
+                help="Upper bound on concurrent generations; per-provider limits still apply"
+            )
+
+        start_clicked = st.button("🚀 Start Campaign", key="start_campaign_btn", disabled=uploaded_file is None)
+
+        safe_name = re.sub(r'[^A-Za-z0-9_-]+', '_', campaign_name.strip())
+        if not safe_name:
+            return
+
+        os.makedirs(CAMPAIGN_OUTPUT_DIR, exist_ok=True)
+        output_path = os.path.join(CAMPAIGN_OUTPUT_DIR, f"{safe_name}.jsonl")
+
+        if start_clicked and uploaded_file is not None:
+            if not client:
+                st.error("❌ OpenRouter client not initialized. Please check your API key.")
+                return
+
+            try:
+                rows = parse_batch_file(uploaded_file.getvalue(), uploaded_file.name)
+            except Exception as e:
+                st.error(f"❌ Could not read campaign file: {e}")
+                return
+
+            if not rows:
+                st.warning("⚠️ No rows with a company name found in the campaign file.")
+                return
+
+            progress_bar = st.progress(0.0, text=f"Preparing {len(rows)} companies...")
+            status_placeholder = st.empty()
+
+            def on_progress(done, total, record):
+                progress_bar.progress(done / total, text=f"{done}/{total} companies processed")
+                if record['status'] == 'ok':
+                    status_placeholder.write(f"✅ {record['company_name']}")
+                else:
+                    status_placeholder.write(f"❌ {record['company_name']}: {record.get('error')}")
+
+            summary = run_batch_generation(
+                rows,
+                coordinators,
+                base_message,
+                client,
+                output_path,
+                max_workers=max_workers,
+                progress_callback=on_progress
+            )
+
+            progress_bar.progress(1.0, text="Campaign complete")
+            st.success(
+                f"✅ Campaign finished: {summary['succeeded']} generated, "
+                f"{summary['failed']} failed, {summary['skipped']} already done."
+            )
+
+        results = load_results(output_path)
+        if results:
+            st.write(f"**Results in `{output_path}`:** {len(results)} companies")
+            st.dataframe(
+                [
+                    {
+                        'Company': r.get('company_name'),
+                        'Coordinator': r.get('coordinator'),
+                        'Status': r.get('status'),
+                        'Error': r.get('error', '')
+                    }
+                    for r in results
+                ],
+                use_container_width=True
+            )
+            st.download_button(
+                "📥 Download Results (JSONL)",
+                data="\n".join(json.dumps(r, ensure_ascii=False) for r in results),
+                file_name=f"{safe_name}.jsonl",
+                mime="application/jsonl"
+            )
+
+            render_campaign_send_section(results, coordinators, safe_name)
+
+def load_queued_sends(sent_path):
+    """Row key -> outbox id for campaign rows already handed to the outbox.
+
+    Records written before sends went through the outbox have no outbox id
+    but a 'sent' status; they map to None and count as delivered.
+    """
+    queued = {}
+    if os.path.exists(sent_path):
+        with open(sent_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get('outbox_id') is not None:
+                    queued[record.get('row_key')] = record['outbox_id']
+                elif record.get('status') == 'sent':
+                    queued[record.get('row_key')] = None
+    return queued
+
+def render_campaign_send_section(results, coordinators, safe_name):
+    """Queue generated campaign invitations that have an HR email through the mail outbox.
+
+    The background outbox worker sends them within the shared quota, so a long
+    campaign neither blocks the session nor stops when the browser disconnects.
+    Rows already queued are skipped unless the outbox gave up on them.
+    """
+    sent_path = os.path.join(CAMPAIGN_OUTPUT_DIR, f"{safe_name}_sent.jsonl")
+    queued = load_queued_sends(sent_path)
+    statuses = get_mail_outbox().get_status([i for i in queued.values() if i is not None])
+
+    def delivery_status(row_key):
+        outbox_id = queued[row_key]
+        if outbox_id is None:
+            return 'sent'
+        entry = statuses.get(outbox_id)
+        return entry['status'] if entry else 'failed'
+
+    counts = {'queued': 0, 'sending': 0, 'sent': 0, 'failed': 0}
+    for row_key in queued:
+        status = delivery_status(row_key)
+        counts[status] = counts.get(status, 0) + 1
+
+    notice = st.session_state.pop('campaign_send_notice', None)
+    if notice:
+        st.success(notice)
+
+    if queued:
+        delivered = counts['sent'] + counts['failed']
+        st.progress(delivered / len(queued), text=f"{counts['sent']}/{len(queued)} sent")
+        st.write(f"**📬 Outbox:** {counts['sent']} sent, {counts['queued'] + counts['sending']} waiting, {counts['failed']} failed")
+        if counts['queued'] + counts['sending'] and st.button("🔄 Refresh Status", key="refresh_campaign_btn"):
+            st.rerun()
+
+    sendable = [
+        r for r in results
+        if r.get('status') == 'ok' and r.get('hr_email')
+        and (r.get('row_key') not in queued or delivery_status(r.get('row_key')) == 'failed')
+    ]
+
+    st.write(f"**📨 Ready to send:** {len(sendable)} invitations ({len(queued) - counts['failed']} already queued or sent)")
+    if not sendable:
+        return
+
+    email_subject = st.text_input(
+        "Subject:",
+        value="Invitation to Jadavpur University Campus Placement 2026",
+        key="campaign_subject"
+    )
+
+    if not st.button("📨 Send Campaign Emails", key="send_campaign_btn"):
+        return
+
+    if not email_subject.strip():
+        st.error("❌ Please enter an email subject.")
+        return
+
+    queued_count = 0
+    errors = []
+
+    with open(sent_path, 'a', encoding='utf-8') as f:
+        for record in sendable:
+            coordinator = resolve_coordinator(coordinators, record.get('coordinator_email') or record.get('coordinator')) or {}
+
+            success, message, outbox_id = queue_email_with_env_credentials(
+                recipient_email=record['hr_email'],
+                subject=email_subject.strip(),
+                body=record['content'],
+                log_context={
+                    'coordinator_name': coordinator.get('name', 'Unknown'),
+                    'company_name': record['company_name'],
+                    'coordinator_email': coordinator.get('email')
+                }
+            )
+
+            if not success:
+                errors.append(f"{record['company_name']}: {message}")
+                continue
+
+            queued_count += 1
+            f.write(json.dumps({
+                'row_key': record['row_key'],
+                'outbox_id': outbox_id,
+                'recipient_email': record['hr_email'],
+                'company_name': record['company_name'],
+                'status': 'queued'
+            }, ensure_ascii=False) + "\n")
+
+    for error in errors:
+        st.error(f"❌ {error}")
+
+    if not queued_count:
+        return
+
+    notice = f"📬 {queued_count} invitations queued - they will be sent in the background within the sending quota."
+    if errors:
+        st.success(notice)
+    else:
+        # Rerun so the outbox progress above includes the rows just queued
+        st.session_state.campaign_send_notice = notice
+        st.rerun()
@@ -1,7 +1,26 @@
 import streamlit as st
+from datetime import datetime
 from utils.data_loader import get_unique_departments, get_coordinators_by_department
+from db.outreach_index import get_outreach_index
 
-def render_company_info_section(coordinators):
+def format_outreach_warning(contact):
+    """Describe an earlier contact found by the outreach index"""
+    try:
+        when = datetime.fromisoformat(contact['timestamp']).strftime('%d %b %Y, %I:%M %p')
+    except (TypeError, ValueError):
+        when = contact['timestamp'] or 'an earlier date'
+
+    who = contact.get('coordinator_name') or contact.get('coordinator_email') or 'another coordinator'
+    target = contact.get('hr_email') or contact.get('company_name')
+    if contact.get('matched_on') == 'domain':
+        reason = f"Someone at this company's email domain ({target})"
+    elif contact.get('matched_on') == 'similar_company':
+        reason = f"A similarly named company, {contact.get('company_name')} ({target}),"
+    else:
+        reason = f"{contact.get('company_name')} ({target})"
+    return f"⚠️ {reason} was already contacted on {when} by {who}."
+
+def render_company_info_section(coordinator_index):
     """Render the Company Information section with department-based coordinator filtering"""
     st.subheader("🏢 Company Information & Email Configuration")
 
@@ -14,8 +33,18 @@ def render_company_info_section(coordinators):
             help="Enter the name of the target company"
         )
 
+    if company_name.strip():
+        outreach_index = get_outreach_index()
+        previous_contact = outreach_index.find(company_name=company_name)
+        if previous_contact:
+            st.warning(format_outreach_warning(previous_contact))
+        
+        suggestions = [name for name in outreach_index.suggest(company_name) if name != company_name.strip()]
+        if suggestions:
+            st.caption("Previously contacted: " + ", ".join(suggestions))
+
     with col2:
-        departments = get_unique_departments(coordinators)
+        departments = get_unique_departments(coordinator_index)
         if departments:
             selected_department = st.selectbox(
                 label="Select Department",
@@ -28,7 +57,7 @@ def render_company_info_section(coordinators):
 
     with col3:
         if selected_department:
-            department_coordinators = get_coordinators_by_department(coordinators, selected_department)
+            department_coordinators = get_coordinators_by_department(coordinator_index, selected_department)
             if department_coordinators:
                 coordinator_names = [coord['name'] for coord in department_coordinators]
                 selected_coordinator_name = st.selectbox(
@@ -37,10 +66,7 @@ def render_company_info_section(coordinators):
                     help="Choose the coordinator who will be the point of contact"
                 )
                 
-                selected_coordinator = next(
-                    (coord for coord in department_coordinators if coord['name'] == selected_coordinator_name), 
-                    None
-                )
+                selected_coordinator = coordinator_index.get(selected_department, selected_coordinator_name)
             else:
                 st.error(f"No coordinators found for {selected_department} department")
                 selected_coordinator = None
@@ -1,8 +1,10 @@
 import streamlit as st
 import re
 from datetime import datetime
-from utils.email_sender import send_email_with_env_credentials, create_download_link
-from db.database import log_mail_activity, get_ist_time
+from utils.email_sender import queue_email_with_env_credentials, create_download_link
+from utils.mail_outbox import get_mail_outbox
+from db.outreach_index import get_outreach_index
+from components.company_info import format_outreach_warning
 from st_copy import copy_button
 
 
@@ -11,6 +13,39 @@ def is_valid_email(email):
     return re.match(pattern, email) is not None
 
 
+OUTBOX_STATUS_LABELS = {
+    'queued': "⏳ Queued",
+    'sending': "📤 Sending",
+    'sent': "✅ Sent",
+    'failed': "❌ Failed"
+}
+
+
+def render_outbox_status():
+    outbox_ids = st.session_state.get('outbox_ids', [])
+    if not outbox_ids:
+        return
+
+    st.subheader("📬 Outbox")
+
+    statuses = get_mail_outbox().get_status(outbox_ids)
+    for outbox_id in reversed(outbox_ids):
+        entry = statuses.get(outbox_id)
+        if not entry:
+            continue
+
+        label = OUTBOX_STATUS_LABELS.get(entry['status'], entry['status'])
+        line = f"{label} - {entry['recipient_email']}"
+        if entry['status'] == 'queued' and entry['attempts']:
+            line += f" (retry {entry['attempts']}: {entry['last_error']})"
+        elif entry['status'] == 'failed':
+            line += f" ({entry['last_error']})"
+        st.write(line)
+
+    if st.button("🔄 Refresh Status", key="refresh_outbox_btn"):
+        st.rerun()
+
+
 def render_generated_mail_display(company_name, selected_coordinator):
     if st.session_state.get('mail_generated', False) and st.session_state.get('generated_content', ''):
         st.subheader("📧 Generated Invitation Mail")
@@ -59,6 +94,11 @@ def render_generated_mail_display(company_name, selected_coordinator):
                 value="Invitation to Jadavpur University Campus Placement 2026"
             )
 
+        if hr_email.strip():
+            previous_contact = get_outreach_index().find(company_name=company_name, hr_email=hr_email)
+            if previous_contact:
+                st.warning(format_outreach_warning(previous_contact))
+
         col1, col2 = st.columns(2)
 
         with col1:
@@ -96,41 +136,31 @@ def render_generated_mail_display(company_name, selected_coordinator):
                 for error in validation_errors:
                     st.error(error)
             else:
-                with st.spinner("Sending email..."):
-                    try:
-                        coordinator_email = st.session_state.get('user_email', '')
-
-                        success, message = send_email_with_env_credentials(
-                            recipient_email=hr_email.strip(),
-                            subject=email_subject.strip(),
-                            body=edited_content
-                        )
-
-                        if success:
-                            st.success("✅ Email sent successfully!")
-
-                            try:
-                                coordinator_name = selected_coordinator['name'] if selected_coordinator else 'Unknown'
-
-                                log_success, log_message = log_mail_activity(
-                                    coordinator_name=coordinator_name,
-                                    company_name=company_name,
-                                    hr_email=hr_email.strip(),
-                                    coordinator_email=coordinator_email,
-                                    email_subject=email_subject.strip(),
-                                    email_body=edited_content
-                                )
-
-                                if not log_success:
-                                    st.warning(f"⚠️ Email sent but logging failed: {log_message}")
-
-                            except Exception as log_error:
-                                st.warning(f"⚠️ Email sent but logging failed: {str(log_error)}")
-                        else:
-                            st.error(f"❌ Failed to send email: {message}")
-
-                    except Exception as e:
-                        st.error(f"❌ An error occurred while sending email: {str(e)}")
+                try:
+                    coordinator_email = st.session_state.get('user_email', '')
+                    coordinator_name = selected_coordinator['name'] if selected_coordinator else 'Unknown'
+
+                    success, message, outbox_id = queue_email_with_env_credentials(
+                        recipient_email=hr_email.strip(),
+                        subject=email_subject.strip(),
+                        body=edited_content,
+                        log_context={
+                            'coordinator_name': coordinator_name,
+                            'company_name': company_name,
+                            'coordinator_email': coordinator_email
+                        }
+                    )
+
+                    if success:
+                        st.session_state.setdefault('outbox_ids', []).append(outbox_id)
+                        st.success("📬 Email queued - it will be sent in the background.")
+                    else:
+                        st.error(f"❌ Failed to send email: {message}")
+
+                except Exception as e:
+                    st.error(f"❌ An error occurred while sending email: {str(e)}")
+
+        render_outbox_status()
 
     elif st.session_state.get('mail_generated', False):
         st.info("💡 Generate an invitation mail to see it displayed here.")
@@ -1,6 +1,14 @@
+import time
 import streamlit as st
-from utils.prompt_generator import create_improved_prompt, create_validation_prompt
-from utils.post_processor import post_process_mail, fix_bullet_count
+from utils.invitation_generator import (
+    generate_initial_draft,
+    review_draft,
+    generate_template_invitation,
+    create_fallback_invitation
+)
+from utils.industry_templates import get_industry_label
+
+STREAM_RENDER_INTERVAL = 0.1
 
 def render_generate_section(company_name, selected_coordinator, additional_info, base_message, client, num_bullet_points):
     st.subheader("🚀 Generate AI-Powered Invitation")
@@ -13,6 +21,16 @@ def render_generate_section(company_name, selected_coordinator, additional_info,
             type="primary",
             use_container_width=True
         )
+        force_regenerate = st.checkbox(
+            "🔄 Force regenerate",
+            value=False,
+            help="Skip the generation cache and request a fresh invitation from the AI model"
+        )
+        use_templates = st.checkbox(
+            "⚡ Template mode for known industries",
+            value=True,
+            help="Render recurring recruiters and recognized industries instantly from a pre-written industry template; other companies still go to the AI model"
+        )
 
     if 'generated_content' not in st.session_state:
         st.session_state.generated_content = ""
@@ -22,105 +40,49 @@ def render_generate_section(company_name, selected_coordinator, additional_info,
     if generate_button:
         st.session_state.mail_generated = True
         
-        if company_name and selected_coordinator:
-            department = selected_coordinator.get('department', 'Department')
-            
-            prompt = create_improved_prompt(company_name, additional_info, base_message, num_bullet_points, department)
-            
+        template_content, industry = None, None
+        if company_name and selected_coordinator and use_templates and not force_regenerate:
+            template_content, industry = generate_template_invitation(
+                company_name, selected_coordinator, additional_info, num_bullet_points
+            )
+        
+        if template_content:
+            st.session_state.generated_content = template_content
+            st.success(f"⚡ Invitation for {company_name} rendered instantly from the {get_industry_label(industry)} template with {num_bullet_points} key skills!")
+            st.caption("No AI call was made. Untick Template mode or tick Force regenerate for an AI-written invitation.")
+        
+        elif company_name and selected_coordinator:
             with st.spinner(f"🤖 Generating personalized invitation for {company_name}..."):
                 try:
                     if client:
-                        response = client.chat.completions.create(
-                            model="mistralai/mistral-small-3.2-24b-instruct:free",
-                            extra_headers={
-                                "HTTP-Referer": "https://letsconnect.ju.ac.in",
-                                "X-Title": "Lets Connect!"
-                            },
-                            messages=[
-                                {
-                                    "role": "system", 
-                                    "content": f"""You are a professional placement officer at Jadavpur University {department} department. 
-                                    Write personalized, CONCISE recruitment emails that are tailored to each company's specific industry and needs. 
-                                    Always follow the exact structure provided in the prompt. 
-                                    Keep emails short, professional, and impactful - around 200-300 words total.
-                                    Use proper spacing between sections for better readability.
-                                    CRITICAL: Include exactly {num_bullet_points} bullet points highlighting student skills/expertise.
-                                    Return ONLY the email content without any introductory text or markers."""
-                                },
-                                {"role": "user", "content": prompt},
-                            ],
-                            temperature=0.7,
-                            max_tokens=800,
-                        )
-                        
-                        if not response:
-                            raise Exception("API returned no response")
-                        if not hasattr(response, 'choices') or not response.choices:
-                            raise Exception("API response has no choices")
-                        if not response.choices[0] or not hasattr(response.choices[0], 'message'):
-                            raise Exception("API response choice has no message")
-                        if not response.choices[0].message or not hasattr(response.choices[0].message, 'content'):
-                            raise Exception("API response message has no content")
+                        stream_placeholder = st.empty()
+                        last_render = [0.0]
                         
-                        initial_content = response.choices[0].message.content
-                        if not initial_content:
-                            raise Exception("API returned empty content")
+                        def render_stream(text_so_far):
+                            # Throttle redraws; every widget update is a websocket round trip
+                            now = time.monotonic()
+                            if now - last_render[0] >= STREAM_RENDER_INTERVAL:
+                                stream_placeholder.text(text_so_far)
+                                last_render[0] = now
                         
-                        initial_content = initial_content.strip()
-                        initial_content = fix_bullet_count(initial_content, num_bullet_points, company_name)
+                        initial_content, draft_from_cache = generate_initial_draft(
+                            client, company_name, selected_coordinator, additional_info, base_message, num_bullet_points,
+                            force_regenerate=force_regenerate,
+                            on_token=render_stream
+                        )
+                        stream_placeholder.text(initial_content)
                         
                         with st.spinner("🔍 Validating email structure and requirements..."):
-                            validation_prompt = create_validation_prompt(
-                                initial_content,
-                                selected_coordinator['name'],
-                                selected_coordinator['phone'], 
-                                selected_coordinator['email'],
-                                company_name,
-                                department
+                            st.session_state.generated_content, used_llm_validation = review_draft(
+                                client, initial_content, company_name, selected_coordinator, num_bullet_points,
+                                force_regenerate=force_regenerate,
+                                draft_from_cache=draft_from_cache
                             )
-                            
-                            validation_response = client.chat.completions.create(
-                                model="mistralai/mistral-small-3.2-24b-instruct:free",
-                                extra_headers={
-                                    "HTTP-Referer": "https://letsconnect.ju.ac.in",
-                                    "X-Title": "Lets Connect!"
-                                },
-                                messages=[
-                                    {
-                                        "role": "system",
-                                        "content": f"""You are a meticulous email quality checker. Your job is to ensure emails follow exact specifications for professional recruitment communications. Always maintain the personalized content while fixing structure, formatting, and contact details to match requirements exactly. Use proper spacing between sections for better readability. IMPORTANT: Maintain exactly {num_bullet_points} bullet points in the skills section. The department in signature must be {department}. Return ONLY the clean email content without any introductory text."""
-                                    },
-                                    {"role": "user", "content": validation_prompt}
-                                ],
-                                temperature=0.2,
-                                max_tokens=800
-                            )
-                            
-                            if not validation_response:
-                                raise Exception("Validation API returned no response")
-                            if not hasattr(validation_response, 'choices') or not validation_response.choices:
-                                raise Exception("Validation API response has no choices")
-                            if not validation_response.choices[0] or not hasattr(validation_response.choices[0], 'message'):
-                                raise Exception("Validation API response choice has no message")
-                            if not validation_response.choices[0].message or not hasattr(validation_response.choices[0].message, 'content'):
-                                raise Exception("Validation API response message has no content")
-                            
-                            validated_content = validation_response.choices[0].message.content
-                            if not validated_content:
-                                raise Exception("Validation API returned empty content")
-                            
-                            validated_content = validated_content.strip()
-                            validated_content = fix_bullet_count(validated_content, num_bullet_points, company_name)
                         
-                        with st.spinner("🔧 Finalizing email format..."):
-                            st.session_state.generated_content = post_process_mail(
-                                validated_content, 
-                                selected_coordinator['name'], 
-                                selected_coordinator['phone'],
-                                selected_coordinator,
-                                company_name,
-                                num_bullet_points
-                            )
+                        stream_placeholder.empty()
+                        
+                        if not used_llm_validation:
+                            st.caption("⚡ Draft passed local structure checks - AI validation pass skipped")
                         
                         st.success(f"✅ Concise and personalized invitation for {company_name} generated successfully with {num_bullet_points} key skills!")
                         
@@ -130,48 +92,9 @@ def render_generate_section(company_name, selected_coordinator, additional_info,
                     
                 except Exception as e:
                     st.error(f"❌ OpenRouter API error: {e}")
-                    
-                    department = selected_coordinator.get('department', 'Department')
-                    
-                    bullet_points = [
-                        "✅ Data Science & Analytics",
-                        "✅ Machine Learning & AI", 
-                        "✅ Web and App Development",
-                        "✅ Cloud & DevOps",
-                        "✅ Core Engineering & Software Development",
-                        "✅ Mobile Application Development",
-                        "✅ Database Management & SQL",
-                        "✅ Cybersecurity & Network Management",
-                        "✅ UI/UX Design & Frontend Development",
-                        "✅ API Development & Integration"
-                    ]
-                    
-                    selected_bullets = bullet_points[:num_bullet_points]
-                    bullet_text = "\n".join(selected_bullets)
-                    
-                    st.session_state.generated_content = f"""Dear Recruitment Team,
-
-Greetings from the Jadavpur University Placement Cell!
-
-We are excited to invite {company_name} to participate in our Campus Recruitment Drive for the 2026 graduating batch.
-
-Being a NAAC A-Grade Tier-1 institution and consistently ranked among the top engineering and research universities in India (NIRF 2024: 2nd State University, 12th in Engineering), our students bring strong expertise across:
-
-{bullet_text}
-
-We believe our students align perfectly with {company_name}'s talent requirements.
-
-For coordination, please feel free to reach out:  
-📧 Email: officer.placement@jadavpuruniversity.in, jupgcsit2026@gmail.com 
-📧 CC: {selected_coordinator['email']}
-
-We look forward to a fruitful collaboration with {company_name}!
-
-Best Regards,  
-{selected_coordinator['name']}  
-Placement Coordinator, {department}  
-Jadavpur Placement Cell  
-📞 {selected_coordinator['phone']}"""
+                    st.session_state.generated_content = create_fallback_invitation(
+                        company_name, selected_coordinator, num_bullet_points
+                    )
             
         else:
             st.error("❌ Please enter both the Company Name and select a Placement Coordinator before generating the mail.")
@@ -4,6 +4,7 @@ from db.database import get_user_by_email as get_user_info
 from utils.otp_sender import generate_and_send_otp, get_otp_status
 from db.otp import verify_otp, get_otp_times_ist, is_otp_expired
 from db.verify import verify_otp as verify_otp_legacy
+from db.auth_store import get_login_round_trip_stats
 from utils.session_manager import set_user_session, clear_user_session, is_user_logged_in
 import time
 from datetime import datetime, timezone, timedelta
@@ -219,6 +220,9 @@ def show_debug_info():
         st.write(f"OTP DT: {st.session_state.get('otp_dt', 'Not set')}")
         st.write(f"Verified User: {st.session_state.get('verified_user', 'Not set')}")
         st.write(f"User Logged In: {is_user_logged_in()}")
+        round_trip_stats = get_login_round_trip_stats()
+        st.write(f"Database Round Trips (last login): {round_trip_stats['last']}")
+        st.write(f"Database Round Trips (average over {round_trip_stats['logins']} logins): {round_trip_stats['average']}")
 
 def main():
     render_login_form()
@@ -0,0 +1,94 @@
+import streamlit as st
+from db.database import get_mail_logs_page, DEFAULT_MAIL_LOG_PAGE_SIZE
+
+HISTORY_STATE_KEY = 'mail_history'
+
+def _reset_history(filter_key):
+    st.session_state[HISTORY_STATE_KEY] = {
+        'filter': filter_key,
+        'rows': [],
+        'cursor': None,
+        'loaded': False,
+        'exhausted': False,
+    }
+
+def _load_next_page(coordinator_email, company_name):
+    history = st.session_state[HISTORY_STATE_KEY]
+    rows, next_cursor, message = get_mail_logs_page(
+        coordinator_email=coordinator_email,
+        company_name=company_name,
+        cursor=history['cursor'],
+        page_size=DEFAULT_MAIL_LOG_PAGE_SIZE
+    )
+
+    if rows is None:
+        st.error(f"❌ {message}")
+        return
+
+    history['rows'].extend(rows)
+    history['cursor'] = next_cursor
+    history['loaded'] = True
+    history['exhausted'] = next_cursor is None
+
+def render_mail_history_section(current_user):
+    """Render the mail history, fetched one page at a time on demand"""
+    with st.expander("📜 Mail History"):
+        col1, col2 = st.columns([1, 2])
+
+        with col1:
+            scope = st.radio(
+                "Show",
+                options=["My emails", "By company"],
+                horizontal=True,
+                key="mail_history_scope"
+            )
+
+        with col2:
+            company_name = None
+            if scope == "By company":
+                company_name = st.text_input(
+                    "Company Name",
+                    key="mail_history_company",
+                    placeholder="Exact company name as sent"
+                ).strip() or None
+
+        coordinator_email = current_user.get('email') if current_user and scope == "My emails" else None
+        filter_key = (coordinator_email, company_name)
+
+        history = st.session_state.get(HISTORY_STATE_KEY)
+        if not history or history['filter'] != filter_key:
+            _reset_history(filter_key)
+            history = st.session_state[HISTORY_STATE_KEY]
+
+        if not coordinator_email and not company_name:
+            st.info("Enter a company name to see its history.")
+            return
+
+        if not history['loaded']:
+            if st.button("📥 Load History", key="load_mail_history_btn"):
+                _load_next_page(coordinator_email, company_name)
+                st.rerun()
+            return
+
+        if not history['rows']:
+            st.info("No emails found.")
+            return
+
+        st.dataframe(
+            [
+                {
+                    'Sent': r.get('timestamp'),
+                    'Company': r.get('company_name'),
+                    'HR Email': r.get('hr_email'),
+                    'Coordinator': r.get('coordinator_name')
+                }
+                for r in history['rows']
+            ],
+            use_container_width=True
+        )
+        st.caption(f"Showing {len(history['rows'])} emails")
+
+        if not history['exhausted']:
+            if st.button("⬇️ Load More", key="load_more_mail_history_btn"):
+                _load_next_page(coordinator_email, company_name)
+                st.rerun()
@@ -1,4 +1,10 @@
 import streamlit as st
+from utils.generation_cache import get_generation_cache
+from utils.mail_validator import get_validation_stats
+from db.coordinator_repository import get_coordinator_repository
+from utils.model_router import get_model_router
+from utils.prompt_budget import get_prompt_token_stats
+from utils.metrics import INVITATIONS_GENERATED
 
 def render_sidebar(selected_coordinator, company_name):
     """Render the sidebar with settings and information"""
@@ -45,10 +51,46 @@ def render_sidebar(selected_coordinator, company_name):
                 st.session_state.mail_count += 1
                 st.session_state.last_company = company_name
         
-        st.metric("Mails Generated This Session", st.session_state.mail_count)
-        st.metric("Current Model", "Mistral AI")
+        st.metric(
+            "Mails Generated This Session",
+            st.session_state.mail_count,
+            help=f"{INVITATIONS_GENERATED.total():.0f} invitations generated across all sessions since startup"
+        )
+        model_stats = get_model_router().stats()
+        current = model_stats[0]
+        st.metric(
+            "Current Model",
+            current['model'].split('/')[-1],
+            help=f"Routing order: {', '.join(m['model'] for m in model_stats)}"
+        )
         st.metric("Personalization Level", "High")
 
+        cache_stats = get_generation_cache().stats()
+        validation_stats = get_validation_stats()
+        st.metric(
+            "Validation Calls Avoided",
+            validation_stats['local_passed'],
+            help=f"{validation_stats['llm_validated']} drafts needed the AI validation pass ({validation_stats['avoided_ratio']:.0%} avoided)"
+        )
+        st.metric("Cached Generations", cache_stats['entries'], help=f"{cache_stats['hits']} hits / {cache_stats['misses']} misses since startup")
+        token_stats = get_prompt_token_stats()
+        st.metric(
+            "Avg Input Tokens / Request",
+            f"{token_stats['average']:.0f}" if token_stats['average'] is not None else "–",
+            help=f"Last request: {token_stats['last']} tokens over {token_stats['requests']} requests"
+        )
+
+        with st.expander("🧭 Model Routing"):
+            for entry in model_stats:
+                latency = f"{entry['median_latency']:.1f}s" if entry['median_latency'] is not None else "–"
+                error_rate = f"{entry['error_rate']:.0%}" if entry['error_rate'] is not None else "–"
+                status = "🟢" if entry['healthy'] else "🔴"
+                st.write(f"{status} **{entry['model']}**  \nmedian {latency} · errors {error_rate} · {entry['calls']} calls")
+
+        if st.button("🔄 Reload Coordinators", help="Fetch coordinator details again instead of waiting for the cache to expire"):
+            get_coordinator_repository().invalidate()
+            st.rerun()
+
         st.divider()
         
         st.subheader("🔗 Quick Links")
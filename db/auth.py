@@ -1,7 +1,8 @@
 import bcrypt
 import pytz
 from datetime import datetime
-from .database import get_supabase_client, log_user_activity, generate_dt
+from .database import log_user_activity, generate_dt
+from .auth_store import fetch_coordinator, begin_login
 
 IST = pytz.timezone('Asia/Kolkata')
 
@@ -10,11 +11,9 @@ def get_ist_time():
 
 def get_user_by_email_local(email):
     try:
-        supabase = get_supabase_client()
-        response = supabase.table("coord_details").select("*").eq("email", email).execute()
+        user = fetch_coordinator(email)
         
-        if response.data:
-            user = response.data[0]
+        if user:
             return {
                 'id': user['id'],
                 'name': user['name'],
@@ -63,7 +62,9 @@ def create_user_session(email, user_data):
                 "password_hash": "credential_verified",
                 "last_login": ist_time.isoformat()
             },
-            dt=dt
+            dt=dt,
+            # The OTP step reads and updates this row by (email, dt) right away
+            buffered=False
         )
         
         if success:
@@ -75,6 +76,7 @@ def create_user_session(email, user_data):
         return False, f"Session creation error: {e}", None
 
 def authenticate_user(email, password):
+    begin_login(email)
     success, message, user_data = verify_password(email, password)
     
     if not success:
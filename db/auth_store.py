@@ -0,0 +1,196 @@
+import time
+import threading
+from collections import deque
+from datetime import datetime, timezone
+import pytz
+from .database import get_supabase_client
+from .coordinator_repository import get_coordinator_repository
+
+IST = pytz.timezone('Asia/Kolkata')
+
+# Number of completed logins whose round-trip counts are kept for reporting
+LOGIN_HISTORY_SIZE = 100
+# Abandoned logins (OTP never verified) are forgotten after this long
+PENDING_LOGIN_TTL = 30 * 60
+
+_lock = threading.Lock()
+_pending_logins = {}
+_login_history = deque(maxlen=LOGIN_HISTORY_SIZE)
+
+def get_ist_time():
+    return datetime.now(IST)
+
+def parse_datetime_string(datetime_str):
+    if not datetime_str:
+        return None
+
+    try:
+        if datetime_str.endswith('Z'):
+            return datetime.fromisoformat(datetime_str.replace('Z', '+00:00'))
+        elif '+' in datetime_str:
+            return datetime.fromisoformat(datetime_str)
+        else:
+            return datetime.fromisoformat(datetime_str).replace(tzinfo=timezone.utc)
+    except Exception as e:
+        print(f"Error parsing datetime string '{datetime_str}': {e}")
+        return None
+
+def _new_login_state():
+    return {'round_trips': [], 'user': None, 'otps': {}, 'started': time.monotonic()}
+
+def _login_state(email):
+    # Caller holds _lock
+    if email not in _pending_logins:
+        _pending_logins[email] = _new_login_state()
+    return _pending_logins[email]
+
+def _record_round_trip(email, label):
+    with _lock:
+        _login_state(email)['round_trips'].append(label)
+
+def begin_login(email):
+    """Start counting database round trips for a login attempt"""
+    now = time.monotonic()
+    with _lock:
+        for stale in [e for e, state in _pending_logins.items() if now - state['started'] > PENDING_LOGIN_TTL]:
+            del _pending_logins[stale]
+        _pending_logins[email] = _new_login_state()
+
+def end_login(email):
+    """Finish a login attempt and return the round trips it made"""
+    with _lock:
+        state = _pending_logins.pop(email, None)
+        if not state:
+            return []
+        _login_history.append(len(state['round_trips']))
+        return state['round_trips']
+
+def get_login_round_trip_stats():
+    """Round trips per completed login: last, average and sample count"""
+    with _lock:
+        history = list(_login_history)
+        pending = {email: len(state['round_trips']) for email, state in _pending_logins.items()}
+
+    return {
+        'last': history[-1] if history else None,
+        'average': sum(history) / len(history) if history else None,
+        'logins': len(history),
+        'pending': pending
+    }
+
+def fetch_coordinator(email):
+    """Look up the coord_details row (including password_hash) and remember it for the rest of the login"""
+    user, from_cache = get_coordinator_repository().lookup_email(email)
+    if not from_cache:
+        _record_round_trip(email, "select coord_details")
+
+    with _lock:
+        _login_state(email)['user'] = user
+    return user
+
+def get_login_user(email):
+    """Coordinator row fetched earlier in this login, falling back to one select"""
+    with _lock:
+        state = _pending_logins.get(email)
+        user = state['user'] if state else None
+
+    if user:
+        return user
+    return fetch_coordinator(email)
+
+def _cache_otp(email, dt, otp_expiry_iso, sent_iso):
+    with _lock:
+        _login_state(email)['otps'][dt] = {
+            'otp_expiry': otp_expiry_iso,
+            'last_login': sent_iso
+        }
+
+def upsert_otp(email, otp, dt, otp_expiry_iso, sent_iso):
+    """Store the OTP for (email, dt) in one request instead of select + update/insert.
+
+    When dt falls in the same minute as the login's session row (written
+    synchronously by create_user_session) this updates that row; it is the
+    only writer for the key until the OTP is consumed.
+    """
+    supabase = get_supabase_client()
+    row = {
+        "email": email,
+        "dt": dt,
+        "password_hash": "otp_login",
+        "last_login": sent_iso,
+        "otp": otp,
+        "otp_expiry": otp_expiry_iso
+    }
+
+    try:
+        _record_round_trip(email, "upsert user_logs")
+        supabase.table("user_logs").upsert(row, on_conflict="email,dt").execute()
+    except Exception as e:
+        # Without a unique (email, dt) constraint PostgREST rejects on_conflict; fall back
+        print(f"Warning: OTP upsert failed, falling back to select + write: {e}")
+        _record_round_trip(email, "select user_logs")
+        response = supabase.table("user_logs").select("id").eq("email", email).eq("dt", dt).execute()
+        if response.data:
+            _record_round_trip(email, "update user_logs")
+            supabase.table("user_logs").update({
+                "otp": otp,
+                "otp_expiry": otp_expiry_iso,
+                "last_login": sent_iso
+            }).eq("email", email).eq("dt", dt).execute()
+        else:
+            _record_round_trip(email, "insert user_logs")
+            supabase.table("user_logs").insert(row).execute()
+
+    _cache_otp(email, dt, otp_expiry_iso, sent_iso)
+
+def get_otp_meta(email, dt):
+    """Return {'otp_expiry', 'last_login'} for an OTP, from the login cache when possible"""
+    with _lock:
+        state = _pending_logins.get(email)
+        meta = state['otps'].get(dt) if state else None
+
+    if meta:
+        return meta
+
+    supabase = get_supabase_client()
+    _record_round_trip(email, "select user_logs")
+    response = supabase.table("user_logs").select("otp_expiry, last_login").eq("email", email).eq("dt", dt).execute()
+    if not response.data or not response.data[0].get('otp_expiry'):
+        return None
+
+    row = response.data[0]
+    _cache_otp(email, dt, row['otp_expiry'], row.get('last_login'))
+    return {'otp_expiry': row['otp_expiry'], 'last_login': row.get('last_login')}
+
+def consume_otp(email, entered_otp, dt):
+    """Atomically check and mark an OTP as verified with a single conditional update.
+
+    The same update records the completed login (verified_dt), so no second
+    row is written for the minute-granular (email, dt) key.
+
+    Returns (success, reason) where reason is one of 'ok', 'missing', 'expired', 'invalid'.
+    """
+    supabase = get_supabase_client()
+    now_ist = get_ist_time()
+
+    _record_round_trip(email, "conditional update user_logs")
+    response = supabase.table("user_logs").update({
+        "password_hash": "otp_verified_success",
+        "last_login": now_ist.isoformat(),
+        "verified_dt": dt
+    }).eq("email", email).eq("dt", dt).eq("otp", entered_otp).gt(
+        "otp_expiry", now_ist.isoformat()
+    ).neq("password_hash", "otp_verified_success").execute()
+
+    if response.data:
+        return True, 'ok'
+
+    # Nothing matched: explain why from the cached expiry rather than another select
+    meta = get_otp_meta(email, dt)
+    if not meta:
+        return False, 'missing'
+
+    otp_expiry = parse_datetime_string(meta['otp_expiry'])
+    if not otp_expiry or now_ist >= otp_expiry.astimezone(IST):
+        return False, 'expired'
+    return False, 'invalid'
@@ -0,0 +1,416 @@
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from utils.tracing import span
+from utils.metrics import DB_REQUEST_SECONDS
+
+DEFAULT_SQLITE_PATH = os.path.join(".cache", "letsconnect.db")
+DEFAULT_PG_MIN_CONNECTIONS = 1
+DEFAULT_PG_MAX_CONNECTIONS = 10
+
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+_OPERATORS = {
+    'eq': '=',
+    'neq': '<>',
+    'gt': '>',
+    'gte': '>=',
+    'lt': '<',
+    'lte': '<=',
+}
+
+# Mirrors the Supabase tables. Timestamps are stored as the ISO strings the app
+# writes (always IST offsets), so text comparison orders them correctly.
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS coord_details (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT,
+    email TEXT UNIQUE,
+    phone TEXT,
+    roll_number TEXT,
+    department TEXT,
+    password_hash TEXT
+);
+CREATE TABLE IF NOT EXISTS user_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    email TEXT,
+    dt TEXT,
+    password_hash TEXT,
+    last_login TEXT,
+    otp TEXT,
+    otp_expiry TEXT,
+    verified_dt TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS user_logs_email_dt_key ON user_logs (email, dt);
+CREATE TABLE IF NOT EXISTS mail_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    coordinator_name TEXT,
+    coordinator_email TEXT,
+    company_name TEXT,
+    hr_email TEXT,
+    timestamp TEXT,
+    email_subject TEXT,
+    email_body TEXT
+);
+CREATE INDEX IF NOT EXISTS mail_logs_coordinator_email_timestamp_idx ON mail_logs (coordinator_email, timestamp, id);
+CREATE INDEX IF NOT EXISTS mail_logs_company_name_timestamp_idx ON mail_logs (company_name, timestamp, id);
+"""
+
+def _split_top_level(text):
+    """Split a PostgREST logic string on commas outside parentheses and quotes"""
+    parts = []
+    depth = 0
+    quoted = False
+    current = []
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == '(':
+            depth += 1
+        elif not quoted and char == ')':
+            depth -= 1
+        elif not quoted and depth == 0 and char == ',':
+            parts.append(''.join(current))
+            current = []
+            continue
+        current.append(char)
+    parts.append(''.join(current))
+    return [part.strip() for part in parts if part.strip()]
+
+def parse_logic_filter(text, combinator='or'):
+    """Parse e.g. 'a.lt.1,and(a.eq.1,id.lt.5)' into nested (combinator, [conditions])"""
+    conditions = []
+    for term in _split_top_level(text):
+        for nested in ('and', 'or'):
+            if term.startswith(nested + '(') and term.endswith(')'):
+                conditions.append(parse_logic_filter(term[len(nested) + 1:-1], nested))
+                break
+        else:
+            column, operator, value = term.split('.', 2)
+            if operator not in _OPERATORS:
+                raise ValueError(f"Unsupported filter operator: {operator}")
+            if len(value) >= 2 and value[0] == value[-1] == '"':
+                value = value[1:-1]
+            conditions.append((operator, column, value))
+    return (combinator, conditions)
+
+def quote_identifier(name):
+    name = name.strip()
+    if not _IDENTIFIER.match(name):
+        raise ValueError(f"Invalid table or column name: {name!r}")
+    return f'"{name}"'
+
+class QueryResponse:
+    def __init__(self, data):
+        self.data = data
+
+class TableQuery:
+    """The subset of the supabase-py query builder the app uses, compiled to SQL.
+
+    Supports select/insert/update/upsert with eq/neq/gt/gte/lt/lte filters,
+    PostgREST-style or_() strings, order and limit; execute() returns an object with a `.data` list of dicts.
+    """
+
+    def __init__(self, backend, table):
+        self.backend = backend
+        self.table = table
+        self.action = 'select'
+        self.columns = '*'
+        self.values = None
+        self.on_conflict = None
+        self.filters = []
+        self.ordering = []
+        self.row_limit = None
+
+    def select(self, columns='*', **kwargs):
+        self.action = 'select'
+        self.columns = columns
+        return self
+
+    def insert(self, values, **kwargs):
+        self.action = 'insert'
+        self.values = values if isinstance(values, list) else [values]
+        return self
+
+    def update(self, values, **kwargs):
+        self.action = 'update'
+        self.values = values
+        return self
+
+    def upsert(self, values, on_conflict=None, **kwargs):
+        self.action = 'upsert'
+        self.values = values if isinstance(values, list) else [values]
+        self.on_conflict = on_conflict or 'id'
+        return self
+
+    def _filter(self, operator, column, value):
+        self.filters.append((operator, column, value))
+        return self
+
+    def eq(self, column, value):
+        return self._filter('eq', column, value)
+
+    def neq(self, column, value):
+        return self._filter('neq', column, value)
+
+    def gt(self, column, value):
+        return self._filter('gt', column, value)
+
+    def gte(self, column, value):
+        return self._filter('gte', column, value)
+
+    def lt(self, column, value):
+        return self._filter('lt', column, value)
+
+    def lte(self, column, value):
+        return self._filter('lte', column, value)
+
+    def or_(self, filters, **kwargs):
+        self.filters.append(('or', filters, None))
+        return self
+
+    def order(self, column, desc=False, **kwargs):
+        self.ordering.append((column, desc))
+        return self
+
+    def limit(self, count, **kwargs):
+        self.row_limit = int(count)
+        return self
+
+    def execute(self):
+        backend = type(self.backend).__name__
+        with span("db.query", backend=backend, table=self.table, action=self.action) as current:
+            data = self.backend.execute(self)
+        DB_REQUEST_SECONDS.observe(current['duration'], backend=backend, table=self.table)
+        return QueryResponse(data)
+
+class SQLBackend:
+    """Shared SQL compilation; subclasses provide the placeholder style and connections"""
+
+    placeholder = '?'
+
+    def table(self, name):
+        return TableQuery(self, name)
+
+    def from_(self, name):
+        return self.table(name)
+
+    def _select_list(self, columns):
+        parts = []
+        for column in (columns or '*').split(','):
+            column = column.strip()
+            if column == '*':
+                parts.append('*')
+            elif column == 'count':
+                parts.append('COUNT(*) AS "count"')
+            else:
+                parts.append(quote_identifier(column))
+        return ", ".join(parts)
+
+    def _where(self, query):
+        clauses = []
+        params = []
+        for operator, column, value in query.filters:
+            if operator == 'or':
+                sql, logic_params = self._logic(parse_logic_filter(column))
+                clauses.append(sql)
+                params.extend(logic_params)
+            elif value is None and operator in ('eq', 'neq'):
+                clauses.append(f"{quote_identifier(column)} IS {'NOT ' if operator == 'neq' else ''}NULL")
+            else:
+                clauses.append(f"{quote_identifier(column)} {_OPERATORS[operator]} {self.placeholder}")
+                params.append(value)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _logic(self, node):
+        combinator, conditions = node
+        parts = []
+        params = []
+        for condition in conditions:
+            if condition[0] in ('and', 'or'):
+                sql, nested_params = self._logic(condition)
+                parts.append(sql)
+                params.extend(nested_params)
+            else:
+                operator, column, value = condition
+                parts.append(f"{quote_identifier(column)} {_OPERATORS[operator]} {self.placeholder}")
+                params.append(value)
+        return "(" + f" {combinator.upper()} ".join(parts) + ")", params
+
+    def compile(self, query):
+        """Return a list of (sql, params) statements for a query"""
+        table = quote_identifier(query.table)
+        where, where_params = self._where(query)
+
+        if query.action == 'select':
+            sql = f"SELECT {self._select_list(query.columns)} FROM {table}{where}"
+            if query.ordering:
+                sql += " ORDER BY " + ", ".join(
+                    f"{quote_identifier(column)} {'DESC' if desc else 'ASC'}" for column, desc in query.ordering
+                )
+            if query.row_limit is not None:
+                sql += f" LIMIT {query.row_limit}"
+            return [(sql, where_params)]
+
+        if query.action == 'update':
+            columns = list(query.values)
+            assignments = ", ".join(f"{quote_identifier(c)} = {self.placeholder}" for c in columns)
+            sql = f"UPDATE {table} SET {assignments}{where} RETURNING *"
+            return [(sql, [query.values[c] for c in columns] + where_params)]
+
+        statements = []
+        for row in query.values:
+            columns = list(row)
+            column_list = ", ".join(quote_identifier(c) for c in columns)
+            values = ", ".join([self.placeholder] * len(columns))
+            sql = f"INSERT INTO {table} ({column_list}) VALUES ({values})"
+
+            if query.action == 'upsert':
+                conflict = [c.strip() for c in query.on_conflict.split(',')]
+                updates = [c for c in columns if c not in conflict]
+                sql += f" ON CONFLICT ({', '.join(quote_identifier(c) for c in conflict)}) DO "
+                if updates:
+                    sql += "UPDATE SET " + ", ".join(f"{quote_identifier(c)} = excluded.{quote_identifier(c)}" for c in updates)
+                else:
+                    sql += "NOTHING"
+
+            statements.append((sql + " RETURNING *", [row[c] for c in columns]))
+        return statements
+
+    def execute(self, query):
+        return self._run(query, self.compile(query))
+
+    def _run(self, query, statements):
+        raise NotImplementedError
+
+class SQLiteBackend(SQLBackend):
+    """Embedded backend for running and benchmarking fully offline"""
+
+    placeholder = '?'
+
+    def __init__(self, path=DEFAULT_SQLITE_PATH):
+        self.path = path
+        self._columns = {}
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.executescript(SQLITE_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _check_columns(self, conn, table, columns):
+        # Fail on unknown columns like PostgREST (PGRST204) does; new columns belong in SQLITE_SCHEMA
+        known = self._columns.get(table)
+        if known is None:
+            known = {row['name'] for row in conn.execute(f"PRAGMA table_info({quote_identifier(table)})")}
+            self._columns[table] = known
+
+        unknown = sorted(set(columns) - known)
+        if unknown:
+            raise ValueError(f"Could not find the {', '.join(repr(c) for c in unknown)} column(s) of '{table}' in the schema")
+
+    def _run(self, query, statements):
+        rows = []
+        with self._lock, self._connect() as conn:
+            if query.action != 'select':
+                values = query.values if isinstance(query.values, list) else [query.values]
+                self._check_columns(conn, query.table, {c for row in values for c in row})
+
+            for sql, params in statements:
+                rows.extend(dict(row) for row in conn.execute(sql, params).fetchall())
+        return rows
+
+def _to_json_value(value):
+    # Match what PostgREST returns over JSON so callers see the same types
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+class PostgresBackend(SQLBackend):
+    """Direct connection-pooled access to the Postgres database behind Supabase"""
+
+    placeholder = '%s'
+
+    def __init__(self, dsn, min_connections=DEFAULT_PG_MIN_CONNECTIONS, max_connections=DEFAULT_PG_MAX_CONNECTIONS):
+        from psycopg2.pool import ThreadedConnectionPool
+
+        self._pool = ThreadedConnectionPool(min_connections, max_connections, dsn)
+        # ThreadedConnectionPool raises when exhausted; make callers wait for a free connection instead
+        self._slots = threading.BoundedSemaphore(max_connections)
+
+    @contextmanager
+    def _connect(self):
+        import psycopg2
+
+        self._slots.acquire()
+        try:
+            conn = self._pool.getconn()
+        except Exception:
+            self._slots.release()
+            raise
+
+        broken = False
+        try:
+            yield conn
+            conn.commit()
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._pool.putconn(conn, close=broken)
+            self._slots.release()
+
+    def _run(self, query, statements):
+        from psycopg2.extras import RealDictCursor
+
+        rows = []
+        with self._connect() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                for sql, params in statements:
+                    cursor.execute(sql, params)
+                    rows.extend(
+                        {key: _to_json_value(value) for key, value in row.items()}
+                        for row in cursor.fetchall()
+                    )
+        return rows
+
+    def close(self):
+        self._pool.closeall()
+
+def create_storage_backend(name):
+    """Build the table backend named by STORAGE_BACKEND ('sqlite' or 'postgres')"""
+    if name == 'sqlite':
+        return SQLiteBackend(os.getenv("SQLITE_DB_PATH", DEFAULT_SQLITE_PATH))
+
+    if name == 'postgres':
+        dsn = os.getenv("DATABASE_URL")
+        if not dsn:
+            raise ValueError("DATABASE_URL must be set when STORAGE_BACKEND=postgres")
+        return PostgresBackend(
+            dsn,
+            min_connections=int(os.getenv("DB_POOL_MIN_CONNECTIONS", DEFAULT_PG_MIN_CONNECTIONS)),
+            max_connections=int(os.getenv("DB_POOL_MAX_CONNECTIONS", DEFAULT_PG_MAX_CONNECTIONS))
+        )
+
+    raise ValueError(f"Unknown STORAGE_BACKEND: {name}")
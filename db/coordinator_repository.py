@@ -0,0 +1,216 @@
+import os
+import time
+import threading
+from types import MappingProxyType
+from .database import get_supabase_client
+
+DEFAULT_TTL_SECONDS = 300
+
+def _email_key(email):
+    return (email or '').strip().lower()
+
+class CoordinatorIndex:
+    """Immutable lookup tables over one coord_details snapshot.
+
+    Built once per load so widget rendering never rescans the list:
+    department -> coordinators (in table order), (department, name) -> record
+    and email -> record.
+    """
+
+    __slots__ = ('_records', '_departments', '_by_department', '_by_department_name', '_by_email', '_by_id')
+
+    def __init__(self, records):
+        by_department = {}
+        by_department_name = {}
+        by_email = {}
+        by_id = {}
+        for record in records:
+            by_id[record.get('id')] = record
+            by_email[_email_key(record.get('email'))] = record
+            department = (record.get('department') or '').strip()
+            if department:
+                by_department.setdefault(department, []).append(record)
+                by_department_name.setdefault((department, record.get('name')), record)
+
+        object.__setattr__(self, '_records', tuple(records))
+        object.__setattr__(self, '_departments', tuple(sorted(by_department)))
+        object.__setattr__(self, '_by_department', MappingProxyType({d: tuple(r) for d, r in by_department.items()}))
+        object.__setattr__(self, '_by_department_name', MappingProxyType(by_department_name))
+        object.__setattr__(self, '_by_email', MappingProxyType(by_email))
+        object.__setattr__(self, '_by_id', MappingProxyType(by_id))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CoordinatorIndex is immutable")
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        return iter(self._records)
+
+    @property
+    def records(self):
+        return self._records
+
+    @property
+    def departments(self):
+        """Sorted department names"""
+        return self._departments
+
+    def in_department(self, department):
+        """Coordinators of a department in table order"""
+        return self._by_department.get((department or '').strip(), ())
+
+    def get(self, department, name):
+        return self._by_department_name.get(((department or '').strip(), name))
+
+    def by_email(self, email):
+        return self._by_email.get(_email_key(email))
+
+    def by_id(self, user_id):
+        return self._by_id.get(user_id)
+
+class CoordinatorRepository:
+    """In-memory cache of coord_details indexed by id, email and department.
+
+    The whole table is loaded in one request and refreshed once the TTL has
+    passed; lookups in between are dictionary hits. A miss by id or email falls
+    through to one targeted select, so a newly added coordinator is found
+    without waiting for the next refresh.
+    """
+
+    def __init__(self, client_factory=get_supabase_client, ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.client_factory = client_factory
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.RLock()
+        self._refreshed = threading.Condition(self._lock)
+        # Set while one thread is reloading the table outside the lock
+        self._refreshing = False
+        self._index = CoordinatorIndex([])
+        # Rows found by a targeted select after the snapshot was taken
+        self._late_by_id = {}
+        self._late_by_email = {}
+        self._loaded_at = None
+        self._version = 0
+
+    def _replace_snapshot(self, records):
+        self._index = CoordinatorIndex(records)
+        self._late_by_id = {}
+        self._late_by_email = {}
+        self._loaded_at = time.monotonic()
+        self._version += 1
+
+    def refresh(self):
+        """Reload the whole table; keeps the previous snapshot if the request fails"""
+        try:
+            response = self.client_factory().table("coord_details").select("*").execute()
+        except Exception as e:
+            print(f"Error refreshing coordinators: {e}")
+            with self._lock:
+                if self._loaded_at is None:
+                    raise
+                # Serve stale data rather than failing every lookup; retry after another TTL
+                self._loaded_at = time.monotonic()
+            return
+
+        with self._lock:
+            self._replace_snapshot(response.data or [])
+
+    def _is_stale(self):
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl_seconds
+
+    def _ensure_fresh(self):
+        """Reload an expired snapshot without holding the lock over the request
+
+        Only one thread fetches; the others keep reading the previous snapshot,
+        or wait for the first load when there is none yet.
+        """
+        with self._lock:
+            while True:
+                if not self._is_stale():
+                    return
+                if not self._refreshing:
+                    self._refreshing = True
+                    break
+                if self._loaded_at is not None:
+                    return
+                self._refreshed.wait()
+
+        try:
+            self.refresh()
+        finally:
+            with self._lock:
+                self._refreshing = False
+                self._refreshed.notify_all()
+
+    def invalidate(self):
+        """Drop the cached snapshot so the next lookup reloads it"""
+        with self._lock:
+            self._loaded_at = None
+
+    @property
+    def version(self):
+        """Increments whenever a new snapshot is loaded"""
+        self._ensure_fresh()
+        return self._version
+
+    def index(self):
+        """Current CoordinatorIndex; the same object is returned until the next reload"""
+        self._ensure_fresh()
+        with self._lock:
+            return self._index
+
+    def all(self):
+        return list(self.index().records)
+
+    def get_by_department(self, department):
+        return list(self.index().in_department(department))
+
+    def departments(self):
+        return list(self.index().departments)
+
+    def _fetch_one(self, column, value):
+        response = self.client_factory().table("coord_details").select("*").eq(column, value).limit(1).execute()
+        record = response.data[0] if response.data else None
+        if record:
+            with self._lock:
+                self._late_by_id[record.get('id')] = record
+                self._late_by_email[_email_key(record.get('email'))] = record
+        return record
+
+    def lookup_email(self, email):
+        """Return (record, from_cache) for an email"""
+        index = self.index()
+        with self._lock:
+            record = index.by_email(email) or self._late_by_email.get(_email_key(email))
+        if record:
+            return record, True
+        return self._fetch_one("email", email), False
+
+    def get_by_email(self, email):
+        return self.lookup_email(email)[0]
+
+    def get_by_id(self, user_id):
+        index = self.index()
+        with self._lock:
+            record = index.by_id(user_id) or self._late_by_id.get(user_id)
+        if record:
+            return record
+        return self._fetch_one("id", user_id)
+
+_repository = None
+_repository_lock = threading.Lock()
+
+def get_coordinator_repository():
+    """Return the process-wide coordinator repository"""
+    global _repository
+
+    if _repository is None:
+        with _repository_lock:
+            if _repository is None:
+                _repository = CoordinatorRepository(
+                    ttl_seconds=int(os.getenv("COORDINATOR_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+                )
+
+    return _repository
@@ -3,6 +3,11 @@ from dotenv import load_dotenv
 from supabase import create_client, Client
 import pytz
 from datetime import datetime
+import threading
+from .log_buffer import BufferedLogWriter
+from .backends import create_storage_backend
+from utils.tracing import span
+from utils.metrics import DB_REQUEST_SECONDS
 
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 env_path = os.path.join(project_root, '.env')
@@ -11,22 +16,102 @@ load_dotenv(env_path)
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+# 'supabase' (default), 'postgres' (direct pooled psycopg2 via DATABASE_URL) or 'sqlite' (offline)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "supabase").strip().lower()
 
 IST = pytz.timezone('Asia/Kolkata')
 
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT_SECONDS = 10.0
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 5.0
+DEFAULT_KEEPALIVE_SECONDS = 30.0
+
 _supabase_client = None
+_supabase_client_lock = threading.Lock()
+
+def _build_client_options():
+    """Client options sharing one keep-alive, traced httpx pool across every Supabase call"""
+    import httpx
+    from supabase.lib.client_options import SyncClientOptions
+
+    pool_size = int(os.getenv("SUPABASE_POOL_SIZE", DEFAULT_POOL_SIZE))
+    timeout = float(os.getenv("SUPABASE_TIMEOUT_SECONDS", DEFAULT_TIMEOUT_SECONDS))
+    connect_timeout = float(os.getenv("SUPABASE_CONNECT_TIMEOUT_SECONDS", DEFAULT_CONNECT_TIMEOUT_SECONDS))
+
+    class TracedTransport(httpx.HTTPTransport):
+        """Times every PostgREST round trip as a db.query span and in the latency histogram"""
+
+        def handle_request(self, request):
+            table = request.url.path.rstrip('/').rsplit('/', 1)[-1]
+            with span("db.query", backend="supabase", table=table, method=request.method) as current:
+                response = super().handle_request(request)
+                current['attributes']['status'] = response.status_code
+            DB_REQUEST_SECONDS.observe(current['duration'], backend="supabase", table=table)
+            return response
+
+    http_client = httpx.Client(
+        timeout=httpx.Timeout(timeout, connect=connect_timeout),
+        transport=TracedTransport(limits=httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size,
+            keepalive_expiry=float(os.getenv("SUPABASE_KEEPALIVE_SECONDS", DEFAULT_KEEPALIVE_SECONDS))
+        ))
+    )
+
+    try:
+        return SyncClientOptions(httpx_client=http_client, postgrest_client_timeout=timeout)
+    except TypeError:
+        # supabase releases before httpx_client was accepted still honour the timeout
+        http_client.close()
+        return SyncClientOptions(postgrest_client_timeout=timeout)
 
 def get_supabase_client() -> Client:
+    """Process-wide table client; safe to share between Streamlit sessions and worker threads.
+
+    With STORAGE_BACKEND set to 'postgres' or 'sqlite' this returns a backend exposing
+    the same table()/select()/eq()/execute() interface instead of a Supabase client.
+    """
     global _supabase_client
     
     if _supabase_client is None:
-        if not SUPABASE_URL or not SUPABASE_KEY:
-            raise ValueError("Supabase URL and KEY must be set in environment variables")
-        
-        _supabase_client = create_client(SUPABASE_URL, SUPABASE_KEY)
+        with _supabase_client_lock:
+            if _supabase_client is None and STORAGE_BACKEND != "supabase":
+                _supabase_client = create_storage_backend(STORAGE_BACKEND)
+            elif _supabase_client is None:
+                if not SUPABASE_URL or not SUPABASE_KEY:
+                    raise ValueError("Supabase URL and KEY must be set in environment variables")
+                
+                try:
+                    options = _build_client_options()
+                except ImportError as e:
+                    print(f"Warning: Supabase connection pooling unavailable, using defaults: {e}")
+                    options = None
+                
+                if options is None:
+                    _supabase_client = create_client(SUPABASE_URL, SUPABASE_KEY)
+                else:
+                    _supabase_client = create_client(SUPABASE_URL, SUPABASE_KEY, options=options)
     
     return _supabase_client
 
+_log_writer = None
+_log_writer_lock = threading.Lock()
+
+def get_log_writer():
+    """Shared buffered writer for append-only log tables (user_logs, mail_logs)"""
+    global _log_writer
+    
+    if _log_writer is None:
+        with _log_writer_lock:
+            if _log_writer is None:
+                _log_writer = BufferedLogWriter(
+                    get_supabase_client,
+                    max_batch_size=int(os.getenv("LOG_BUFFER_MAX_BATCH", "50")),
+                    flush_interval=float(os.getenv("LOG_BUFFER_FLUSH_SECONDS", "5"))
+                )
+    
+    return _log_writer
+
 def get_ist_time():
     return datetime.now(IST)
 
@@ -44,11 +129,10 @@ def test_connection():
 
 def get_user_by_email(email):
     try:
-        supabase = get_supabase_client()
-        response = supabase.table("coord_details").select("*").eq("email", email).execute()
+        from .coordinator_repository import get_coordinator_repository
+        user = get_coordinator_repository().get_by_email(email)
         
-        if response.data:
-            user = response.data[0]
+        if user:
             return {
                 'id': user['id'],
                 'name': user['name'],
@@ -64,11 +148,10 @@ def get_user_by_email(email):
 
 def get_user_by_id(user_id):
     try:
-        supabase = get_supabase_client()
-        response = supabase.table("coord_details").select("*").eq("id", user_id).execute()
+        from .coordinator_repository import get_coordinator_repository
+        user = get_coordinator_repository().get_by_id(user_id)
         
-        if response.data:
-            user = response.data[0]
+        if user:
             return {
                 'id': user['id'],
                 'name': user['name'],
@@ -82,10 +165,9 @@ def get_user_by_id(user_id):
         print(f"Error fetching user by ID: {e}")
         return None
 
-def log_user_activity(email, activity_type, details=None, dt=None):
+def log_user_activity(email, activity_type, details=None, dt=None, buffered=True):
+    """Record a user_logs row; pass buffered=False for rows later read or updated by (email, dt)"""
     try:
-        supabase = get_supabase_client()
-        
         ist_time = get_ist_time()
         if not dt:
             dt = generate_dt()
@@ -100,7 +182,10 @@ def log_user_activity(email, activity_type, details=None, dt=None):
         if details:
             log_entry.update(details)
         
-        supabase.table("user_logs").insert(log_entry).execute()
+        if buffered:
+            get_log_writer().add("user_logs", log_entry)
+        else:
+            get_supabase_client().table("user_logs").insert(log_entry).execute()
         
         return True, "Activity logged successfully", dt
         
@@ -110,6 +195,7 @@ def log_user_activity(email, activity_type, details=None, dt=None):
 def get_latest_user_log(email, dt=None):
     try:
         supabase = get_supabase_client()
+        get_log_writer().flush("user_logs")
         
         if dt:
             response = supabase.table("user_logs").select("*").eq("email", email).eq("dt", dt).execute()
@@ -129,6 +215,7 @@ def update_user_log(email, updates, dt=None):
         supabase = get_supabase_client()
         
         if dt:
+            get_log_writer().flush("user_logs")
             supabase.table("user_logs").update(updates).eq("email", email).eq("dt", dt).execute()
         else:
             latest_log = get_latest_user_log(email)
@@ -145,6 +232,7 @@ def update_user_log(email, updates, dt=None):
 def get_user_log_by_email_dt(email, dt):
     try:
         supabase = get_supabase_client()
+        get_log_writer().flush("user_logs")
         response = supabase.table("user_logs").select("*").eq("email", email).eq("dt", dt).execute()
         
         if response.data:
@@ -155,10 +243,17 @@ def get_user_log_by_email_dt(email, dt):
         print(f"Error fetching user log by email and dt: {e}")
         return None
 
+def _record_outreach(mail_log_entries):
+    try:
+        from .outreach_index import get_outreach_index
+        index = get_outreach_index()
+        for entry in mail_log_entries:
+            index.record(entry)
+    except Exception as e:
+        print(f"Warning: Could not update outreach index: {e}")
+
 def log_mail_activity(coordinator_name, company_name, hr_email, coordinator_email=None, email_subject=None, email_body=None):
     try:
-        supabase = get_supabase_client()
-        
         ist_time = get_ist_time()
         
         mail_log_entry = {
@@ -168,7 +263,11 @@ def log_mail_activity(coordinator_name, company_name, hr_email, coordinator_emai
             "timestamp": ist_time.isoformat(),
         }
         
-        response = supabase.table("mail_logs").insert(mail_log_entry).execute()
+        if coordinator_email:
+            mail_log_entry["coordinator_email"] = coordinator_email
+        
+        get_log_writer().add("mail_logs", mail_log_entry)
+        _record_outreach([mail_log_entry])
         
         return True, "Mail activity logged successfully"
         
@@ -178,6 +277,7 @@ def log_mail_activity(coordinator_name, company_name, hr_email, coordinator_emai
 def get_mail_logs_by_coordinator(coordinator_email=None, coordinator_name=None):
     try:
         supabase = get_supabase_client()
+        get_log_writer().flush("mail_logs")
         
         query = supabase.table("mail_logs").select("*")
         
@@ -198,10 +298,62 @@ def get_mail_logs_by_coordinator(coordinator_email=None, coordinator_name=None):
 def get_mail_logs_by_company(company_name):
     try:
         supabase = get_supabase_client()
+        get_log_writer().flush("mail_logs")
         
         response = supabase.table("mail_logs").select("*").eq("company_name", company_name).order("timestamp", desc=True).execute()
         
         return response.data, "Mail logs retrieved successfully"
         
     except Exception as e:
-        return None, f"Error fetching mail logs for company: {e}"
\ No newline at end of file
+        return None, f"Error fetching mail logs for company: {e}"
+
+# Enough to list history without pulling subjects/bodies over the wire
+MAIL_LOG_SUMMARY_COLUMNS = "id, timestamp, coordinator_name, coordinator_email, company_name, hr_email"
+DEFAULT_MAIL_LOG_PAGE_SIZE = 25
+
+def get_mail_logs_page(coordinator_email=None, coordinator_name=None, company_name=None, cursor=None,
+                       page_size=DEFAULT_MAIL_LOG_PAGE_SIZE, columns=MAIL_LOG_SUMMARY_COLUMNS):
+    """One page of mail_logs, newest first, paged by a (timestamp, id) keyset cursor.
+
+    Returns (rows, next_cursor, message). next_cursor is None on the last page;
+    otherwise pass it back to fetch the following page. Served by the
+    (coordinator_email, timestamp) and (company_name, timestamp) indexes.
+    """
+    try:
+        if not (coordinator_email or coordinator_name or company_name):
+            return None, None, "A coordinator or company filter must be provided"
+        
+        if columns != "*":
+            selected = [c.strip() for c in columns.split(",")]
+            columns = ", ".join(selected + [c for c in ("id", "timestamp") if c not in selected])
+        
+        supabase = get_supabase_client()
+        if cursor is None:
+            get_log_writer().flush("mail_logs")
+        
+        query = supabase.table("mail_logs").select(columns)
+        
+        if coordinator_email:
+            query = query.eq("coordinator_email", coordinator_email)
+        elif coordinator_name:
+            query = query.eq("coordinator_name", coordinator_name)
+        if company_name:
+            query = query.eq("company_name", company_name)
+        
+        if cursor:
+            timestamp, row_id = cursor
+            query = query.or_(f'timestamp.lt."{timestamp}",and(timestamp.eq."{timestamp}",id.lt.{row_id})')
+        
+        # One extra row tells us whether another page exists
+        response = query.order("timestamp", desc=True).order("id", desc=True).limit(page_size + 1).execute()
+        
+        rows = response.data or []
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = (rows[-1]["timestamp"], rows[-1]["id"])
+        
+        return rows, next_cursor, "Mail logs retrieved successfully"
+        
+    except Exception as e:
+        return None, None, f"Error fetching mail logs page: {e}"
@@ -0,0 +1,191 @@
+import atexit
+import threading
+from collections import deque
+
+DEFAULT_MAX_BATCH_SIZE = 50
+DEFAULT_FLUSH_INTERVAL = 5.0
+# Rows kept per table while Supabase is unreachable; older rows are dropped past this
+DEFAULT_MAX_BUFFERED_ROWS = 5000
+# Flushes a row may fail transiently before it is dead-lettered
+DEFAULT_MAX_ROW_ATTEMPTS = 5
+DEAD_LETTER_SIZE = 200
+
+# Exception class names (anywhere in the MRO) meaning the database was unreachable or busy,
+# as raised by httpx, sqlite3 and psycopg2; anything else is a problem with the rows themselves
+TRANSIENT_ERROR_NAMES = frozenset({
+    "TransportError", "TimeoutException", "OperationalError", "InterfaceError", "PoolError"
+})
+
+# PostgREST codes for "could not reach / get a connection to Postgres" (served as 503/504)
+TRANSIENT_POSTGREST_CODES = frozenset({"PGRST000", "PGRST001", "PGRST002", "PGRST003"})
+# SQLSTATE classes: connection exception, transaction rollback, insufficient resources, operator intervention
+TRANSIENT_SQLSTATE_CLASSES = frozenset({"08", "40", "53", "57"})
+
+def _is_transient_api_error(error):
+    """supabase-py raises postgrest.APIError for every non-2xx reply instead of an HTTP error.
+
+    Non-JSON replies (gateway 429/502/503 pages) carry the HTTP status as the
+    code; JSON replies carry a PostgREST or SQLSTATE code. A reply with no code
+    at all did not come from PostgREST (e.g. the API gateway's rate limiter).
+    """
+    code = getattr(error, 'code', None)
+    if code is None:
+        return True
+    code = str(code)
+    if code.isdigit() and len(code) == 3:
+        return code == "429" or code.startswith("5")
+    if code in TRANSIENT_POSTGREST_CODES:
+        return True
+    return len(code) == 5 and code[:2] in TRANSIENT_SQLSTATE_CLASSES
+
+def is_transient_error(error):
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    names = {cls.__name__ for cls in type(error).__mro__}
+    if "APIError" in names:
+        return _is_transient_api_error(error)
+    return bool(names & TRANSIENT_ERROR_NAMES)
+
+def group_by_columns(entries):
+    """Split (row, attempts) entries into groups whose rows share the same keys; a bulk insert requires matching columns"""
+    groups = {}
+    for entry in entries:
+        groups.setdefault(tuple(sorted(entry[0])), []).append(entry)
+    return list(groups.values())
+
+class BufferedLogWriter:
+    """Accumulates log rows in memory and writes them with one multi-row insert per table.
+
+    A table is flushed when it reaches max_batch_size rows, every flush_interval
+    seconds from a background thread, and at interpreter shutdown.
+
+    Only transient errors (connection, timeout, busy database, and PostgREST
+    APIErrors for HTTP 429/5xx or connection SQLSTATEs, see is_transient_error)
+    put a batch back for the next flush, and at most max_row_attempts times.
+    Any other error, such as a PGRST or constraint 4xx, retries the batch row by
+    row so one bad row is dead-lettered instead of blocking the rows batched
+    with it.
+    """
+
+    def __init__(self, client_factory, max_batch_size=DEFAULT_MAX_BATCH_SIZE, flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 max_buffered_rows=DEFAULT_MAX_BUFFERED_ROWS, max_row_attempts=DEFAULT_MAX_ROW_ATTEMPTS):
+        self.client_factory = client_factory
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_buffered_rows = max_buffered_rows
+        self.max_row_attempts = max_row_attempts
+
+        # table -> [(row, failed_attempts)]
+        self._buffers = {}
+        self._dead_letters = deque(maxlen=DEAD_LETTER_SIZE)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+
+        self._thread = threading.Thread(target=self._run, name="log-buffer-flusher", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def add(self, table, row):
+        self.add_many(table, [row])
+
+    def add_many(self, table, rows):
+        with self._lock:
+            buffer = self._buffers.setdefault(table, [])
+            buffer.extend((row, 0) for row in rows)
+            if len(buffer) > self.max_buffered_rows:
+                dropped = len(buffer) - self.max_buffered_rows
+                del buffer[:dropped]
+                print(f"Warning: dropped {dropped} buffered {table} rows")
+            should_flush = len(buffer) >= self.max_batch_size
+
+        if should_flush:
+            self._wakeup.set()
+
+    def pending(self, table=None):
+        with self._lock:
+            if table:
+                return len(self._buffers.get(table, []))
+            return sum(len(rows) for rows in self._buffers.values())
+
+    def dead_letters(self):
+        """Most recent rows dropped after a permanent error or too many attempts: (table, row, error)"""
+        with self._lock:
+            return list(self._dead_letters)
+
+    def _dead_letter(self, table, row, error):
+        print(f"Dropping {table} row after error: {error} ({row})")
+        with self._lock:
+            self._dead_letters.append((table, row, str(error)))
+
+    def _insert(self, table, rows):
+        self.client_factory().table(table).insert(rows).execute()
+
+    def _write_group(self, table, entries):
+        """Insert one column group; returns (rows written, entries to retry on the next flush)"""
+        try:
+            self._insert(table, [row for row, _ in entries])
+            return len(entries), []
+        except Exception as e:
+            print(f"Error flushing {len(entries)} {table} rows: {e}")
+            if is_transient_error(e):
+                return 0, self._retry_later(table, entries, e)
+            if len(entries) == 1:
+                self._dead_letter(table, entries[0][0], e)
+                return 0, []
+
+        # Not a connectivity problem: isolate the offending rows
+        written = 0
+        retry = []
+        for entry in entries:
+            try:
+                self._insert(table, [entry[0]])
+                written += 1
+            except Exception as e:
+                if is_transient_error(e):
+                    retry.extend(self._retry_later(table, [entry], e))
+                else:
+                    self._dead_letter(table, entry[0], e)
+        return written, retry
+
+    def _retry_later(self, table, entries, error):
+        retry = []
+        for row, attempts in entries:
+            if attempts + 1 >= self.max_row_attempts:
+                self._dead_letter(table, row, f"gave up after {attempts + 1} attempts: {error}")
+            else:
+                retry.append((row, attempts + 1))
+        return retry
+
+    def flush(self, table=None):
+        """Write buffered rows now; returns the number of rows written"""
+        written = 0
+        with self._flush_lock:
+            with self._lock:
+                tables = [table] if table else list(self._buffers)
+                batches = {t: self._buffers.pop(t, []) for t in tables}
+
+            for name, entries in batches.items():
+                failed = []
+                for group in group_by_columns(entries):
+                    group_written, retry = self._write_group(name, group)
+                    written += group_written
+                    failed.extend(retry)
+
+                if failed:
+                    with self._lock:
+                        # Put them back in front of anything buffered meanwhile
+                        self._buffers[name] = failed + self._buffers.get(name, [])
+        return written
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def close(self):
+        self._stopped.set()
+        self._wakeup.set()
+        self.flush()
@@ -1,30 +1,17 @@
-from datetime import datetime, timezone
-from .database import get_supabase_client, get_user_by_email, get_user_log_by_email_dt, update_user_log, log_user_activity
+from datetime import datetime
+from .database import get_supabase_client, update_user_log
+from .auth_store import parse_datetime_string, get_otp_meta, get_login_user, consume_otp, end_login
 import pytz
+from utils.metrics import OTP_VERIFICATIONS
 
 IST = pytz.timezone('Asia/Kolkata')
 
 def get_ist_time():
     return datetime.now(IST)
 
-def parse_datetime_string(datetime_str):
-    if not datetime_str:
-        return None
-    
-    try:
-        if datetime_str.endswith('Z'):
-            return datetime.fromisoformat(datetime_str.replace('Z', '+00:00'))
-        elif '+' in datetime_str:
-            return datetime.fromisoformat(datetime_str)
-        else:
-            return datetime.fromisoformat(datetime_str).replace(tzinfo=timezone.utc)
-    except Exception as e:
-        print(f"Error parsing datetime string '{datetime_str}': {e}")
-        return None
-
 def is_otp_expired(email, dt):
     try:
-        log_entry = get_user_log_by_email_dt(email, dt)
+        log_entry = get_otp_meta(email, dt)
         
         if not log_entry:
             return True
@@ -48,7 +35,7 @@ def is_otp_expired(email, dt):
 
 def get_otp_expiry_time(email, dt):
     try:
-        log_entry = get_user_log_by_email_dt(email, dt)
+        log_entry = get_otp_meta(email, dt)
         
         if not log_entry:
             return None
@@ -65,7 +52,7 @@ def get_otp_expiry_time(email, dt):
 
 def get_otp_times_ist(email, dt):
     try:
-        log_entry = get_user_log_by_email_dt(email, dt)
+        log_entry = get_otp_meta(email, dt)
         
         if not log_entry:
             return None, None
@@ -91,59 +78,39 @@ def get_otp_times_ist(email, dt):
         print(f"Error getting OTP times: {e}")
         return None, None
 
+OTP_FAILURE_MESSAGES = {
+    'missing': "No OTP record found. Please request a new OTP.",
+    'expired': "OTP has expired. Please request a new OTP.",
+    'invalid': "Invalid OTP. Please check and try again."
+}
+
 def verify_otp(email, entered_otp, dt):
     try:
-        user_data = get_user_by_email(email)
-        if not user_data:
+        user = get_login_user(email)
+        if not user:
+            OTP_VERIFICATIONS.inc(result="unknown_user")
             return False, "User not found", None
         
-        log_entry = get_user_log_by_email_dt(email, dt)
-        if not log_entry:
-            return False, "No OTP record found. Please request a new OTP.", None
-        
-        stored_otp = log_entry.get('otp')
-        otp_expiry_str = log_entry.get('otp_expiry')
-        
-        if not stored_otp or not otp_expiry_str:
-            return False, "Invalid OTP record. Please request a new OTP.", None
-        
-        otp_expiry = parse_datetime_string(otp_expiry_str)
-        if not otp_expiry:
-            return False, "Invalid OTP expiry format. Please request a new OTP.", None
+        user_data = {
+            'id': user['id'],
+            'name': user['name'],
+            'email': user['email'],
+            'phone': user.get('phone'),
+            'roll_number': user['roll_number']
+        }
         
-        now_ist = get_ist_time()
-        otp_expiry_ist = otp_expiry.astimezone(IST)
+        verified, reason = consume_otp(email, entered_otp, dt)
+        OTP_VERIFICATIONS.inc(result="success" if verified else reason)
+        if not verified:
+            return False, OTP_FAILURE_MESSAGES[reason], None
         
-        if now_ist >= otp_expiry_ist:
-            return False, "OTP has expired. Please request a new OTP.", None
-        
-        if stored_otp != entered_otp:
-            return False, "Invalid OTP. Please check and try again.", None
-        
-        try:
-            ist_time = get_ist_time()
-            
-            update_user_log(email, {
-                "password_hash": "otp_verified_success",
-                "last_login": ist_time.isoformat()
-            }, dt)
-            
-            log_user_activity(
-                email=email,
-                activity_type="login_success",
-                details={
-                    "password_hash": "otp_login_complete",
-                    "last_login": ist_time.isoformat(),
-                    "verified_dt": dt
-                }
-            )
-            
-        except Exception as log_error:
-            print(f"Warning: Could not log OTP verification: {log_error}")
+        round_trips = end_login(email)
+        print(f"Login for {email} completed with {len(round_trips)} database round trips: {', '.join(round_trips)}")
         
         return True, f"OTP verified successfully. Welcome {user_data['name']}!", user_data
         
     except Exception as e:
+        OTP_VERIFICATIONS.inc(result="error")
         return False, f"OTP verification error: {str(e)}", None
 
 def clear_user_otp(email, dt):
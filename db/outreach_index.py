@@ -0,0 +1,151 @@
+import os
+import time
+import threading
+from .database import get_supabase_client, get_log_writer
+from utils.company_names import CompanyNameIndex, canonical_company_key
+
+DEFAULT_REFRESH_SECONDS = 60
+DEFAULT_BATCH_SIZE = 1000
+OUTREACH_COLUMNS = "id, timestamp, company_name, hr_email, coordinator_name, coordinator_email"
+
+# Shared mailbox providers say nothing about which company an address belongs to
+FREE_MAIL_DOMAINS = frozenset({
+    "gmail.com", "googlemail.com", "yahoo.com", "yahoo.co.in", "outlook.com",
+    "hotmail.com", "live.com", "icloud.com", "rediffmail.com", "proton.me", "protonmail.com",
+})
+
+def normalize_company_name(name):
+    """Key shared by spelling variants of a company name ('TCS Ltd.' -> 'tcs')"""
+    return canonical_company_key(name)
+
+def email_domain(email):
+    """Company domain of an address, or None for blanks and free-mail providers"""
+    _, _, domain = (email or '').strip().lower().rpartition('@')
+    if not domain or domain in FREE_MAIL_DOMAINS:
+        return None
+    return domain
+
+class OutreachIndex:
+    """Last contact per company and per HR email domain, built from mail_logs.
+
+    The first lookup loads the table; afterwards only rows with an id above the
+    watermark are fetched, at most every refresh_seconds. Sends logged by this
+    process are recorded immediately, so lookups never wait on the log buffer.
+    """
+
+    def __init__(self, client_factory=get_supabase_client, refresh_seconds=DEFAULT_REFRESH_SECONDS,
+                 batch_size=DEFAULT_BATCH_SIZE):
+        self.client_factory = client_factory
+        self.refresh_seconds = refresh_seconds
+        self.batch_size = batch_size
+
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._by_company = {}
+        self._by_domain = {}
+        self._names = CompanyNameIndex()
+        self._last_id = None
+        self._refreshed_at = None
+
+    def _apply(self, row):
+        # Caller holds _lock
+        contact = {
+            'company_name': row.get('company_name'),
+            'hr_email': row.get('hr_email'),
+            'coordinator_name': row.get('coordinator_name'),
+            'coordinator_email': row.get('coordinator_email'),
+            'timestamp': row.get('timestamp') or '',
+        }
+
+        keys = []
+        company_key = self._names.add(contact['company_name'] or '')
+        if company_key:
+            keys.append((self._by_company, company_key))
+        domain = email_domain(contact['hr_email'])
+        if domain:
+            keys.append((self._by_domain, domain))
+
+        for table, key in keys:
+            existing = table.get(key)
+            if existing is None or contact['timestamp'] >= existing['timestamp']:
+                table[key] = contact
+
+    def refresh(self):
+        """Fetch mail_logs rows added since the last refresh"""
+        with self._refresh_lock:
+            get_log_writer().flush("mail_logs")
+
+            while True:
+                query = self.client_factory().table("mail_logs").select(OUTREACH_COLUMNS)
+                if self._last_id is not None:
+                    query = query.gt("id", self._last_id)
+                rows = query.order("id").limit(self.batch_size).execute().data or []
+
+                with self._lock:
+                    for row in rows:
+                        self._apply(row)
+                    if rows:
+                        self._last_id = rows[-1]['id']
+
+                if len(rows) < self.batch_size:
+                    break
+
+            self._refreshed_at = time.monotonic()
+
+    def _ensure_fresh(self):
+        if self._refreshed_at is not None and time.monotonic() - self._refreshed_at < self.refresh_seconds:
+            return
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"Error refreshing outreach index: {e}")
+            # Keep answering from what we have; try again after the next interval
+            self._refreshed_at = time.monotonic()
+
+    def record(self, row):
+        """Note a contact made by this process without waiting for the next refresh"""
+        with self._lock:
+            self._apply(row)
+
+    def find(self, company_name=None, hr_email=None):
+        """Most recent earlier contact matching the company name or HR email domain, or None"""
+        self._ensure_fresh()
+
+        matches = []
+        with self._lock:
+            company_key = normalize_company_name(company_name)
+            if company_key and company_key in self._by_company:
+                matches.append(dict(self._by_company[company_key], matched_on='company'))
+            elif company_key:
+                # 'TCS' for 'Tata Consultancy Services', typos, partially typed names
+                similar_key = self._names.resolve(company_name)
+                if similar_key in self._by_company:
+                    matches.append(dict(self._by_company[similar_key], matched_on='similar_company'))
+            domain = email_domain(hr_email)
+            if domain and domain in self._by_domain:
+                matches.append(dict(self._by_domain[domain], matched_on='domain'))
+
+        if not matches:
+            return None
+        return max(matches, key=lambda contact: contact['timestamp'])
+
+    def suggest(self, company_name, k=5):
+        """Previously contacted company names similar to company_name, best first"""
+        self._ensure_fresh()
+        return [display for display, _, _ in self._names.suggest(company_name, k=k)]
+
+_outreach_index = None
+_outreach_index_lock = threading.Lock()
+
+def get_outreach_index():
+    """Return the process-wide outreach index"""
+    global _outreach_index
+
+    if _outreach_index is None:
+        with _outreach_index_lock:
+            if _outreach_index is None:
+                _outreach_index = OutreachIndex(
+                    refresh_seconds=float(os.getenv("OUTREACH_INDEX_REFRESH_SECONDS", DEFAULT_REFRESH_SECONDS))
+                )
+
+    return _outreach_index
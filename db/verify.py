@@ -1,18 +1,14 @@
 import os
 from datetime import datetime, timezone
 from dotenv import load_dotenv
-from supabase import create_client, Client
 import pytz
+from .database import get_supabase_client
 
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 env_path = os.path.join(project_root, '.env')
 
 load_dotenv(env_path)
 
-url = os.getenv("SUPABASE_URL")
-key = os.getenv("SUPABASE_KEY")
-supabase: Client = create_client(url, key)
-
 IST = pytz.timezone('Asia/Kolkata')
 
 def get_ist_time():
@@ -39,7 +35,7 @@ def log_successful_login(email, dt=None):
             "last_login": ist_time.isoformat()
         }
         
-        result = supabase.table("user_logs").insert(login_record).execute()
+        result = get_supabase_client().table("user_logs").insert(login_record).execute()
         print(f"Final login logged successfully for {email} with dt: {dt}")
         print(f"IST time saved: {ist_time.strftime('%Y-%m-%d %H:%M:%S %Z')}")
         print(f"IST time ISO: {ist_time.isoformat()}")
@@ -56,7 +52,7 @@ def verify_otp(email, entered_otp, dt):
         if not user_data:
             return False, "User not found", None
         
-        response = supabase.table("user_logs").select("*").eq("email", email).eq("dt", dt).execute()
+        response = get_supabase_client().table("user_logs").select("*").eq("email", email).eq("dt", dt).execute()
         
         if not response.data:
             return False, "No OTP record found. Please request a new OTP.", None
@@ -91,7 +87,7 @@ def verify_otp(email, entered_otp, dt):
         try:
             ist_time = get_ist_time()
             
-            supabase.table("user_logs").update({
+            get_supabase_client().table("user_logs").update({
                 "password_hash": "otp_verified_success",
                 "last_login": ist_time.isoformat()
             }).eq("email", email).eq("dt", dt).execute()
@@ -101,9 +97,9 @@ def verify_otp(email, entered_otp, dt):
         except Exception as log_error:
             print(f"Warning: Could not log successful login: {log_error}")
         
-        coord_response = supabase.table("coord_details").select("*").eq("email", email).execute()
-        if coord_response.data:
-            coord_data = coord_response.data[0]
+        from db.coordinator_repository import get_coordinator_repository
+        coord_data = get_coordinator_repository().get_by_email(email)
+        if coord_data:
             user_data = {
                 'id': coord_data['id'],
                 'name': coord_data['name'],
@@ -119,7 +115,7 @@ def verify_otp(email, entered_otp, dt):
 
 def is_otp_valid(email, dt):
     try:
-        response = supabase.table("user_logs").select("otp, otp_expiry, password_hash").eq("email", email).eq("dt", dt).execute()
+        response = get_supabase_client().table("user_logs").select("otp, otp_expiry, password_hash").eq("email", email).eq("dt", dt).execute()
         
         if not response.data:
             return False, 0
@@ -163,7 +159,7 @@ def clear_expired_otps():
     try:
         now_ist = get_ist_time()
         
-        supabase.table("user_logs").update({
+        get_supabase_client().table("user_logs").update({
             "otp": None,
             "otp_expiry": None
         }).lt("otp_expiry", now_ist.isoformat()).neq("password_hash", "otp_verified_success").execute()
@@ -175,7 +171,7 @@ def clear_expired_otps():
 
 def revoke_otp(email, dt):
     try:
-        supabase.table("user_logs").update({
+        get_supabase_client().table("user_logs").update({
             "otp": None,
             "otp_expiry": None,
             "password_hash": "otp_revoked"
@@ -188,7 +184,7 @@ def revoke_otp(email, dt):
 
 def get_otp_info(email, dt):
     try:
-        response = supabase.table("user_logs").select("*").eq("email", email).eq("dt", dt).execute()
+        response = get_supabase_client().table("user_logs").select("*").eq("email", email).eq("dt", dt).execute()
         
         if not response.data:
             return None
@@ -201,7 +197,7 @@ def get_otp_info(email, dt):
 
 def get_verified_otp_records(email):
     try:
-        response = supabase.table("user_logs").select("*").eq("email", email).eq("password_hash", "otp_verified_success").execute()
+        response = get_supabase_client().table("user_logs").select("*").eq("email", email).eq("password_hash", "otp_verified_success").execute()
         return response.data
         
     except Exception as e:
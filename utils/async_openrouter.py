@@ -0,0 +1,207 @@
+import os
+import time
+import random
+import asyncio
+import threading
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+DEFAULT_DEADLINE_SECONDS = 60.0
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BASE_BACKOFF = 0.5
+DEFAULT_MAX_BACKOFF = 8.0
+# Hedging waits for this many observed latencies before trusting the p95
+DEFAULT_HEDGE_MIN_SAMPLES = 20
+LATENCY_WINDOW = 200
+
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def get_status_code(error):
+    return getattr(error, 'status_code', None) or getattr(getattr(error, 'response', None), 'status_code', None)
+
+def is_retryable(error):
+    """429/5xx responses, timeouts and dropped connections are worth another attempt"""
+    import openai
+
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError, asyncio.TimeoutError)):
+        return True
+    return get_status_code(error) in RETRYABLE_STATUS_CODES
+
+def retry_delay(error, attempt, base_backoff=DEFAULT_BASE_BACKOFF, max_backoff=DEFAULT_MAX_BACKOFF):
+    """Honour Retry-After when the server sends it, else full-jitter exponential backoff"""
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    retry_after = parse_retry_after(headers.get('retry-after'))
+    if retry_after is not None:
+        return retry_after
+    return random.uniform(0, min(max_backoff, base_backoff * (2 ** attempt)))
+
+def percentile(samples, fraction):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+class ResilientCompletionClient:
+    """AsyncOpenAI wrapper with per-call deadlines, jittered retries and hedged requests.
+
+    Each call gets one overall deadline. Retryable failures (429, 5xx, timeouts)
+    are retried with backoff, honouring Retry-After, as long as the deadline
+    allows. With hedge=True (opt-in) and enough latencies known, a second identical request is fired
+    if the first has not answered within the observed p95, and whichever
+    finishes first wins. complete() runs the coroutine on a private event loop
+    thread so it can be called from Streamlit scripts and worker threads.
+    """
+
+    def __init__(self, api_key, base_url=OPENROUTER_BASE_URL, deadline=DEFAULT_DEADLINE_SECONDS,
+                 max_retries=DEFAULT_MAX_RETRIES, hedge=False, hedge_min_samples=DEFAULT_HEDGE_MIN_SAMPLES,
+                 base_backoff=DEFAULT_BASE_BACKOFF, max_backoff=DEFAULT_MAX_BACKOFF):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._counters = {'calls': 0, 'retries': 0, 'hedges': 0, 'hedge_wins': 0, 'deadline_exceeded': 0}
+        self._stats_lock = threading.Lock()
+
+        self._client = None
+        self._loop = None
+        self._loop_lock = threading.Lock()
+
+    def _get_loop(self):
+        with self._loop_lock:
+            if self._loop is None:
+                from openai import AsyncOpenAI
+
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="openrouter-async", daemon=True).start()
+                # The SDK's own retries would fight ours, so disable them
+                self._client = AsyncOpenAI(base_url=self.base_url, api_key=self.api_key, max_retries=0)
+                self._loop = loop
+        return self._loop
+
+    def _count(self, name):
+        with self._stats_lock:
+            self._counters[name] += 1
+
+    def hedge_delay(self):
+        """Observed p95 latency once enough samples exist, else None (no hedging)"""
+        with self._stats_lock:
+            if not self.hedge or len(self._latencies) < self.hedge_min_samples:
+                return None
+            return percentile(self._latencies, 0.95)
+
+    def stats(self):
+        with self._stats_lock:
+            latencies = list(self._latencies)
+            stats = dict(self._counters)
+        stats.update({'p50': percentile(latencies, 0.5), 'p95': percentile(latencies, 0.95), 'samples': len(latencies)})
+        return stats
+
+    async def _request(self, request, timeout):
+        started = time.monotonic()
+        response = await self._client.chat.completions.create(timeout=timeout, **request)
+        with self._stats_lock:
+            self._latencies.append(time.monotonic() - started)
+        return response
+
+    async def _hedged_request(self, request, deadline_at):
+        remaining = deadline_at - time.monotonic()
+        primary = asyncio.ensure_future(self._request(request, remaining))
+        tasks = {primary}
+
+        try:
+            delay = self.hedge_delay()
+            if delay is not None and delay < remaining:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done:
+                    self._count('hedges')
+                    tasks.add(asyncio.ensure_future(self._request(request, deadline_at - time.monotonic())))
+
+            error = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self._count('hedge_wins')
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def acomplete(self, deadline=None, **request):
+        """Create a chat completion within the deadline; request takes chat.completions.create kwargs"""
+        self._get_loop()
+        self._count('calls')
+        deadline_at = time.monotonic() + (deadline or self.deadline)
+
+        attempt = 0
+        while True:
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                self._count('deadline_exceeded')
+                raise asyncio.TimeoutError("OpenRouter request deadline exceeded")
+
+            try:
+                return await asyncio.wait_for(self._hedged_request(request, deadline_at), timeout=remaining)
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    if isinstance(e, asyncio.TimeoutError):
+                        self._count('deadline_exceeded')
+                    raise
+
+                delay = retry_delay(e, attempt, self.base_backoff, self.max_backoff)
+                if time.monotonic() + delay >= deadline_at:
+                    raise
+                print(f"OpenRouter request failed ({e}); retrying in {delay:.1f}s")
+                self._count('retries')
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    def complete(self, deadline=None, **request):
+        """Blocking acomplete() for synchronous callers"""
+        loop = self._get_loop()
+        return asyncio.run_coroutine_threadsafe(self.acomplete(deadline=deadline, **request), loop).result()
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+def get_resilient_client(client):
+    """Resilient async client sharing the base URL and key of a configured OpenAI client"""
+    base_url = str(getattr(client, 'base_url', None) or OPENROUTER_BASE_URL)
+    api_key = getattr(client, 'api_key', None) or os.getenv("OPENROUTER_API_KEY")
+    key = (base_url, api_key)
+
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = ResilientCompletionClient(
+                api_key,
+                base_url=base_url,
+                deadline=float(os.getenv("OPENROUTER_DEADLINE_SECONDS", DEFAULT_DEADLINE_SECONDS)),
+                max_retries=int(os.getenv("OPENROUTER_MAX_RETRIES", DEFAULT_MAX_RETRIES)),
+                # Opt-in: on the free tier a duplicate request when the model is slow mostly buys a 429
+                hedge=os.getenv("OPENROUTER_HEDGE", "0").strip().lower() in ("1", "true", "yes")
+            )
+        return _clients[key]
@@ -0,0 +1,225 @@
+import csv
+import io
+import json
+import os
+import hashlib
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from utils.invitation_generator import generate_invitation, get_model_provider
+from utils.company_names import canonical_company_key
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_PROVIDER_LIMIT = 2
+
+# Concurrent in-flight requests allowed per upstream provider. Free-tier
+# models rate limit aggressively, so keep these well below DEFAULT_MAX_WORKERS.
+PROVIDER_CONCURRENCY = {
+    "mistralai": 4,
+}
+
+MIN_BULLET_POINTS = 4
+MAX_BULLET_POINTS = 7
+DEFAULT_BULLET_POINTS = 6
+
+def _normalize_row(raw):
+    row = {str(k).strip().lower(): (v.strip() if isinstance(v, str) else v) for k, v in raw.items() if k is not None}
+
+    company_name = row.get('company_name') or row.get('company') or ''
+    additional_info = row.get('additional_info') or row.get('info') or ''
+    coordinator = row.get('coordinator') or row.get('coordinator_email') or row.get('coordinator_name') or ''
+    hr_email = row.get('hr_email') or row.get('email') or ''
+
+    try:
+        num_bullet_points = int(row.get('num_bullet_points') or row.get('bullets') or DEFAULT_BULLET_POINTS)
+    except (TypeError, ValueError):
+        num_bullet_points = DEFAULT_BULLET_POINTS
+    num_bullet_points = max(MIN_BULLET_POINTS, min(MAX_BULLET_POINTS, num_bullet_points))
+
+    return {
+        'company_name': company_name,
+        'additional_info': additional_info,
+        'coordinator': coordinator,
+        'hr_email': hr_email,
+        'num_bullet_points': num_bullet_points
+    }
+
+def parse_batch_file(content, filename):
+    """Parse a CSV or JSONL campaign file into normalized rows"""
+    if isinstance(content, bytes):
+        content = content.decode('utf-8-sig')
+
+    if filename.lower().endswith('.jsonl'):
+        raw_rows = [json.loads(line) for line in content.splitlines() if line.strip()]
+    else:
+        raw_rows = list(csv.DictReader(io.StringIO(content)))
+
+    rows = [_normalize_row(raw) for raw in raw_rows]
+    return [row for row in rows if row['company_name']]
+
+def resolve_coordinator(coordinators, value):
+    """Find a coordinator record by email or (case-insensitive) name"""
+    if not value:
+        return None
+
+    needle = value.strip().lower()
+    for coord in coordinators:
+        if (coord.get('email') or '').strip().lower() == needle:
+            return coord
+    for coord in coordinators:
+        if (coord.get('name') or '').strip().lower() == needle:
+            return coord
+    return None
+
+def compute_row_key(row):
+    """Stable identity for a campaign row, used to resume interrupted runs and skip duplicates.
+
+    The company part is the canonical key, so 'TCS Ltd.' and 'tcs' rows are the same row.
+    The HR contact is part of it too: the same company mailed at two addresses is two rows.
+    """
+    raw = "|".join([
+        canonical_company_key(row['company_name']),
+        row['coordinator'].strip().lower(),
+        (row.get('hr_email') or '').strip().lower(),
+        row['additional_info'].strip().lower(),
+        str(row['num_bullet_points'])
+    ])
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+def load_completed_keys(output_path):
+    """Return row keys already generated successfully in a previous run"""
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+
+    with open(output_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A partially written trailing line from a crashed run
+                continue
+            if record.get('status') == 'ok':
+                completed.add(record.get('row_key'))
+    return completed
+
+def load_results(output_path):
+    """Return the latest result record per row key from an output file"""
+    results = {}
+    if not os.path.exists(output_path):
+        return []
+
+    with open(output_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            results[record.get('row_key')] = record
+    return list(results.values())
+
+def _provider_semaphores(provider_limits):
+    limits = dict(PROVIDER_CONCURRENCY)
+    if provider_limits:
+        limits.update(provider_limits)
+    return {provider: threading.BoundedSemaphore(limit) for provider, limit in limits.items()}
+
+def run_batch_generation(rows, coordinators, base_message, client, output_path, max_workers=DEFAULT_MAX_WORKERS,
+                         provider_limits=None, model=None, progress_callback=None):
+    """Generate invitations for many companies concurrently, appending results to a JSONL file.
+
+    Rows already present in output_path with status 'ok' are skipped, so an
+    interrupted campaign can be resumed by running it again with the same file.
+    progress_callback(done, total, record) is called from the calling thread.
+    """
+    completed_keys = load_completed_keys(output_path)
+    pending = []
+    queued_keys = set()
+    for row in rows:
+        key = compute_row_key(row)
+        if key not in completed_keys and key not in queued_keys:
+            queued_keys.add(key)
+            pending.append((key, row))
+
+    total = len(rows)
+    done = total - len(pending)
+    summary = {'total': total, 'skipped': done, 'succeeded': 0, 'failed': 0}
+
+    if not pending:
+        return summary
+
+    semaphores = _provider_semaphores(provider_limits)
+    semaphores_lock = threading.Lock()
+
+    def provider_slot(chosen_model):
+        # Taken per model call, so a routed run that fails over is limited by the provider actually called
+        provider = get_model_provider(chosen_model)
+        with semaphores_lock:
+            if provider not in semaphores:
+                semaphores[provider] = threading.BoundedSemaphore(DEFAULT_PROVIDER_LIMIT)
+            return semaphores[provider]
+
+    write_lock = threading.Lock()
+
+    def process(key, row):
+        record = {
+            'row_key': key,
+            'company_name': row['company_name'],
+            'coordinator': row['coordinator'],
+            'hr_email': row.get('hr_email', ''),
+            'num_bullet_points': row['num_bullet_points'],
+        }
+
+        selected_coordinator = resolve_coordinator(coordinators, row['coordinator'])
+        if not selected_coordinator:
+            record.update({'status': 'error', 'error': f"Unknown coordinator: {row['coordinator'] or '(empty)'}"})
+        else:
+            try:
+                content = generate_invitation(
+                    client,
+                    row['company_name'],
+                    selected_coordinator,
+                    row['additional_info'],
+                    base_message,
+                    row['num_bullet_points'],
+                    model,
+                    provider_slot=provider_slot
+                )
+                record.update({
+                    'status': 'ok',
+                    'coordinator_email': selected_coordinator.get('email'),
+                    'content': content
+                })
+            except Exception as e:
+                record.update({'status': 'error', 'error': str(e)})
+
+        record['generated_at'] = datetime.now().isoformat()
+
+        with write_lock:
+            with open(output_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+
+        return record
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(process, key, row) for key, row in pending]
+
+        for future in as_completed(futures):
+            record = future.result()
+            done += 1
+            if record['status'] == 'ok':
+                summary['succeeded'] += 1
+            else:
+                summary['failed'] += 1
+
+            if progress_callback:
+                progress_callback(done, total, record)
+
+    return summary
@@ -0,0 +1,102 @@
+import os
+import time
+import threading
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Conservative defaults for a Gmail account: Google caps consumer accounts at
+# roughly 500 recipients per rolling day and throttles bursts well before that.
+DEFAULT_PER_MINUTE = 20
+DEFAULT_PER_DAY = 500
+
+class TokenBucket:
+    """Thread-safe token bucket: `capacity` burst, refilled at `rate` tokens per second"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens=1):
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def wait_time(self, tokens=1):
+        with self._lock:
+            self._refill()
+            missing = tokens - self._tokens
+            return max(0.0, missing / self.rate) if self.rate > 0 else float('inf')
+
+    def release(self, tokens=1):
+        """Give back tokens taken for work that did not happen"""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + tokens)
+
+    def acquire(self, tokens=1, timeout=None):
+        """Block until tokens are available; returns False if timeout elapses first"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.try_acquire(tokens):
+            wait = self.wait_time(tokens)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or wait > remaining:
+                    return False
+            time.sleep(min(wait, 1.0))
+        return True
+
+class SendRateLimiter:
+    """Per-minute and per-day buckets tuned to the mail provider's quotas"""
+
+    def __init__(self, per_minute=DEFAULT_PER_MINUTE, per_day=DEFAULT_PER_DAY):
+        self.minute_bucket = TokenBucket(per_minute / 60.0, per_minute)
+        self.day_bucket = TokenBucket(per_day / 86400.0, per_day)
+
+    def acquire(self, timeout=None):
+        """Wait for a per-minute slot, then take a daily token right before the send.
+
+        Returns False when the daily quota is exhausted or timeout elapses. Call
+        refund() when the send fails, so only delivered mail counts against the day.
+        """
+        if self.day_bucket.wait_time() > 0:
+            return False
+        if not self.minute_bucket.acquire(timeout=timeout):
+            return False
+        if not self.day_bucket.try_acquire():
+            # Another sender took the last daily token while we waited
+            self.minute_bucket.release()
+            return False
+        return True
+
+    def refund(self):
+        """Return the daily token of a send that failed"""
+        self.day_bucket.release()
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+def get_send_rate_limiter():
+    """Process-wide limiter shared by bulk sends and the outbox worker"""
+    global _rate_limiter
+
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = SendRateLimiter(
+                    per_minute=int(os.getenv("MAIL_SEND_PER_MINUTE", DEFAULT_PER_MINUTE)),
+                    per_day=int(os.getenv("MAIL_SEND_PER_DAY", DEFAULT_PER_DAY))
+                )
+
+    return _rate_limiter
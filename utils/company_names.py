@@ -0,0 +1,127 @@
+import re
+import threading
+
+# Legal-form words that never distinguish one company from another
+LEGAL_SUFFIXES = frozenset({
+    "ltd", "limited", "pvt", "private", "inc", "incorporated", "corp", "corporation",
+    "co", "company", "llc", "llp", "plc", "gmbh", "ag", "sa", "bv", "pte",
+})
+
+DEFAULT_SUGGESTIONS = 5
+DEFAULT_MIN_SCORE = 0.3
+# Fuzzy matches at or above this score are treated as the same company
+DEFAULT_MATCH_THRESHOLD = 0.75
+ACRONYM_SCORE = 0.9
+# A partially typed name that matches the leading words of a known one
+PREFIX_SCORE = 0.8
+MIN_PREFIX_LENGTH = 4
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+def company_tokens(name):
+    """Lowercase alphanumeric tokens with legal suffixes and a leading 'the' removed"""
+    text = (name or '').casefold().replace('&', ' and ')
+    tokens = _NON_ALNUM.sub(' ', text).split()
+
+    if len(tokens) > 1 and tokens[0] == 'the':
+        tokens = tokens[1:]
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    if len(tokens) == 1 and tokens[0] in LEGAL_SUFFIXES:
+        return []
+    return tokens
+
+def canonical_company_key(name):
+    """Key shared by spelling variants: 'TCS Ltd.' and 'tcs' -> 'tcs'"""
+    return ' '.join(company_tokens(name))
+
+def company_acronym(name):
+    """Initials of a multi-word name ('Tata Consultancy Services' -> 'tcs'), else None"""
+    tokens = [t for t in company_tokens(name) if t != 'and']
+    if len(tokens) < 2:
+        return None
+    return ''.join(t[0] for t in tokens)
+
+def trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class CompanyNameIndex:
+    """Canonical keys, acronyms and a trigram inverted index over known company names"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._display = {}
+        self._trigrams = {}
+        self._by_trigram = {}
+        self._by_acronym = {}
+
+    def __len__(self):
+        return len(self._display)
+
+    def add(self, name):
+        key = canonical_company_key(name)
+        if not key:
+            return None
+
+        with self._lock:
+            if key in self._display:
+                return key
+
+            self._display[key] = name.strip()
+            grams = trigrams(key)
+            self._trigrams[key] = grams
+            for gram in grams:
+                self._by_trigram.setdefault(gram, set()).add(key)
+
+            acronym = company_acronym(name)
+            if acronym:
+                self._by_acronym.setdefault(acronym, set()).add(key)
+        return key
+
+    def suggest(self, name, k=DEFAULT_SUGGESTIONS, min_score=DEFAULT_MIN_SCORE):
+        """Top-k known companies similar to name as (display_name, key, score), best first"""
+        key = canonical_company_key(name)
+        if not key:
+            return []
+
+        scores = {}
+        query_grams = trigrams(key)
+        query_acronym = company_acronym(name)
+
+        with self._lock:
+            if key in self._display:
+                scores[key] = 1.0
+
+            # 'tcs' typed for 'Tata Consultancy Services', or the other way round
+            for candidate in self._by_acronym.get(key.replace(' ', ''), ()):
+                scores[candidate] = max(scores.get(candidate, 0.0), ACRONYM_SCORE)
+            if query_acronym and query_acronym in self._display:
+                scores[query_acronym] = max(scores.get(query_acronym, 0.0), ACRONYM_SCORE)
+
+            shared = {}
+            for gram in query_grams:
+                for candidate in self._by_trigram.get(gram, ()):
+                    shared[candidate] = shared.get(candidate, 0) + 1
+
+            for candidate, count in shared.items():
+                similarity = count / (len(query_grams) + len(self._trigrams[candidate]) - count)
+                if len(key) >= MIN_PREFIX_LENGTH and candidate.startswith(key + ' '):
+                    similarity = max(similarity, PREFIX_SCORE)
+                if similarity > scores.get(candidate, 0.0):
+                    scores[candidate] = similarity
+
+            ranked = sorted(
+                ((self._display[c], c, score) for c, score in scores.items() if score >= min_score),
+                key=lambda item: (-item[2], item[1])
+            )
+        return ranked[:k]
+
+    def resolve(self, name, threshold=DEFAULT_MATCH_THRESHOLD):
+        """Key of the known company that name most likely refers to, or None if unknown or ambiguous"""
+        matches = self.suggest(name, k=2, min_score=threshold)
+        if not matches:
+            return None
+        if len(matches) > 1 and matches[1][2] == matches[0][2]:
+            return None
+        return matches[0][1]
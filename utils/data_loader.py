@@ -1,70 +1,59 @@
-import os
 import json
 import streamlit as st
-from supabase import create_client, Client
 from typing import Dict, List, Any
+from utils.template_engine import TemplateError
+from utils.invitation_templates import load_base_message_template
 
-def get_supabase_client() -> Client:
-    """Initialize and return Supabase client"""
-    url = os.getenv("SUPABASE_URL")
-    key = os.getenv("SUPABASE_KEY")
-    
-    if not url or not key:
-        raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set in environment variables")
-    
-    return create_client(url, key)
-
-@st.cache_data
-def load_coordinators_from_supabase() -> List[Dict[str, Any]]:
-    """Load coordinator data from Supabase with caching"""
+def load_coordinator_index():
+    """Return the precomputed CoordinatorIndex shared by all sessions, or None if loading fails"""
     try:
-        supabase = get_supabase_client()
-        response = supabase.table('coord_details').select('*').execute()
+        from db.coordinator_repository import get_coordinator_repository
+        index = get_coordinator_repository().index()
         
-        if response.data:
-            return response.data
+        if len(index):
+            return index
         else:
             st.error("❌ No coordinator data found in database")
-            return []
+            return None
             
     except Exception as e:
         st.error(f"❌ Error loading coordinators from Supabase: {str(e)}")
-        return []
+        return None
+
+def load_coordinators_from_supabase() -> List[Dict[str, Any]]:
+    """Load coordinator data through the shared repository, which refreshes after its TTL"""
+    index = load_coordinator_index()
+    return list(index.records) if index else []
 
-@st.cache_data
 def load_base_message_from_json() -> str:
-    """Load base message template from local JSON file with caching"""
+    """Load the base message template from data.json; re-parsed and validated only when the file changes"""
     try:
-        with open('data.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return data.get('base_message', '')
+        return load_base_message_template().source
     except FileNotFoundError:
         st.error("❌ data.json file not found! Please ensure the file exists in the same directory as app.py")
         st.stop()
     except json.JSONDecodeError:
         st.error("❌ Invalid JSON format in data.json file!")
         st.stop()
+    except TemplateError as e:
+        st.error(f"❌ Invalid base_message template in data.json: {e}")
+        st.stop()
 
-@st.cache_data
 def load_data() -> Dict[str, Any]:
-    """Load all application data with caching"""
-    coordinators = load_coordinators_from_supabase()
+    """Load all application data; coordinators come from the TTL-cached repository"""
+    coordinator_index = load_coordinator_index()
     base_message = load_base_message_from_json()
     
     return {
-        'coordinators': coordinators,
+        'coordinators': list(coordinator_index.records) if coordinator_index else [],
+        'coordinator_index': coordinator_index,
         'base_message': base_message
     }
 
-def get_unique_departments(coordinators: List[Dict[str, Any]]) -> List[str]:
-    """Get unique departments from coordinators list"""
-    departments = set()
-    for coord in coordinators:
-        dept = coord.get('department', '').strip()
-        if dept:
-            departments.add(dept)
-    return sorted(list(departments))
+def get_unique_departments(coordinator_index) -> List[str]:
+    """Get unique departments from the precomputed coordinator index"""
+    return list(coordinator_index.departments)
 
-def get_coordinators_by_department(coordinators: List[Dict[str, Any]], department: str) -> List[Dict[str, Any]]:
-    """Filter coordinators by department"""
-    return [coord for coord in coordinators if coord.get('department', '').strip() == department]
\ No newline at end of file
+def get_coordinators_by_department(coordinator_index, department: str) -> List[Dict[str, Any]]:
+    """Coordinators of a department, in table order"""
+    return list(coordinator_index.in_department(department))
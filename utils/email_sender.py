@@ -4,53 +4,106 @@ import os
 from dotenv import load_dotenv
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from utils.smtp_pool import get_smtp_pool
+from utils.tracing import span
+from utils.metrics import SMTP_SENDS
 
 load_dotenv()
 
+def build_message(sender_email, recipient_email, subject, body):
+    msg = MIMEMultipart()
+    msg['From'] = sender_email
+    msg['To'] = recipient_email
+    msg['Subject'] = subject
+
+    msg.attach(MIMEText(body, 'plain'))
+
+    return msg.as_string()
+
+def _sendmail_pooled(pool, sender_email, sender_password, recipient_email, text):
+    try:
+        with pool.connection(sender_email, sender_password) as server:
+            server.sendmail(sender_email, recipient_email, text)
+    except smtplib.SMTPServerDisconnected:
+        # A pooled session can die between the health check and the send; retry once on a fresh one
+        with pool.connection(sender_email, sender_password) as server:
+            server.sendmail(sender_email, recipient_email, text)
+
+def deliver_email(sender_email, sender_password, recipient_email, subject, body):
+    """Send one message over a pooled connection, raising smtplib errors to the caller"""
+    text = build_message(sender_email, recipient_email, subject, body)
+
+    with span("smtp.send"):
+        try:
+            _sendmail_pooled(get_smtp_pool(), sender_email, sender_password, recipient_email, text)
+        except Exception:
+            SMTP_SENDS.inc(result="failed")
+            raise
+
+    SMTP_SENDS.inc(result="sent")
+
 def send_email(sender_email, sender_password, recipient_email, subject, body):
     try:
-        msg = MIMEMultipart()
-        msg['From'] = sender_email
-        msg['To'] = recipient_email
-        msg['Subject'] = subject
-        
-        msg.attach(MIMEText(body, 'plain'))
-        
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()
-        server.login(sender_email, sender_password)
-        
-        text = msg.as_string()
-        server.sendmail(sender_email, recipient_email, text)
-        server.quit()
-        
+        deliver_email(sender_email, sender_password, recipient_email, subject, body)
         return True, "Email sent successfully! ✅"
     except Exception as e:
         return False, f"Failed to send email: {str(e)}"
 
+def get_env_credentials():
+    return os.getenv("EMAIL_ADDRESS"), os.getenv("EMAIL_PASSWORD")
+
+def validate_email_request(recipient_email, subject, body):
+    """Return an error message for a request that cannot be sent, or None"""
+    sender_email, sender_password = get_env_credentials()
+
+    if not sender_email or not sender_password:
+        return "Email credentials not configured. Please check EMAIL_ADDRESS and EMAIL_PASSWORD in .env file."
+
+    if not recipient_email:
+        return "Recipient email is required."
+
+    if not subject:
+        return "Email subject is required."
+
+    if not body:
+        return "Email body is required."
+
+    return None
+
 def send_email_with_env_credentials(recipient_email, subject, body):
     try:
-        sender_email = os.getenv("EMAIL_ADDRESS")
-        sender_password = os.getenv("EMAIL_PASSWORD")
-        
-        if not sender_email or not sender_password:
-            return False, "Email credentials not configured. Please check EMAIL_ADDRESS and EMAIL_PASSWORD in .env file."
-        
-        if not recipient_email:
-            return False, "Recipient email is required."
-        
-        if not subject:
-            return False, "Email subject is required."
-        
-        if not body:
-            return False, "Email body is required."
-        
+        error = validate_email_request(recipient_email, subject, body)
+        if error:
+            return False, error
+
+        sender_email, sender_password = get_env_credentials()
         return send_email(sender_email, sender_password, recipient_email, subject, body)
-        
+
     except Exception as e:
         return False, f"Failed to send email: {str(e)}"
 
+def queue_email_with_env_credentials(recipient_email, subject, body, log_context=None):
+    """Put a message in the durable outbox and return immediately.
+
+    Returns (success, message, outbox_id). The background worker sends it with
+    the EMAIL_ADDRESS account and logs it to mail_logs using log_context.
+    """
+    try:
+        error = validate_email_request(recipient_email, subject, body)
+        if error:
+            return False, error, None
+
+        from utils.mail_outbox import get_mail_outbox, ensure_outbox_worker
+
+        outbox_id = get_mail_outbox().enqueue(recipient_email, subject, body, log_context)
+        ensure_outbox_worker()
+
+        return True, "Email queued for delivery 📬", outbox_id
+
+    except Exception as e:
+        return False, f"Failed to queue email: {str(e)}", None
+
 def create_download_link(content, filename):
     b64 = base64.b64encode(content.encode()).decode()
     href = f'<a href="data:file/txt;base64,{b64}" download="{filename}">📥 Download {filename}</a>'
-    return href
\ No newline at end of file
+    return href
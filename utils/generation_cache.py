@@ -0,0 +1,149 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+from dotenv import load_dotenv
+from utils.metrics import GENERATION_CACHE_LOOKUPS
+
+load_dotenv()
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "generation_cache.sqlite3")
+DEFAULT_TTL_SECONDS = 72 * 3600
+DEFAULT_MAX_ENTRIES = 2000
+
+def normalize_prompt_text(text):
+    """Collapse whitespace so cosmetic prompt differences share a cache entry.
+
+    Case is kept: a mail cached for "ibm" must not be served for "IBM".
+    """
+    return re.sub(r'\s+', ' ', text or '').strip()
+
+def make_cache_key(messages, model, temperature):
+    """Content address for a completion request: hash of normalized messages, model and temperature"""
+    payload = {
+        'messages': [[m.get('role'), normalize_prompt_text(m.get('content'))] for m in messages],
+        'model': model,
+        'temperature': round(float(temperature), 3)
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+class GenerationCache:
+    """Persistent SQLite store of LLM completions with TTL expiry and LRU eviction"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl_seconds=DEFAULT_TTL_SECONDS, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS generation_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL,
+                    hit_count INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_generation_cache_last_accessed ON generation_cache (last_accessed)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key):
+        try:
+            return self._get(key)
+        except sqlite3.Error as e:
+            print(f"Error reading generation cache: {e}")
+            return None
+
+    def put(self, key, model, content):
+        try:
+            self._put(key, model, content)
+        except sqlite3.Error as e:
+            print(f"Error writing generation cache: {e}")
+
+    def _get(self, key):
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT content, created_at FROM generation_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+
+            if row and now - row[1] <= self.ttl_seconds:
+                conn.execute(
+                    "UPDATE generation_cache SET last_accessed = ?, hit_count = hit_count + 1 WHERE cache_key = ?",
+                    (now, key)
+                )
+                self._hits += 1
+                GENERATION_CACHE_LOOKUPS.inc(result="hit")
+                return row[0]
+
+            if row:
+                conn.execute("DELETE FROM generation_cache WHERE cache_key = ?", (key,))
+            self._misses += 1
+            GENERATION_CACHE_LOOKUPS.inc(result="miss")
+            return None
+
+    def _put(self, key, model, content):
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO generation_cache (cache_key, model, content, created_at, last_accessed, hit_count) "
+                "VALUES (?, ?, ?, ?, ?, 0)",
+                (key, model, content, now, now)
+            )
+            conn.execute("DELETE FROM generation_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+            conn.execute("""
+                DELETE FROM generation_cache WHERE cache_key IN (
+                    SELECT cache_key FROM generation_cache
+                    ORDER BY last_accessed DESC
+                    LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+
+    def clear(self):
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM generation_cache")
+
+    def stats(self):
+        with self._lock, self._connect() as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM generation_cache").fetchone()[0]
+        return {'entries': entries, 'hits': self._hits, 'misses': self._misses}
+
+_generation_cache = None
+_generation_cache_lock = threading.Lock()
+
+def get_generation_cache():
+    """Return the process-wide generation cache, configured from environment variables"""
+    global _generation_cache
+
+    if _generation_cache is None:
+        with _generation_cache_lock:
+            if _generation_cache is None:
+                _generation_cache = GenerationCache(
+                    path=os.getenv("GENERATION_CACHE_PATH", DEFAULT_CACHE_PATH),
+                    ttl_seconds=int(os.getenv("GENERATION_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+                    max_entries=int(os.getenv("GENERATION_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+                )
+
+    return _generation_cache
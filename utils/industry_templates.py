@@ -0,0 +1,186 @@
+import re
+import json
+import os
+import threading
+from utils.company_names import CompanyNameIndex
+from utils.prompt_generator import EMAIL_STRUCTURE
+from utils.template_engine import compile_template
+from utils.invitation_templates import BASE_MESSAGE_PATH, BASE_MESSAGE_PLACEHOLDERS, coordinator_values
+
+# data.json key mapping recurring recruiters to an industry below
+COMPANY_INDUSTRIES_FIELD = "company_industries"
+
+INVITE_OPENING = (
+    "We are excited to invite {company_name} to participate in our Campus Recruitment Drive "
+    "for the 2026 graduating batch."
+)
+
+# Pre-written variants per industry: matching keywords, invitation pitch, fit sentence and skill bullets
+INDUSTRY_PROFILES = {
+    'it_services': {
+        'label': "IT Services & Consulting",
+        'keywords': ("it services", "consulting", "consultancy", "outsourcing", "digital transformation",
+                     "systems integration", "managed services", "enterprise solutions"),
+        'pitch': "Your large-scale delivery of technology and transformation programmes for global clients "
+                 "is exactly the kind of work our graduates are eager to contribute to.",
+        'fit': "Our students combine strong fundamentals with hands-on project experience, making them ready "
+               "to join client-facing delivery teams at {company_name} from day one.",
+        'skills': ("✅ Full-Stack Development", "✅ Cloud & DevOps", "✅ Java & Enterprise Systems",
+                   "✅ Data Engineering & SQL", "✅ Software Testing & QA", "✅ Agile Project Delivery",
+                   "✅ Cybersecurity Fundamentals", "✅ API Development & Integration"),
+    },
+    'fintech': {
+        'label': "Banking, Finance & Fintech",
+        'keywords': ("bank", "banking", "fintech", "payments", "finance", "financial", "insurance",
+                     "trading", "investment", "lending", "wealth"),
+        'pitch': "Your work in building secure, high-volume financial platforms offers our graduates the kind "
+                 "of challenging problems they are trained to solve.",
+        'fit': "Our students pair rigorous quantitative skills with sound engineering practice, well suited "
+               "to the reliability and compliance demands at {company_name}.",
+        'skills': ("✅ Quantitative Analysis & Modelling", "✅ Secure Backend Development", "✅ Data Science & Analytics",
+                   "✅ Distributed Systems", "✅ Database Management & SQL", "✅ Risk & Fraud Analytics",
+                   "✅ Cybersecurity & Compliance", "✅ Cloud-Native Architecture"),
+    },
+    'ecommerce': {
+        'label': "E-commerce & Consumer Internet",
+        'keywords': ("e-commerce", "ecommerce", "marketplace", "retail", "consumer internet", "food delivery",
+                     "quick commerce", "online shopping", "consumer app"),
+        'pitch': "Your consumer platforms serve millions of users every day, and our graduates are keen to "
+                 "build products at that scale.",
+        'fit': "Our students bring product thinking and a strong grasp of scalable systems, a natural match "
+               "for the fast-moving teams at {company_name}.",
+        'skills': ("✅ Scalable Web Development", "✅ Mobile App Development", "✅ Recommendation Systems & ML",
+                   "✅ Data Analytics & Experimentation", "✅ Cloud & DevOps", "✅ UI/UX Design",
+                   "✅ Supply Chain Analytics", "✅ Microservices & APIs"),
+    },
+    'software_products': {
+        'label': "Software Products & SaaS",
+        'keywords': ("saas", "software product", "product company", "cloud platform", "developer tools",
+                     "crm", "b2b software", "operating system", "productivity software"),
+        'pitch': "Your products are used by businesses and developers worldwide, and our graduates are eager "
+                 "to help build the next generation of them.",
+        'fit': "Our students are strong in core computer science and product engineering, ready to ship "
+               "high-quality software with the teams at {company_name}.",
+        'skills': ("✅ Data Structures & Algorithms", "✅ System Design", "✅ Cloud-Native Development",
+                   "✅ Machine Learning & AI", "✅ Frontend Engineering", "✅ Distributed Systems",
+                   "✅ Developer Tooling & Automation", "✅ Database Internals & SQL"),
+    },
+    'core_engineering': {
+        'label': "Semiconductors, Embedded & Core Engineering",
+        'keywords': ("semiconductor", "semiconductors", "embedded", "vlsi", "chip", "hardware", "electronics",
+                     "automotive", "iot", "industrial automation", "firmware", "robotics"),
+        'pitch': "Your engineering of the hardware and embedded systems behind modern technology closely "
+                 "matches the strengths of our engineering graduates.",
+        'fit': "Our students combine solid circuits and systems knowledge with software skills, well prepared "
+               "for the engineering challenges at {company_name}.",
+        'skills': ("✅ Embedded Systems & Firmware", "✅ VLSI & Digital Design", "✅ Circuits & Signal Processing",
+                   "✅ IoT & Edge Computing", "✅ Control Systems & Robotics", "✅ C/C++ Systems Programming",
+                   "✅ Hardware Verification", "✅ Industrial Automation"),
+    },
+    'analytics': {
+        'label': "Data, AI & Analytics",
+        'keywords': ("analytics", "data science", "machine learning", "ai", "artificial intelligence",
+                     "business intelligence", "big data", "data analytics", "generative ai"),
+        'pitch': "Your focus on turning data into decisions aligns closely with the analytics and AI training "
+                 "our graduates receive.",
+        'fit': "Our students bring strong statistics, programming and machine learning skills, ready to "
+               "deliver data-driven insight at {company_name}.",
+        'skills': ("✅ Data Science & Analytics", "✅ Machine Learning & AI", "✅ Statistical Modelling",
+                   "✅ Python & SQL", "✅ Data Visualization & BI", "✅ Big Data Engineering",
+                   "✅ Natural Language Processing", "✅ MLOps & Model Deployment"),
+    },
+}
+
+# Bracketed descriptions in EMAIL_STRUCTURE and the template text that replaces them
+_BULLET_MARKER = (
+    "✅ [2-4 word skill relevant to the company's industry]\n"
+    "[... one line per bullet, no blank lines between bullets]"
+)
+_INVITE_MARKER = "[1-2 short sentences inviting the company specifically]"
+_FIT_MARKER = "[1 short sentence on why our students suit the company]"
+_PLACEHOLDER_SLOTS = (
+    ("[COMPANY]", "{company_name}"),
+    ("[COORDINATOR_EMAIL]", "{cc_email}"),
+    ("[COORDINATOR_NAME]", "{name}"),
+    ("[COORDINATOR_DEPARTMENT]", "{department}"),
+    ("[COORDINATOR_PHONE]", "{contact}"),
+)
+
+def _compile_industry_template(profile):
+    """The generation prompt's email structure with this industry's sentences filled in"""
+    source = EMAIL_STRUCTURE.replace('{', '{{').replace('}', '}}')
+    replacements = ((_BULLET_MARKER, "{bullets}"), (_INVITE_MARKER, f"{INVITE_OPENING} {profile['pitch']}"),
+                    (_FIT_MARKER, profile['fit'])) + _PLACEHOLDER_SLOTS
+    for marker, replacement in replacements:
+        if marker not in source:
+            raise ValueError(f"EMAIL_STRUCTURE no longer contains {marker!r}")
+        source = source.replace(marker, replacement)
+    return compile_template(source, BASE_MESSAGE_PLACEHOLDERS + ("bullets",))
+
+INDUSTRY_TEMPLATES = {industry: _compile_industry_template(profile) for industry, profile in INDUSTRY_PROFILES.items()}
+
+_KEYWORD_PATTERNS = {
+    industry: re.compile(r'\b(?:' + '|'.join(re.escape(k) for k in profile['keywords']) + r')\b')
+    for industry, profile in INDUSTRY_PROFILES.items()
+}
+
+def classify_by_keywords(text):
+    """Industry whose keywords appear most often in text; None when nothing or a tie matches"""
+    text = (text or '').casefold()
+    scores = {industry: len(set(pattern.findall(text))) for industry, pattern in _KEYWORD_PATTERNS.items()}
+    best = max(scores.values())
+    if not best:
+        return None
+    leaders = [industry for industry, score in scores.items() if score == best]
+    return leaders[0] if len(leaders) == 1 else None
+
+_company_map = {'mtime': None, 'index': None, 'industries': {}}
+_company_map_lock = threading.Lock()
+
+def _load_company_map(path):
+    """Company name index and canonical name -> industry map from data.json, reloaded when it changes"""
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None, {}
+
+    with _company_map_lock:
+        if _company_map['mtime'] != mtime:
+            index = CompanyNameIndex()
+            industries = {}
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    mapping = json.load(f).get(COMPANY_INDUSTRIES_FIELD, {})
+                for name, industry in mapping.items():
+                    if industry not in INDUSTRY_PROFILES:
+                        print(f"Unknown industry '{industry}' for {name} in {path}, ignored")
+                        continue
+                    industries[index.add(name)] = industry
+            except (OSError, ValueError) as e:
+                print(f"Error loading company industries: {e}")
+            _company_map.update(mtime=mtime, index=index, industries=industries)
+
+        return _company_map['index'], _company_map['industries']
+
+def classify_industry(company_name, additional_info=None, path=BASE_MESSAGE_PATH):
+    """Industry for a company: the stored company map first, then keywords in the details and name.
+
+    Returns (industry, matched_on) with matched_on 'company' or 'keywords', or (None, None).
+    """
+    index, industries = _load_company_map(path)
+    if index is not None and company_name:
+        key = index.resolve(company_name)
+        if key in industries:
+            return industries[key], 'company'
+
+    industry = classify_by_keywords(f"{additional_info or ''}\n{company_name or ''}")
+    return (industry, 'keywords') if industry else (None, None)
+
+def render_industry_invitation(industry, company_name, selected_coordinator, num_bullet_points):
+    skills = INDUSTRY_PROFILES[industry]['skills'][:num_bullet_points]
+    values = coordinator_values(company_name, selected_coordinator)
+    values['bullets'] = "\n".join(skills)
+    return INDUSTRY_TEMPLATES[industry].render(values)
+
+def get_industry_label(industry):
+    return INDUSTRY_PROFILES[industry]['label']
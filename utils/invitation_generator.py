@@ -0,0 +1,281 @@
+import time
+from contextlib import nullcontext
+from utils.prompt_generator import build_generation_messages, build_validation_messages
+from utils.post_processor import post_process_mail, fix_bullet_count
+from utils.generation_cache import get_generation_cache, make_cache_key
+from utils.mail_validator import validate_mail_structure, record_validation_outcome
+from utils.async_openrouter import get_resilient_client
+from utils.model_router import get_model_router
+from utils.prompt_budget import record_prompt_usage, record_completion_tokens
+from utils.metrics import INVITATIONS_GENERATED
+from utils.invitation_templates import render_fallback_invitation
+from utils.industry_templates import classify_industry, render_industry_invitation
+from utils.tracing import span
+
+# Cache key model for routed requests, whichever model ends up answering
+ROUTED_MODEL = "auto"
+
+EXTRA_HEADERS = {
+    "HTTP-Referer": "https://letsconnect.ju.ac.in",
+    "X-Title": "Lets Connect!"
+}
+
+FALLBACK_SKILLS = [
+    "✅ Data Science & Analytics",
+    "✅ Machine Learning & AI",
+    "✅ Web and App Development",
+    "✅ Cloud & DevOps",
+    "✅ Core Engineering & Software Development",
+    "✅ Mobile Application Development",
+    "✅ Database Management & SQL",
+    "✅ Cybersecurity & Network Management",
+    "✅ UI/UX Design & Frontend Development",
+    "✅ API Development & Integration"
+]
+
+def get_model_provider(model):
+    """Return the provider prefix of an OpenRouter model id (e.g. 'mistralai')"""
+    return model.split('/', 1)[0] if '/' in model else model
+
+def extract_completion_content(response, label="API"):
+    """Pull the message text out of a chat completion, raising on malformed responses"""
+    if not response:
+        raise Exception(f"{label} returned no response")
+    if not hasattr(response, 'choices') or not response.choices:
+        raise Exception(f"{label} response has no choices")
+    if not response.choices[0] or not hasattr(response.choices[0], 'message'):
+        raise Exception(f"{label} response choice has no message")
+    if not response.choices[0].message or not hasattr(response.choices[0].message, 'content'):
+        raise Exception(f"{label} response message has no content")
+
+    content = response.choices[0].message.content
+    if not content:
+        raise Exception(f"{label} returned empty content")
+
+    return content.strip()
+
+def iter_stream_text(stream, on_usage=None):
+    """Yield the text deltas of a streamed chat completion; on_usage gets the final usage chunk's counts"""
+    for chunk in stream:
+        usage = getattr(chunk, 'usage', None)
+        if usage and on_usage:
+            on_usage(usage)
+        if not getattr(chunk, 'choices', None):
+            continue
+        delta = getattr(chunk.choices[0], 'delta', None)
+        text = getattr(delta, 'content', None) if delta else None
+        if text:
+            yield text
+
+def _run_completion(client, request, label, on_token=None):
+    """One completion against one model, streamed when on_token is given"""
+    resilient_client = get_resilient_client(client)
+
+    if on_token:
+        parts = []
+        usage = []
+        try:
+            stream = client.chat.completions.create(
+                stream=True, stream_options={'include_usage': True}, timeout=resilient_client.deadline, **request
+            )
+            for text in iter_stream_text(stream, on_usage=usage.append):
+                parts.append(text)
+                on_token("".join(parts))
+        except Exception as e:
+            if parts:
+                raise
+            # Nothing shown yet: retry through the deadline/retry/hedging path instead of giving up
+            print(f"{label} stream failed before the first token, retrying without streaming: {e}")
+        else:
+            content = "".join(parts).strip()
+            if not content:
+                raise Exception(f"{label} returned empty content")
+            # Recorded only once a path succeeds, so a stream retried below is not counted twice
+            record_prompt_usage(label, request['messages'], usage[-1] if usage else None)
+            record_completion_tokens(request['messages'], content, usage[-1] if usage else None)
+            return content
+
+    response = resilient_client.complete(**request)
+    content = extract_completion_content(response, label)
+    record_prompt_usage(label, request['messages'], getattr(response, 'usage', None))
+    record_completion_tokens(request['messages'], content, getattr(response, 'usage', None))
+    if on_token:
+        on_token(content)
+    return content
+
+def create_completion(client, messages, model, temperature, max_tokens, label="API", force_regenerate=False, on_token=None,
+                      provider_slot=None):
+    """Run a chat completion, serving identical requests from the generation cache.
+
+    Returns (content, from_cache).
+
+    model=None lets the model router pick the fastest healthy model and fail over
+    to the next one. force_regenerate skips the cache lookup but still stores the
+    fresh result. When on_token is given the request is streamed and
+    on_token(text_so_far) is called as tokens arrive. Non-streamed calls, and
+    streams that fail before their first token, go through the resilient client
+    (deadline, retries on 429/5xx honouring Retry-After, hedging past the
+    observed p95). provider_slot(model), when given, returns a context manager
+    held around each model call, e.g. a per-provider semaphore.
+    """
+    cache = get_generation_cache()
+    cache_key = make_cache_key(messages, model or ROUTED_MODEL, temperature)
+
+    if not force_regenerate:
+        cached_content = cache.get(cache_key)
+        if cached_content:
+            if on_token:
+                on_token(cached_content)
+            return cached_content, True
+
+    def complete_with(chosen_model):
+        """(content, seconds the model took), timed after the provider slot is held"""
+        request = {
+            'model': chosen_model,
+            'extra_headers': EXTRA_HEADERS,
+            'messages': messages,
+            'temperature': temperature,
+            'max_tokens': max_tokens,
+        }
+        with provider_slot(chosen_model) if provider_slot else nullcontext():
+            callback_time = [0.0]
+            timed_on_token = None
+            if on_token:
+                def timed_on_token(text):
+                    callback_started = time.perf_counter()
+                    on_token(text)
+                    callback_time[0] += time.perf_counter() - callback_started
+
+            started = time.perf_counter()
+            content = _run_completion(client, request, label, timed_on_token)
+            return content, time.perf_counter() - started - callback_time[0]
+
+    if model:
+        content, _ = complete_with(model)
+    else:
+        content, model = get_model_router().run(complete_with)
+
+    cache.put(cache_key, model, content)
+    return content, False
+
+def generate_initial_draft(client, company_name, selected_coordinator, additional_info, base_message, num_bullet_points, model=None, force_regenerate=False, on_token=None, provider_slot=None):
+    """First LLM pass: write a personalized draft for the company; returns (draft, from_cache)"""
+    department = selected_coordinator.get('department', 'Department')
+
+    with span("llm.generate", company=company_name, streamed=bool(on_token)):
+        initial_content, from_cache = create_completion(
+            client,
+            build_generation_messages(company_name, additional_info, base_message, num_bullet_points, department),
+            model,
+            temperature=0.7,
+            max_tokens=800,
+            label="API",
+            force_regenerate=force_regenerate,
+            on_token=on_token,
+            provider_slot=provider_slot
+        )
+
+    return fix_bullet_count(initial_content, num_bullet_points, company_name), from_cache
+
+def validate_draft(client, initial_content, company_name, selected_coordinator, num_bullet_points, model=None, force_regenerate=False, provider_slot=None):
+    """Second LLM pass: fix structure, contact details and spacing of a draft; returns (content, from_cache)"""
+    department = selected_coordinator.get('department', 'Department')
+
+    with span("llm.validate", company=company_name):
+        validated_content, from_cache = create_completion(
+            client,
+            build_validation_messages(
+                initial_content,
+                selected_coordinator['name'],
+                selected_coordinator['phone'],
+                selected_coordinator['email'],
+                company_name,
+                department,
+                num_bullet_points
+            ),
+            model,
+            temperature=0.2,
+            max_tokens=800,
+            label="Validation API",
+            force_regenerate=force_regenerate,
+            provider_slot=provider_slot
+        )
+
+    return fix_bullet_count(validated_content, num_bullet_points, company_name), from_cache
+
+def finalize_invitation(content, company_name, selected_coordinator, num_bullet_points):
+    """Deterministic formatting pass applied to every generated mail"""
+    return post_process_mail(
+        content,
+        selected_coordinator['name'],
+        selected_coordinator['phone'],
+        selected_coordinator,
+        company_name,
+        num_bullet_points
+    )
+
+def review_draft(client, initial_content, company_name, selected_coordinator, num_bullet_points, model=None, force_regenerate=False, provider_slot=None,
+                 draft_from_cache=False):
+    """Finalize a draft, calling the LLM validation pass only if local structure checks fail.
+
+    Returns (final_content, used_llm_validation). The finished invitation is counted
+    here, once, as 'cache' when every pass was served from the generation cache.
+    """
+    finalized = finalize_invitation(initial_content, company_name, selected_coordinator, num_bullet_points)
+    is_valid, issues = validate_mail_structure(finalized, selected_coordinator, company_name, num_bullet_points)
+
+    if is_valid:
+        record_validation_outcome(used_llm=False)
+        INVITATIONS_GENERATED.inc(source="cache" if draft_from_cache else "llm")
+        return finalized, False
+
+    validated_content, validation_from_cache = validate_draft(
+        client, initial_content, company_name, selected_coordinator, num_bullet_points, model, force_regenerate,
+        provider_slot=provider_slot
+    )
+    record_validation_outcome(used_llm=True)
+    final_content = finalize_invitation(validated_content, company_name, selected_coordinator, num_bullet_points)
+    INVITATIONS_GENERATED.inc(source="cache" if draft_from_cache and validation_from_cache else "llm")
+    return final_content, True
+
+def generate_invitation(client, company_name, selected_coordinator, additional_info, base_message, num_bullet_points, model=None, force_regenerate=False, provider_slot=None):
+    """Run the full generate -> validate -> post-process pipeline for one company"""
+    if not client:
+        raise Exception("OpenRouter client not initialized")
+
+    initial_content, from_cache = generate_initial_draft(
+        client, company_name, selected_coordinator, additional_info, base_message, num_bullet_points, model, force_regenerate,
+        provider_slot=provider_slot
+    )
+    final_content, _ = review_draft(
+        client, initial_content, company_name, selected_coordinator, num_bullet_points, model, force_regenerate,
+        provider_slot=provider_slot, draft_from_cache=from_cache
+    )
+    return final_content
+
+def generate_template_invitation(company_name, selected_coordinator, additional_info, num_bullet_points):
+    """Render an invitation from the company's industry template without calling the LLM.
+
+    Returns (content, industry), or (None, None) when the industry is unknown or
+    the rendered mail fails the local structure checks, so the caller uses the LLM.
+    """
+    industry, matched_on = classify_industry(company_name, additional_info)
+    if not industry:
+        return None, None
+
+    with span("template.render", company=company_name, industry=industry, matched_on=matched_on):
+        # Already laid out like a finalized mail, so the post-processor is not needed
+        content = render_industry_invitation(industry, company_name, selected_coordinator, num_bullet_points)
+        is_valid, issues = validate_mail_structure(content, selected_coordinator, company_name, num_bullet_points)
+
+    if not is_valid:
+        print(f"Template invitation for {company_name} failed local checks ({'; '.join(issues)}), using the LLM")
+        return None, None
+
+    INVITATIONS_GENERATED.inc(source="template")
+    return content, industry
+
+def create_fallback_invitation(company_name, selected_coordinator, num_bullet_points):
+    """Static invitation used when the AI service is unavailable"""
+    INVITATIONS_GENERATED.inc(source="fallback")
+    return render_fallback_invitation(company_name, selected_coordinator, FALLBACK_SKILLS[:num_bullet_points])
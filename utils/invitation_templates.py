@@ -0,0 +1,50 @@
+from utils.template_engine import compile_template, load_template_file
+
+BASE_MESSAGE_PATH = "data.json"
+# Placeholders the base message in data.json (and its edited copies) may use
+BASE_MESSAGE_PLACEHOLDERS = ("company_name", "name", "contact", "cc_email", "department")
+
+FALLBACK_TEMPLATE = compile_template("""Dear Recruitment Team,
+
+Greetings from the Jadavpur University Placement Cell!
+
+We are excited to invite {company_name} to participate in our Campus Recruitment Drive for the 2026 graduating batch.
+
+Being a NAAC A-Grade Tier-1 institution and consistently ranked among the top engineering and research universities in India (NIRF 2024: 2nd State University, 12th in Engineering), our students bring strong expertise across:
+
+{bullets}
+
+We believe our students align perfectly with {company_name}'s talent requirements.
+
+For coordination, please feel free to reach out:  
+📧 Email: officer.placement@jadavpuruniversity.in, jupgcsit2026@gmail.com 
+📧 CC: {cc_email}
+
+We look forward to a fruitful collaboration with {company_name}!
+
+Best Regards,  
+{name}  
+Placement Coordinator, {department}  
+Jadavpur Placement Cell  
+📞 {contact}""", BASE_MESSAGE_PLACEHOLDERS + ("bullets",))
+
+def coordinator_values(company_name, selected_coordinator):
+    """Slot values shared by every invitation template"""
+    return {
+        'company_name': company_name,
+        'name': selected_coordinator['name'],
+        'contact': selected_coordinator['phone'],
+        'cc_email': selected_coordinator['email'],
+        'department': selected_coordinator.get('department', 'Department'),
+    }
+
+def load_base_message_template(path=BASE_MESSAGE_PATH):
+    """Compiled base message from data.json, validated and re-read only when the file changes"""
+    return load_template_file(path, 'base_message', BASE_MESSAGE_PLACEHOLDERS)
+
+def compile_base_message(base_message):
+    """Compile an (edited) base message, raising TemplateError for unknown placeholders"""
+    return compile_template(base_message, BASE_MESSAGE_PLACEHOLDERS)
+
+def render_fallback_invitation(company_name, selected_coordinator, bullets):
+    return FALLBACK_TEMPLATE.render(dict(coordinator_values(company_name, selected_coordinator), bullets="\n".join(bullets)))
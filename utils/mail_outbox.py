@@ -0,0 +1,278 @@
+import os
+import json
+import time
+import random
+import smtplib
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dotenv import load_dotenv
+from utils.email_sender import deliver_email, get_env_credentials
+from utils.metrics import OUTBOX_PENDING
+from utils.bulk_sender import get_send_rate_limiter
+
+load_dotenv()
+
+DEFAULT_OUTBOX_PATH = os.path.join(".cache", "mail_outbox.sqlite3")
+DEFAULT_MAX_ATTEMPTS = 5
+BASE_BACKOFF_SECONDS = 30
+MAX_BACKOFF_SECONDS = 30 * 60
+IDLE_POLL_SECONDS = 2
+QUOTA_RETRY_SECONDS = 15 * 60
+# A message left 'sending' this long belongs to a worker that died mid-send and may be claimed again
+SENDING_LEASE_SECONDS = 10 * 60
+# Candidates tried per claim when other workers win the race for them
+CLAIM_CANDIDATES = 5
+
+STATUS_QUEUED = "queued"
+STATUS_SENDING = "sending"
+STATUS_SENT = "sent"
+STATUS_FAILED = "failed"
+
+def compute_backoff(attempts):
+    """Exponential backoff with jitter for the given number of failed attempts"""
+    delay = min(MAX_BACKOFF_SECONDS, BASE_BACKOFF_SECONDS * (2 ** max(0, attempts - 1)))
+    return delay * random.uniform(0.8, 1.2)
+
+def is_permanent_failure(error):
+    """Address rejections will not succeed on retry; everything else (4xx, 5xx, network) gets backoff"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 550 for code, _ in error.recipients.values())
+    return isinstance(error, smtplib.SMTPAuthenticationError)
+
+class MailOutbox:
+    """SQLite-backed queue of outgoing mail that survives app restarts.
+
+    Claims are atomic in the database, so several processes (or MailOutbox
+    instances) can drain the same file without sending a message twice.
+    """
+
+    def __init__(self, path=DEFAULT_OUTBOX_PATH, sending_lease=SENDING_LEASE_SECONDS):
+        self.path = path
+        self.sending_lease = sending_lease
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    recipient_email TEXT NOT NULL,
+                    subject TEXT NOT NULL,
+                    body TEXT NOT NULL,
+                    log_context TEXT,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL,
+                    last_error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_outbox_status_next ON outbox (status, next_attempt_at)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def enqueue(self, recipient_email, subject, body, log_context=None):
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO outbox (recipient_email, subject, body, log_context, status, next_attempt_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (recipient_email, subject, body, json.dumps(log_context) if log_context else None,
+                 STATUS_QUEUED, now, now, now)
+            )
+            return cursor.lastrowid
+
+    def claim_next(self):
+        """Mark the oldest due message as sending and return it, or None.
+
+        Due means queued and past its next attempt, or stuck in 'sending' for
+        longer than the lease. The status change is conditional on the row
+        still being in the state it was read in, so only one claimer wins.
+        """
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            candidates = conn.execute(
+                "SELECT * FROM outbox WHERE (status = ? AND next_attempt_at <= ?) OR (status = ? AND updated_at < ?) "
+                "ORDER BY id LIMIT ?",
+                (STATUS_QUEUED, now, STATUS_SENDING, now - self.sending_lease, CLAIM_CANDIDATES)
+            ).fetchall()
+
+            row = None
+            for candidate in candidates:
+                claimed = conn.execute(
+                    "UPDATE outbox SET status = ?, updated_at = ? WHERE id = ? AND status = ? AND updated_at = ?",
+                    (STATUS_SENDING, now, candidate['id'], candidate['status'], candidate['updated_at'])
+                )
+                if claimed.rowcount == 1:
+                    row = candidate
+                    break
+
+            if row is None:
+                return None
+
+        message = dict(row)
+        message['log_context'] = json.loads(message['log_context']) if message['log_context'] else None
+        return message
+
+    def defer(self, message_id, delay_seconds):
+        """Put a claimed message back in the queue without counting an attempt"""
+        self._update(message_id, status=STATUS_QUEUED, next_attempt_at=time.time() + delay_seconds)
+
+    def mark_sent(self, message_id):
+        self._update(message_id, status=STATUS_SENT, last_error=None)
+
+    def mark_failed(self, message_id, attempts, error, retry=True):
+        if retry and attempts < DEFAULT_MAX_ATTEMPTS:
+            self._update(
+                message_id,
+                status=STATUS_QUEUED,
+                attempts=attempts,
+                last_error=error,
+                next_attempt_at=time.time() + compute_backoff(attempts)
+            )
+        else:
+            self._update(message_id, status=STATUS_FAILED, attempts=attempts, last_error=error)
+
+    def _update(self, message_id, **fields):
+        fields['updated_at'] = time.time()
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                f"UPDATE outbox SET {assignments} WHERE id = ?",
+                (*fields.values(), message_id)
+            )
+
+    def get_status(self, message_ids):
+        """Return {id: {status, attempts, last_error, recipient_email}} for the given ids"""
+        if not message_ids:
+            return {}
+
+        placeholders = ", ".join("?" for _ in message_ids)
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT id, recipient_email, status, attempts, last_error, next_attempt_at FROM outbox WHERE id IN ({placeholders})",
+                tuple(message_ids)
+            ).fetchall()
+        return {row['id']: dict(row) for row in rows}
+
+    def pending_count(self):
+        with self._lock, self._connect() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM outbox WHERE status IN (?, ?)", (STATUS_QUEUED, STATUS_SENDING)
+            ).fetchone()[0]
+
+class OutboxWorker(threading.Thread):
+    """Background thread that drains the outbox within the shared sending quota"""
+
+    def __init__(self, outbox, rate_limiter=None):
+        super().__init__(name="mail-outbox-worker", daemon=True)
+        self.outbox = outbox
+        self.rate_limiter = rate_limiter or get_send_rate_limiter()
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                message = self.outbox.claim_next()
+            except Exception as e:
+                print(f"Error reading mail outbox: {e}")
+                message = None
+
+            if not message:
+                self._stop_event.wait(IDLE_POLL_SECONDS)
+                continue
+
+            if not self.rate_limiter.acquire():
+                self.outbox.defer(message['id'], QUOTA_RETRY_SECONDS)
+                continue
+
+            self._send(message)
+
+    def _send(self, message):
+        attempts = message['attempts'] + 1
+        sender_email, sender_password = get_env_credentials()
+
+        try:
+            deliver_email(
+                sender_email,
+                sender_password,
+                message['recipient_email'],
+                message['subject'],
+                message['body']
+            )
+        except Exception as e:
+            # Only delivered mail counts against the daily quota, however often a message is retried
+            self.rate_limiter.refund()
+            self.outbox.mark_failed(message['id'], attempts, str(e), retry=not is_permanent_failure(e))
+            return
+
+        self.outbox.mark_sent(message['id'])
+        self._log(message)
+
+    @staticmethod
+    def _log(message):
+        context = message.get('log_context')
+        if not context:
+            return
+
+        from db.database import log_mail_activity
+
+        try:
+            log_success, log_message = log_mail_activity(
+                coordinator_name=context.get('coordinator_name', 'Unknown'),
+                company_name=context.get('company_name'),
+                hr_email=message['recipient_email'],
+                coordinator_email=context.get('coordinator_email'),
+                email_subject=message['subject'],
+                email_body=message['body']
+            )
+            if not log_success:
+                print(f"Warning: Email sent but logging failed: {log_message}")
+        except Exception as e:
+            print(f"Warning: Email sent but logging failed: {e}")
+
+_mail_outbox = None
+_outbox_worker = None
+_outbox_lock = threading.Lock()
+
+def get_mail_outbox():
+    """Return the process-wide outbox"""
+    global _mail_outbox
+
+    if _mail_outbox is None:
+        with _outbox_lock:
+            if _mail_outbox is None:
+                _mail_outbox = MailOutbox(os.getenv("MAIL_OUTBOX_PATH", DEFAULT_OUTBOX_PATH))
+
+    return _mail_outbox
+
+def ensure_outbox_worker():
+    """Start the background sender if it is not already running in this process"""
+    global _outbox_worker
+
+    outbox = get_mail_outbox()
+
+    with _outbox_lock:
+        if _outbox_worker is None or not _outbox_worker.is_alive():
+            _outbox_worker = OutboxWorker(outbox)
+            _outbox_worker.start()
+
+    return _outbox_worker
+
+OUTBOX_PENDING.set_function(lambda: get_mail_outbox().pending_count())
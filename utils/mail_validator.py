@@ -0,0 +1,111 @@
+import re
+import threading
+
+GREETING_LINE = "Dear Recruitment Team,"
+WELCOME_LINE = "Greetings from the Jadavpur University Placement Cell!"
+PRIMARY_EMAILS = ["officer.placement@jadavpuruniversity.in", "jupgcsit2026@gmail.com"]
+
+MIN_WORDS = 120
+MAX_WORDS = 350
+
+PLACEHOLDER_PATTERN = re.compile(r'\[[A-Z_ ]+\]|\[Skill \d+[^\]]*\]|\[Write [^\]]*\]')
+
+def _non_empty_lines(mail):
+    return [line.strip() for line in mail.split('\n') if line.strip()]
+
+def _check_signature(lines, selected_coordinator, department):
+    expected = [
+        "Best Regards,",
+        selected_coordinator['name'],
+        f"Placement Coordinator, {department}",
+        "Jadavpur Placement Cell",
+        f"📞 {selected_coordinator['phone']}"
+    ]
+    return lines[-len(expected):] == expected
+
+def _check_bullet_spacing(raw_lines):
+    """Bullets must form one contiguous block separated from other sections by blank lines"""
+    bullet_indices = [i for i, line in enumerate(raw_lines) if line.strip().startswith('✅')]
+    if not bullet_indices:
+        return False
+
+    first, last = bullet_indices[0], bullet_indices[-1]
+    if last - first + 1 != len(bullet_indices):
+        return False
+    if first == 0 or raw_lines[first - 1].strip():
+        return False
+    if last == len(raw_lines) - 1 or raw_lines[last + 1].strip():
+        return False
+    return True
+
+def validate_mail_structure(mail, selected_coordinator, company_name, num_bullet_points):
+    """Check a post-processed mail against the structure the validation prompt asks for.
+
+    Returns (is_valid, issues) where issues is a list of human readable problems.
+    """
+    issues = []
+
+    if not mail or not mail.strip():
+        return False, ["Mail is empty"]
+
+    department = selected_coordinator.get('department', 'Department')
+    raw_lines = mail.strip().split('\n')
+    lines = _non_empty_lines(mail)
+
+    if lines[0] != GREETING_LINE:
+        issues.append("Mail does not start with the recruitment team greeting")
+    if WELCOME_LINE not in lines[:3]:
+        issues.append("Placement cell greeting line is missing")
+
+    for email in PRIMARY_EMAILS:
+        if email not in mail:
+            issues.append(f"Primary contact {email} is missing")
+
+    cc_lines = [line for line in lines if line.startswith("📧 CC:")]
+    if len(cc_lines) != 1 or selected_coordinator['email'] not in cc_lines[0]:
+        issues.append("CC line with the coordinator email is missing")
+
+    if not _check_signature(lines, selected_coordinator, department):
+        issues.append("Signature block does not match the coordinator details")
+
+    if f"Placement Coordinator, {department}" not in mail:
+        issues.append(f"Department '{department}' is missing from the signature")
+
+    bullet_count = sum(1 for line in lines if line.startswith('✅'))
+    if bullet_count != num_bullet_points:
+        issues.append(f"Expected {num_bullet_points} skill bullets, found {bullet_count}")
+    elif not _check_bullet_spacing(raw_lines):
+        issues.append("Skill bullets are not a single block separated by blank lines")
+
+    if company_name and company_name.lower() not in mail.lower():
+        issues.append(f"Company name '{company_name}' is not mentioned")
+
+    if PLACEHOLDER_PATTERN.search(mail):
+        issues.append("Unfilled template placeholders remain")
+
+    if '\n\n\n' in mail:
+        issues.append("Sections are separated by more than one blank line")
+
+    word_count = len(mail.split())
+    if not MIN_WORDS <= word_count <= MAX_WORDS:
+        issues.append(f"Word count {word_count} is outside {MIN_WORDS}-{MAX_WORDS}")
+
+    return not issues, issues
+
+_validation_stats = {'local_passed': 0, 'llm_validated': 0}
+_validation_stats_lock = threading.Lock()
+
+def record_validation_outcome(used_llm):
+    with _validation_stats_lock:
+        if used_llm:
+            _validation_stats['llm_validated'] += 1
+        else:
+            _validation_stats['local_passed'] += 1
+
+def get_validation_stats():
+    """Counts of drafts that passed local checks vs. needed the LLM validation call"""
+    with _validation_stats_lock:
+        stats = dict(_validation_stats)
+    total = stats['local_passed'] + stats['llm_validated']
+    stats['avoided_ratio'] = stats['local_passed'] / total if total else 0.0
+    return stats
@@ -0,0 +1,255 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_METRICS_HOST = "127.0.0.1"
+
+# Upper bounds in seconds; wide enough for 1 ms post-processing and 60 s LLM deadlines alike
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def escape_label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(label_names, label_values, extra=()):
+    pairs = list(zip(label_names, label_values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label_value(value)}"' for name, value in pairs) + "}"
+
+class _Metric:
+    type = None
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def total(self):
+        """Sum over every label combination"""
+        with self._lock:
+            return sum(self._values.values())
+
+    def _samples(self):
+        with self._lock:
+            return sorted(self._values.items())
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        for label_values, value in self._samples():
+            lines.append(f"{self.name}{_format_labels(self.label_names, label_values)} {value}")
+        return lines
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+class Gauge(_Metric):
+    """A value that goes up and down; set_function() makes it computed at scrape time"""
+
+    type = "gauge"
+
+    def __init__(self, name, help, labels=()):
+        super().__init__(name, help, labels)
+        self._function = None
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set_function(self, function):
+        self._function = function
+
+    def _samples(self):
+        if self._function is None:
+            return super()._samples()
+        try:
+            return [((), self._function())]
+        except Exception as e:
+            print(f"Error computing gauge {self.name}: {e}")
+            return []
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['buckets'][i] += 1
+                    break
+            series['sum'] += value
+            series['count'] += 1
+
+    def value(self, **labels):
+        """Number of observations for the label combination"""
+        with self._lock:
+            series = self._values.get(self._key(labels))
+            return series['count'] if series else 0
+
+    def total(self):
+        with self._lock:
+            return sum(series['count'] for series in self._values.values())
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        with self._lock:
+            samples = sorted((key, dict(series, buckets=list(series['buckets']))) for key, series in self._values.items())
+
+        for label_values, series in samples:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series['buckets']):
+                cumulative += count
+                labels = _format_labels(self.label_names, label_values, [('le', bound)])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.label_names, label_values, [('le', '+Inf')])} {series['count']}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, label_values)} {series['sum']}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, label_values)} {series['count']}")
+        return lines
+
+class MetricsRegistry:
+    """Process-wide set of named metrics, rendered in Prometheus text format"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, metric_type, name, help, labels, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_type(name, help, labels, **kwargs)
+            elif not isinstance(metric, metric_type):
+                raise ValueError(f"Metric {name} is already registered as a {metric.type}")
+            return metric
+
+    def counter(self, name, help, labels=()):
+        return self._get_or_create(Counter, name, help, labels)
+
+    def gauge(self, name, help, labels=()):
+        return self._get_or_create(Gauge, name, help, labels)
+
+    def histogram(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        return self._get_or_create(Histogram, name, help, labels, buckets=buckets)
+
+    def render(self):
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        text = "\n".join(lines) + "\n"
+
+        # Per-stage span histograms, when the tracer aggregates them
+        from utils.tracing import get_tracer, PrometheusSink
+
+        stage_histograms = get_tracer().find_sink(PrometheusSink)
+        if stage_histograms:
+            text += stage_histograms.render()
+        return text
+
+_registry = MetricsRegistry()
+
+def get_metrics_registry():
+    return _registry
+
+INVITATIONS_GENERATED = _registry.counter(
+    "letsconnect_invitations_generated_total", "Finished invitations by source (llm, cache, template, fallback)", ("source",)
+)
+GENERATION_CACHE_LOOKUPS = _registry.counter(
+    "letsconnect_generation_cache_lookups_total", "Generation cache lookups", ("result",)
+)
+LLM_TOKENS = _registry.counter(
+    "letsconnect_llm_tokens_total", "LLM tokens used (API-reported, else estimated)", ("kind",)
+)
+SMTP_SENDS = _registry.counter(
+    "letsconnect_smtp_sends_total", "SMTP deliveries attempted", ("result",)
+)
+OTP_SENDS = _registry.counter(
+    "letsconnect_otp_sends_total", "Login OTPs requested", ("result",)
+)
+OTP_VERIFICATIONS = _registry.counter(
+    "letsconnect_otp_verifications_total", "Login OTP verification attempts", ("result",)
+)
+DB_REQUEST_SECONDS = _registry.histogram(
+    "letsconnect_db_request_seconds", "Database round trip latency", ("backend", "table")
+)
+OUTBOX_PENDING = _registry.gauge(
+    "letsconnect_outbox_pending", "Emails queued or being sent by the outbox worker"
+)
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+
+        body = _registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+_metrics_server = None
+_metrics_server_lock = threading.Lock()
+
+def ensure_metrics_server():
+    """Serve /metrics on METRICS_HOST:METRICS_PORT once per process; does nothing without METRICS_PORT"""
+    global _metrics_server
+
+    port = os.getenv("METRICS_PORT")
+    if not port:
+        return None
+
+    with _metrics_server_lock:
+        if _metrics_server is None:
+            try:
+                server = ThreadingHTTPServer((os.getenv("METRICS_HOST", DEFAULT_METRICS_HOST), int(port)), MetricsHandler)
+            except (OSError, ValueError) as e:
+                print(f"Error starting metrics endpoint on port {port}: {e}")
+                # Don't retry (and re-log) on every Streamlit rerun
+                _metrics_server = False
+                return None
+
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name="metrics-endpoint", daemon=True).start()
+            print(f"Metrics endpoint listening on http://{server.server_address[0]}:{server.server_address[1]}/metrics")
+            _metrics_server = server
+
+    return _metrics_server or None
@@ -0,0 +1,133 @@
+import os
+import time
+import threading
+from collections import deque
+
+DEFAULT_MODELS = [
+    "mistralai/mistral-small-3.2-24b-instruct:free",
+]
+
+STATS_WINDOW = 50
+# Latency ordering only kicks in once a model has this many successful calls
+MIN_LATENCY_SAMPLES = 3
+# A model is taken out of rotation after this many failures in a row ...
+MAX_CONSECUTIVE_FAILURES = 3
+# ... or when this share of its recent calls failed
+MAX_ERROR_RATE = 0.5
+COOLDOWN_SECONDS = 60
+
+def _median(samples):
+    ordered = sorted(samples)
+    return ordered[len(ordered) // 2] if ordered else None
+
+class ModelRouter:
+    """Routes completions to the fastest healthy model from a ranked list, failing over in order.
+
+    Measured models are tried by rolling median latency; models without enough
+    samples follow in configured rank. A model that keeps failing cools down
+    for COOLDOWN_SECONDS and is only used as a last resort meanwhile.
+    """
+
+    def __init__(self, models=None):
+        self.models = list(models or DEFAULT_MODELS)
+        self._lock = threading.Lock()
+        self._latencies = {m: deque(maxlen=STATS_WINDOW) for m in self.models}
+        self._outcomes = {m: deque(maxlen=STATS_WINDOW) for m in self.models}
+        self._consecutive_failures = {m: 0 for m in self.models}
+        self._cooldown_until = {m: 0.0 for m in self.models}
+
+    def record(self, model, latency, ok):
+        with self._lock:
+            if model not in self._outcomes:
+                return
+            self._outcomes[model].append(ok)
+            if ok:
+                self._latencies[model].append(latency)
+                self._consecutive_failures[model] = 0
+                return
+
+            self._consecutive_failures[model] += 1
+            outcomes = self._outcomes[model]
+            error_rate = outcomes.count(False) / len(outcomes)
+            if (self._consecutive_failures[model] >= MAX_CONSECUTIVE_FAILURES
+                    or (len(outcomes) >= MIN_LATENCY_SAMPLES and error_rate >= MAX_ERROR_RATE)):
+                self._cooldown_until[model] = time.monotonic() + COOLDOWN_SECONDS
+
+    def _is_healthy(self, model, now):
+        return now >= self._cooldown_until[model]
+
+    def candidates(self):
+        """Models in the order they should be tried"""
+        now = time.monotonic()
+        with self._lock:
+            def sort_key(item):
+                rank, model = item
+                latencies = self._latencies[model]
+                measured = len(latencies) >= MIN_LATENCY_SAMPLES
+                return (
+                    not self._is_healthy(model, now),
+                    not measured,
+                    _median(latencies) if measured else 0.0,
+                    rank
+                )
+
+            return [model for _, model in sorted(enumerate(self.models), key=sort_key)]
+
+    def current_model(self):
+        return self.candidates()[0]
+
+    def run(self, call):
+        """Call call(model) on each candidate until one succeeds; returns (result, model).
+
+        call returns (result, latency) where latency covers only the model's own
+        work, so time spent queueing for a concurrency slot or in the caller's
+        callbacks does not make a model look slow.
+        """
+        last_error = None
+        for model in self.candidates():
+            started = time.monotonic()
+            try:
+                result, latency = call(model)
+            except Exception as e:
+                # Failures only feed the error rate; their duration is not a latency sample
+                self.record(model, time.monotonic() - started, ok=False)
+                print(f"Model {model} failed ({e}), trying next model")
+                last_error = e
+                continue
+
+            self.record(model, latency, ok=True)
+            return result, model
+
+        raise last_error or Exception("No models configured")
+
+    def stats(self):
+        """Per-model median latency, error rate and health, in routing order"""
+        now = time.monotonic()
+        order = self.candidates()
+        with self._lock:
+            stats = []
+            for model in order:
+                outcomes = self._outcomes[model]
+                stats.append({
+                    'model': model,
+                    'median_latency': _median(self._latencies[model]),
+                    'error_rate': outcomes.count(False) / len(outcomes) if outcomes else None,
+                    'calls': len(outcomes),
+                    'healthy': self._is_healthy(model, now),
+                })
+        return stats
+
+_router = None
+_router_lock = threading.Lock()
+
+def get_model_router():
+    """Process-wide router over OPENROUTER_MODELS (comma-separated, best first)"""
+    global _router
+
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                configured = [m.strip() for m in os.getenv("OPENROUTER_MODELS", "").split(",") if m.strip()]
+                _router = ModelRouter(configured or DEFAULT_MODELS)
+
+    return _router
@@ -16,7 +16,8 @@ def init_openrouter_client():
             st.error("❌ OPENROUTER_API_KEY not found in .env file!")
             return None
         return OpenAI(
-            base_url="https://openrouter.ai/api/v1",
+            # Override to point the app at benchmarks/mock_llm_server.py or another compatible server
+            base_url=os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1"),
             api_key=api_key
         )
     except Exception as e:
@@ -3,6 +3,8 @@ import string
 from datetime import datetime, timedelta
 from .email_sender import send_email
 from db.database import get_supabase_client
+from db.auth_store import upsert_otp
+from utils.metrics import OTP_SENDS
 import os
 from dotenv import load_dotenv
 import pytz
@@ -41,31 +43,10 @@ Let's Connect Team"""
 
 def store_otp_in_database(email, otp, dt, expiry_minutes=5):
     try:
-        supabase = get_supabase_client()
-        
         now_ist = get_ist_time()
         otp_expiry_ist = now_ist + timedelta(minutes=expiry_minutes)
         
-        # Check if entry with same email and dt exists
-        response = supabase.table("user_logs").select("*").eq("email", email).eq("dt", dt).execute()
-        
-        if response.data:
-            # Update existing entry
-            supabase.table("user_logs").update({
-                "otp": otp,
-                "otp_expiry": otp_expiry_ist.isoformat(),
-                "last_login": now_ist.isoformat()
-            }).eq("email", email).eq("dt", dt).execute()
-        else:
-            # Insert new entry
-            supabase.table("user_logs").insert({
-                "email": email,
-                "dt": dt,
-                "password_hash": "otp_login",
-                "last_login": now_ist.isoformat(),
-                "otp": otp,
-                "otp_expiry": otp_expiry_ist.isoformat()
-            }).execute()
+        upsert_otp(email, otp, dt, otp_expiry_ist.isoformat(), now_ist.isoformat())
         
         return True, "OTP stored successfully", dt
         
@@ -100,15 +81,19 @@ def generate_and_send_otp(email, recipient_name=None, expiry_minutes=5):
         
         db_success, db_message, stored_dt = store_otp_in_database(email, otp, dt, expiry_minutes)
         if not db_success:
+            OTP_SENDS.inc(result="store_failed")
             return False, db_message, None, None
         
         email_success, email_message = send_otp_email(email, otp, recipient_name)
         if not email_success:
+            OTP_SENDS.inc(result="send_failed")
             return False, email_message, None, None
         
+        OTP_SENDS.inc(result="sent")
         return True, "OTP generated and sent successfully", otp, stored_dt
         
     except Exception as e:
+        OTP_SENDS.inc(result="error")
         return False, f"OTP generation/sending error: {e}", None, None
 
 def resend_otp(email, recipient_name=None):
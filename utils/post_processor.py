@@ -1,111 +1,164 @@
 import re
+from utils.tracing import traced
 
-def fix_bullet_count(content, num_bullet_points, company_name):
-    lines = content.split('\n')
-    bullet_lines = [line for line in lines if line.strip().startswith('✅')]
-    
-    default_skills = [
-        "✅ Data Science & Analytics",
-        "✅ Machine Learning & AI", 
-        "✅ Web and App Development",
-        "✅ Cloud & DevOps",
-        "✅ Core Engineering & Software Development",
-        "✅ Mobile Application Development",
-        "✅ Database Management & SQL",
-        "✅ Cybersecurity & Network Management",
-        "✅ UI/UX Design & Frontend Development",
-        "✅ API Development & Integration"
-    ]
-    
-    if len(bullet_lines) == num_bullet_points:
-        return content
-    
-    if len(bullet_lines) < num_bullet_points:
-        needed = num_bullet_points - len(bullet_lines)
-        additional_skills = default_skills[len(bullet_lines):len(bullet_lines) + needed]
-        bullet_lines.extend(additional_skills)
-    elif len(bullet_lines) > num_bullet_points:
-        bullet_lines = bullet_lines[:num_bullet_points]
-    
-    new_lines = []
-    in_bullet_section = False
-    bullet_added = False
-    
-    for line in lines:
-        if line.strip().startswith('✅'):
-            if not bullet_added:
-                new_lines.extend(bullet_lines)
-                bullet_added = True
-            continue
+BULLET = '✅'
+MAIL_START = "Dear Recruitment Team"
+
+DEFAULT_SKILLS = (
+    "✅ Data Science & Analytics",
+    "✅ Machine Learning & AI",
+    "✅ Web and App Development",
+    "✅ Cloud & DevOps",
+    "✅ Core Engineering & Software Development",
+    "✅ Mobile Application Development",
+    "✅ Database Management & SQL",
+    "✅ Cybersecurity & Network Management",
+    "✅ UI/UX Design & Frontend Development",
+    "✅ API Development & Integration"
+)
+
+# Model chatter around the email; lines containing any of these (case-insensitively) are dropped
+JUNK_PHRASES = (
+    "here is the corrected", "here's the corrected", "here is the email",
+    "here's the email", "follows all specifications", "that follows all"
+)
+
+# A blank line follows any line starting or ending with one of these
+SECTION_BREAK_PREFIXES = (
+    "Dear Recruitment Team,",
+    "Greetings from the Jadavpur University Placement Cell!",
+    "📧 CC:"
+)
+SECTION_BREAK_SUFFIXES = ("across:", "requirements.", "team.", "needs.")
+
+PLACEHOLDER_PREFIX = "[COORDINATOR_"
+
+_JUNK_PATTERN = re.compile("|".join(re.escape(phrase) for phrase in JUNK_PHRASES))
+_PLACEHOLDER_PATTERN = re.compile(r'\[COORDINATOR_(EMAIL|NAME|PHONE|DEPARTMENT)\]')
+
+class MailPostProcessor:
+    """Deterministic cleanup of a generated mail, built once and reused for every draft.
+
+    One pass over the lines drops model chatter and everything before the
+    greeting while collecting the bullets; a second emits the mail with the
+    bullet count fixed, coordinator placeholders filled in and a blank line
+    after each section.
+    """
+
+    def __init__(self, default_skills=DEFAULT_SKILLS):
+        self.default_skills = tuple(default_skills)
+
+    @staticmethod
+    def _strip_separators(generated_mail):
+        # Keep what sits between (or after) "---" markers the model sometimes adds
+        if "---" in generated_mail:
+            return generated_mail.split("---", 2)[1].strip()
+        return generated_mail
+
+    @staticmethod
+    def _clean_lines(text):
+        """Stripped, non-empty lines from the greeting on, without chatter, plus the bullet lines"""
+        lines = []
+        bullets = []
+        started = False
+
+        for line in text.split('\n'):
+            line = line.strip()
+            if not line or _JUNK_PATTERN.search(line.lower()):
+                continue
+            if not started:
+                if not line.startswith(MAIL_START):
+                    continue
+                started = True
+            lines.append(line)
+            if line.startswith(BULLET):
+                bullets.append(line)
+
+        return lines, bullets
+
+    def fix_bullets(self, lines, num_bullet_points, bullets=None):
+        """Pad with default skills or trim so the bullet block has exactly num_bullet_points lines"""
+        if bullets is None:
+            bullets = [line for line in lines if line.strip().startswith(BULLET)]
+
+        if len(bullets) == num_bullet_points:
+            return lines
+
+        if len(bullets) < num_bullet_points:
+            bullets = bullets + list(self.default_skills[len(bullets):num_bullet_points])
         else:
-            new_lines.append(line)
-    
-    return '\n'.join(new_lines)
+            bullets = bullets[:num_bullet_points]
+
+        fixed = []
+        bullets_added = False
+        for line in lines:
+            if line.strip().startswith(BULLET):
+                if not bullets_added:
+                    fixed.extend(bullets)
+                    bullets_added = True
+                continue
+            fixed.append(line)
+
+        return fixed
+
+    @staticmethod
+    def _ends_section(line, next_line):
+        if line.startswith(SECTION_BREAK_PREFIXES) or line.endswith(SECTION_BREAK_SUFFIXES):
+            return True
+        # Close the bullet block after its last bullet
+        if line.startswith(BULLET) and next_line is not None and not next_line.strip().startswith(BULLET):
+            return True
+        return "collaboration with" in line.lower() or "We look forward to" in line
+
+    def process(self, generated_mail, coordinator_name, coordinator_phone, selected_coordinator, company_name=None, num_bullet_points=6):
+        values = {
+            'EMAIL': selected_coordinator['email'],
+            'NAME': coordinator_name,
+            'PHONE': coordinator_phone,
+            'DEPARTMENT': selected_coordinator.get('department', 'Department'),
+        }
+
+        def fill(line):
+            if PLACEHOLDER_PREFIX not in line:
+                return line
+            return _PLACEHOLDER_PATTERN.sub(lambda match: values[match.group(1)], line)
+
+        text = self._strip_separators(generated_mail)
+        lines, bullets = self._clean_lines(text)
+        if not lines:
+            # No recognizable greeting: format the text as it came
+            lines, bullets = text.split('\n'), None
+
+        if company_name:
+            lines = self.fix_bullets(lines, num_bullet_points, bullets)
+
+        formatted = []
+        next_line = fill(lines[0]) if lines else None
+        for i in range(len(lines)):
+            line = next_line.strip()
+            next_line = fill(lines[i + 1]) if i + 1 < len(lines) else None
+            if not line:
+                continue
+
+            formatted.append(line)
+            if self._ends_section(line, next_line):
+                formatted.append("")
+
+        if formatted and not formatted[-1]:
+            formatted.pop()
+        return '\n'.join(formatted)
+
+_post_processor = MailPostProcessor()
+
+def get_post_processor():
+    """Shared processor; stateless, so safe across sessions and bulk worker threads"""
+    return _post_processor
+
+def fix_bullet_count(content, num_bullet_points, company_name):
+    return '\n'.join(_post_processor.fix_bullets(content.split('\n'), num_bullet_points))
 
+@traced("post_process")
 def post_process_mail(generated_mail, coordinator_name, coordinator_phone, selected_coordinator, company_name=None, num_bullet_points=6):
-    if "---" in generated_mail:
-        parts = generated_mail.split("---")
-        if len(parts) >= 3:
-            generated_mail = parts[1].strip()
-        elif len(parts) == 2:
-            generated_mail = parts[1].strip()
-    
-    lines = generated_mail.split('\n')
-    cleaned_lines = []
-    start_processing = False
-    
-    for line in lines:
-        line = line.strip()
-        if any(phrase in line.lower() for phrase in [
-            "here is the corrected", "here's the corrected", "here is the email",
-            "here's the email", "follows all specifications", "that follows all"
-        ]):
-            continue
-        if line.startswith("Dear Recruitment Team"):
-            start_processing = True
-        
-        if start_processing and line:
-            cleaned_lines.append(line)
-    
-    if cleaned_lines:
-        generated_mail = '\n'.join(cleaned_lines)
-    
-    if company_name:
-        generated_mail = fix_bullet_count(generated_mail, num_bullet_points, company_name)
-    
-    processed_mail = generated_mail.replace("[COORDINATOR_EMAIL]", selected_coordinator['email'])
-    processed_mail = processed_mail.replace("[COORDINATOR_NAME]", coordinator_name)
-    processed_mail = processed_mail.replace("[COORDINATOR_PHONE]", coordinator_phone)
-    
-    # Get department from selected_coordinator, fallback to 'Department' if not found
-    department = selected_coordinator.get('department', 'Department')
-    processed_mail = processed_mail.replace("[COORDINATOR_DEPARTMENT]", department)
-    
-    lines = processed_mail.split('\n')
-    formatted_lines = []
-    
-    for i, line in enumerate(lines):
-        line = line.strip()
-        if not line:
-            continue
-            
-        formatted_lines.append(line)
-        
-        if (line.startswith("Dear Recruitment Team,") or 
-            line.startswith("Greetings from the Jadavpur University Placement Cell!") or
-            line.endswith("across:") or
-            (line.startswith("✅") and i < len(lines) - 1 and not lines[i + 1].strip().startswith("✅")) or
-            line.endswith("requirements.") or
-            line.endswith("team.") or
-            line.endswith("needs.") or
-            "collaboration with" in line.lower() or
-            line.startswith("📧 CC:") or
-            "We look forward to" in line):
-            
-            formatted_lines.append("")
-    
-    processed_mail = '\n'.join(formatted_lines)
-    processed_mail = re.sub(r'\n\s*\n\s*\n+', '\n\n', processed_mail)
-    processed_mail = processed_mail.strip()
-    
-    return processed_mail
\ No newline at end of file
+    return _post_processor.process(
+        generated_mail, coordinator_name, coordinator_phone, selected_coordinator, company_name, num_bullet_points
+    )
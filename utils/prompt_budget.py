@@ -0,0 +1,68 @@
+import threading
+from collections import deque
+from utils.metrics import LLM_TOKENS
+
+# Chat formats add a few framing tokens per message
+MESSAGE_OVERHEAD_TOKENS = 4
+USAGE_HISTORY_SIZE = 200
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _encoding = None
+
+def estimate_tokens(text):
+    """Token count of text; exact with tiktoken installed, otherwise a ~4 chars/token estimate"""
+    if not text:
+        return 0
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    return max(1, (len(text) + 3) // 4)
+
+def count_message_tokens(messages):
+    return sum(estimate_tokens(m.get('content', '')) + MESSAGE_OVERHEAD_TOKENS for m in messages)
+
+_lock = threading.Lock()
+_history = deque(maxlen=USAGE_HISTORY_SIZE)
+
+def record_prompt_usage(label, messages, usage=None):
+    """Remember the input size of one request; usage is the API's usage object when available.
+
+    Returns the recorded entry (label, estimated, prompt_tokens, cached_tokens).
+    """
+    entry = {
+        'label': label,
+        'estimated': count_message_tokens(messages),
+        'prompt_tokens': getattr(usage, 'prompt_tokens', None),
+        'cached_tokens': getattr(getattr(usage, 'prompt_tokens_details', None), 'cached_tokens', None),
+    }
+    with _lock:
+        _history.append(entry)
+
+    measured = entry['prompt_tokens'] if entry['prompt_tokens'] is not None else f"~{entry['estimated']}"
+    cached = f", {entry['cached_tokens']} cached" if entry['cached_tokens'] else ""
+    print(f"{label}: {measured} input tokens{cached}")
+    return entry
+
+def record_completion_tokens(messages, content, usage=None):
+    """Add one finished completion to the process-wide token counters"""
+    prompt_tokens = getattr(usage, 'prompt_tokens', None)
+    completion_tokens = getattr(usage, 'completion_tokens', None)
+    LLM_TOKENS.inc(prompt_tokens if prompt_tokens is not None else count_message_tokens(messages), kind="prompt")
+    LLM_TOKENS.inc(completion_tokens if completion_tokens is not None else estimate_tokens(content), kind="completion")
+
+def get_prompt_token_stats():
+    """Average and last input tokens per request, preferring API-reported counts"""
+    with _lock:
+        history = list(_history)
+
+    if not history:
+        return {'requests': 0, 'average': None, 'last': None}
+
+    counts = [e['prompt_tokens'] if e['prompt_tokens'] is not None else e['estimated'] for e in history]
+    return {
+        'requests': len(counts),
+        'average': sum(counts) / len(counts),
+        'last': counts[-1],
+    }
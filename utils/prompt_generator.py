@@ -1,113 +1,88 @@
-# Updated validation prompt with clearer spacing instructions
-def create_validation_prompt(generated_email, coordinator_name, coordinator_phone, coordinator_email, company_name, department):
-    """Create a validation prompt to ensure the email follows exact requirements with proper spacing"""
-    return f"""
-You are a quality assurance specialist for professional emails. Review and refine the following recruitment email to ensure it meets EXACT requirements:
-
-GENERATED EMAIL:
-{generated_email}
-
-REQUIRED SPECIFICATIONS:
-1. **Email Structure**: Must contain exactly these email addresses:
-   - Primary: officer.placement@jadavpuruniversity.in, jupgcsit2026@gmail.com
-   - CC: {coordinator_email}
-
-2. **Signature Block**: Must end with exactly:
-   Best Regards,
-   {coordinator_name}
-   Placement Coordinator, {department}
-   Jadavpur Placement Cell
-   📞 {coordinator_phone}
-
-3. **Length**: Keep it concise and professional (around 200-300 words)
-
-4. **Formatting**: Use proper spacing between sections for readability:
-   - Greeting section (Dear + Greetings) - then gap
-   - Company invitation paragraph - then gap
-   - NAAC/NIRF paragraph - then gap
-   - Skills list (5-7 ✅ short and concise (2-4 words) bullets) - then gap
-   - Closing paragraph - then gap
-   - Contact information - then gap
-   - Signature block
-
-5. **Structure**: Must follow this exact format with proper spacing:
-   Dear Recruitment Team,
-   Greetings from the Jadavpur University Placement Cell!
-   
-   [Company-specific invitation paragraph - KEEP SHORT]
-   
-   [NAAC/NIRF paragraph with rankings]
-   
-   [Skills list with 5-7 ✅ bullets - each on new line]
-   
-   [Brief closing paragraph about collaboration]
-   
-   [Contact information with exact emails]
-   
-   [Signature block with {department}]
-
-6. **Company Name**: Must be "{company_name}" throughout
-
-IMPORTANT: 
-- Use blank lines between major sections for better readability
-- Keep skills list items on separate lines without gaps between them
-- Return ONLY the clean email content without any introductory text, headers, footers, or "---" markers
-- Start directly with "Dear Recruitment Team," and end with the signature block
-- Ensure proper visual separation between different content sections
-- Department must be "{department}" in the signature block
-"""
-
-# Updated improved prompt with better spacing guidance and department parameter
-def create_improved_prompt(company_name, additional_info, base_message, num_bullet_points=6, department="Department"):
-    """Create an improved prompt for better email generation with proper spacing and dynamic department"""
-    
-    # Generate the bullet point template based on num_bullet_points
-    bullet_template = "\n".join([f"✅ [Skill {i+1} relevant to {company_name}]" for i in range(num_bullet_points)])
-    
-    return f"""
-You are a professional placement officer at Jadavpur University {department} department. Write a complete, personalized invitation email for campus recruitment.
-
-Company: {company_name}
-Additional Context: {additional_info or "General recruitment invitation"}
+# The system prompts below are static so every request shares the same prefix,
+# which providers can cache. Everything that varies per request goes in the
+# short user message built by the functions further down.
 
-CRITICAL INSTRUCTION: You MUST include exactly {num_bullet_points} bullet points in the skills section. No more, no less.
+NAAC_PARAGRAPH = (
+    "Being a NAAC A-Grade Tier-1 institution and consistently ranked among the top engineering "
+    "and research universities in India (NIRF 2024: 2nd State University, 12th in Engineering), "
+    "our students bring strong expertise across:"
+)
 
-Write a CONCISE email following this EXACT structure with PROPER SPACING (keep it under 300 words):
-
-Dear Recruitment Team,
+EMAIL_STRUCTURE = f"""Dear Recruitment Team,
 Greetings from the Jadavpur University Placement Cell!
 
-[Write 1-2 SHORT sentences about inviting {company_name} specifically - be concise]
+[1-2 short sentences inviting the company specifically]
 
-Being a NAAC A-Grade Tier-1 institution and consistently ranked among the top engineering and research universities in India (NIRF 2024: 2nd State University, 12th in Engineering), our students bring strong expertise across:
+{NAAC_PARAGRAPH}
 
-{bullet_template}
+✅ [2-4 word skill relevant to the company's industry]
+[... one line per bullet, no blank lines between bullets]
 
-[Write 1 SHORT sentence about why our students would be perfect for {company_name}]
+[1 short sentence on why our students suit the company]
 
-For coordination, please feel free to reach out:  
-📧 Email: officer.placement@jadavpuruniversity.in, jupgcsit2026@gmail.com 
+For coordination, please feel free to reach out:
+📧 Email: officer.placement@jadavpuruniversity.in, jupgcsit2026@gmail.com
 📧 CC: [COORDINATOR_EMAIL]
 
-We look forward to a fruitful collaboration with {company_name}!
-
-Best Regards,  
-[COORDINATOR_NAME]  
-Placement Coordinator, [COORDINATOR_DEPARTMENT]  
-Jadavpur Placement Cell  
-📞 [COORDINATOR_PHONE]
-
-MANDATORY REQUIREMENTS:
-- EXACTLY {num_bullet_points} bullet points starting with ✅ in the skills section
-- Use blank lines between major sections for readability
-- Skills should be listed without gaps between individual items
-- Professional spacing that makes the email easy to scan
-- Make skills specific to {company_name}'s industry
-- Keep sentences short and direct
-- Professional tone but engaging
-- Total length around 200-300 words
-- Return ONLY the email content, no extra text or markers
-- Department in signature must be the coordinator's department: {department}
-
-REMEMBER: The skills section must contain exactly {num_bullet_points} bullet points. Count them carefully!
-"""
\ No newline at end of file
+We look forward to a fruitful collaboration with [COMPANY]!
+
+Best Regards,
+[COORDINATOR_NAME]
+Placement Coordinator, [COORDINATOR_DEPARTMENT]
+Jadavpur Placement Cell
+📞 [COORDINATOR_PHONE]"""
+
+OUTPUT_RULES = """Rules:
+- Use exactly the number of ✅ bullets requested - count them.
+- One blank line between sections; none inside the bullet list.
+- 200-300 words, short direct sentences, professional but engaging.
+- Return only the email, starting with "Dear Recruitment Team," - no preamble, headers or "---" markers."""
+
+GENERATION_SYSTEM_PROMPT = f"""You are a placement officer at Jadavpur University writing personalized campus recruitment invitations.
+Write the email in exactly this structure. Fill in [COMPANY] and the bracketed descriptions; keep the
+[COORDINATOR_...] placeholders as they are:
+
+{EMAIL_STRUCTURE}
+
+{OUTPUT_RULES}"""
+
+VALIDATION_SYSTEM_PROMPT = f"""You are a meticulous quality checker for recruitment invitation emails.
+Fix the email you are given so it follows this structure exactly, keeping its personalized content:
+
+{EMAIL_STRUCTURE}
+
+Replace every placeholder with the details provided, use the company name exactly as given, and keep the emails
+officer.placement@jadavpuruniversity.in and jupgcsit2026@gmail.com plus the coordinator's email as CC.
+
+{OUTPUT_RULES}"""
+
+def create_validation_prompt(generated_email, coordinator_name, coordinator_phone, coordinator_email, company_name, department, num_bullet_points=6):
+    """Per-request part of the validation call: the required details and the draft to fix"""
+    return f"""Company: {company_name}
+Bullets: {num_bullet_points}
+Coordinator: {coordinator_name}, {coordinator_email}, {coordinator_phone}
+Department: {department}
+
+EMAIL:
+{generated_email}"""
+
+def create_improved_prompt(company_name, additional_info, base_message, num_bullet_points=6, department="Department"):
+    """Per-request part of the generation call: company, context, department and bullet count"""
+    return f"""Company: {company_name}
+Context: {additional_info or "General recruitment invitation"}
+Department: {department}
+Bullets: exactly {num_bullet_points}, specific to {company_name}'s industry"""
+
+def build_generation_messages(company_name, additional_info, base_message, num_bullet_points=6, department="Department"):
+    return [
+        {"role": "system", "content": GENERATION_SYSTEM_PROMPT},
+        {"role": "user", "content": create_improved_prompt(company_name, additional_info, base_message, num_bullet_points, department)},
+    ]
+
+def build_validation_messages(generated_email, coordinator_name, coordinator_phone, coordinator_email, company_name, department, num_bullet_points=6):
+    return [
+        {"role": "system", "content": VALIDATION_SYSTEM_PROMPT},
+        {"role": "user", "content": create_validation_prompt(
+            generated_email, coordinator_name, coordinator_phone, coordinator_email, company_name, department, num_bullet_points
+        )},
+    ]
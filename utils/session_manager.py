@@ -21,7 +21,9 @@ def clear_user_session():
         'otp_sent',
         'otp_send_time',
         'login_step',
-        'verified_user'
+        'verified_user',
+        'outbox_ids',
+        'mail_history'
     ]
     
     for key in keys_to_clear:
@@ -0,0 +1,171 @@
+import os
+import time
+import atexit
+import smtplib
+import threading
+from contextlib import contextmanager
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DEFAULT_SMTP_HOST = "smtp.gmail.com"
+DEFAULT_SMTP_PORT = 587
+DEFAULT_MAX_CONNECTIONS = 3
+# Gmail closes idle sessions after a few minutes; recycle ours before that happens
+DEFAULT_IDLE_TIMEOUT = 240
+DEFAULT_ACQUIRE_TIMEOUT = 30
+
+class SMTPConnectionPool:
+    """Keeps authenticated SMTP sessions alive so STARTTLS and AUTH are paid once per connection"""
+
+    def __init__(self, host=DEFAULT_SMTP_HOST, port=DEFAULT_SMTP_PORT, max_connections=DEFAULT_MAX_CONNECTIONS,
+                 idle_timeout=DEFAULT_IDLE_TIMEOUT, acquire_timeout=DEFAULT_ACQUIRE_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self.acquire_timeout = acquire_timeout
+
+        self._condition = threading.Condition()
+        self._idle = {}
+        self._open_count = 0
+
+    def _connect(self, sender_email, sender_password):
+        server = smtplib.SMTP(self.host, self.port, timeout=self.acquire_timeout)
+        try:
+            server.starttls()
+            server.login(sender_email, sender_password)
+        except Exception:
+            self._close_quietly(server)
+            raise
+        return server
+
+    @staticmethod
+    def _close_quietly(server):
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _is_healthy(server):
+        try:
+            return server.noop()[0] == 250
+        except Exception:
+            return False
+
+    def acquire(self, sender_email, sender_password):
+        """Return a live, logged-in connection for the given credentials.
+
+        The lock only guards the bookkeeping: a popped idle connection keeps its
+        slot while it is checked (NOOP) or closed (QUIT) outside the lock, so a
+        slow or dead socket never stalls other senders.
+        """
+        key = (sender_email, sender_password)
+        deadline = time.monotonic() + self.acquire_timeout
+
+        while True:
+            with self._condition:
+                while True:
+                    idle = self._idle.get(key)
+                    if idle:
+                        server, last_used = idle.pop()
+                        break
+                    if self._open_count < self.max_connections:
+                        self._open_count += 1
+                        server, last_used = None, None
+                        break
+                    # Take over the slot of another sender's idle connection
+                    server = self._pop_other_idle()
+                    if server is not None:
+                        last_used = None
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError("Timed out waiting for a free SMTP connection")
+                    self._condition.wait(remaining)
+
+            if server is None:
+                break
+            if last_used is not None and time.monotonic() - last_used < self.idle_timeout and self._is_healthy(server):
+                return server
+            # Stale, broken or evicted: close it and reuse its slot for a new connection
+            self._close_quietly(server)
+            break
+
+        try:
+            return self._connect(sender_email, sender_password)
+        except Exception:
+            self._free_slot()
+            raise
+
+    def _pop_other_idle(self):
+        # Caller holds the lock; the returned connection keeps its slot
+        for idle in self._idle.values():
+            if idle:
+                server, _ = idle.pop(0)
+                return server
+        return None
+
+    def _free_slot(self):
+        with self._condition:
+            self._open_count -= 1
+            self._condition.notify()
+
+    def release(self, server, sender_email, sender_password, healthy=True):
+        """Return a connection to the pool, or discard it if it is broken"""
+        if not healthy:
+            self._close_quietly(server)
+            self._free_slot()
+            return
+
+        with self._condition:
+            self._idle.setdefault((sender_email, sender_password), []).append((server, time.monotonic()))
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self, sender_email, sender_password):
+        server = self.acquire(sender_email, sender_password)
+        healthy = True
+        try:
+            yield server
+        except (smtplib.SMTPServerDisconnected, smtplib.SMTPResponseException, OSError):
+            healthy = False
+            raise
+        finally:
+            self.release(server, sender_email, sender_password, healthy)
+
+    def close_all(self):
+        with self._condition:
+            servers = [server for idle in self._idle.values() for server, _ in idle]
+            self._idle.clear()
+
+        for server in servers:
+            self._close_quietly(server)
+
+        with self._condition:
+            self._open_count -= len(servers)
+            self._condition.notify_all()
+
+_smtp_pool = None
+_smtp_pool_lock = threading.Lock()
+
+def get_smtp_pool():
+    """Return the process-wide SMTP pool, configured from environment variables"""
+    global _smtp_pool
+
+    if _smtp_pool is None:
+        with _smtp_pool_lock:
+            if _smtp_pool is None:
+                _smtp_pool = SMTPConnectionPool(
+                    host=os.getenv("SMTP_HOST", DEFAULT_SMTP_HOST),
+                    port=int(os.getenv("SMTP_PORT", DEFAULT_SMTP_PORT)),
+                    max_connections=int(os.getenv("SMTP_POOL_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)),
+                    idle_timeout=int(os.getenv("SMTP_POOL_IDLE_TIMEOUT", DEFAULT_IDLE_TIMEOUT))
+                )
+                atexit.register(_smtp_pool.close_all)
+
+    return _smtp_pool
@@ -0,0 +1,95 @@
+import os
+import re
+import json
+import threading
+from functools import lru_cache
+
+# {name} is a slot, {{ and }} are literal braces; any other brace is kept as text
+_TOKEN_PATTERN = re.compile(r'\{\{|\}\}|\{([A-Za-z_][A-Za-z0-9_]*)\}')
+
+COMPILED_TEMPLATE_CACHE_SIZE = 256
+
+class TemplateError(ValueError):
+    """A template uses unknown placeholders or is rendered without all its values"""
+
+class CompiledTemplate:
+    """A template parsed once into literal and slot segments; render() is a single join"""
+
+    __slots__ = ('source', 'placeholders', '_parts', '_slots')
+
+    def __init__(self, source, allowed_placeholders=None):
+        parts = []
+        slots = []
+        literal = []
+        position = 0
+
+        for match in _TOKEN_PATTERN.finditer(source):
+            literal.append(source[position:match.start()])
+            position = match.end()
+            name = match.group(1)
+            if name is None:
+                literal.append(match.group()[0])
+                continue
+
+            parts.append("".join(literal))
+            literal = []
+            slots.append((len(parts), name))
+            parts.append(None)
+
+        literal.append(source[position:])
+        parts.append("".join(literal))
+
+        self.source = source
+        self.placeholders = frozenset(name for _, name in slots)
+        self._parts = tuple(parts)
+        self._slots = tuple(slots)
+
+        if allowed_placeholders is not None:
+            unknown = self.placeholders - set(allowed_placeholders)
+            if unknown:
+                raise TemplateError(f"Unknown placeholders: {', '.join('{' + n + '}' for n in sorted(unknown))}")
+
+    def render(self, values):
+        parts = list(self._parts)
+        try:
+            for index, name in self._slots:
+                parts[index] = str(values[name])
+        except KeyError:
+            missing = sorted(self.placeholders - set(values))
+            raise TemplateError(f"Missing values for placeholders: {', '.join(missing)}") from None
+        return "".join(parts)
+
+@lru_cache(maxsize=COMPILED_TEMPLATE_CACHE_SIZE)
+def _compile_cached(source, allowed_placeholders):
+    return CompiledTemplate(source, allowed_placeholders)
+
+def compile_template(source, allowed_placeholders=None):
+    """Compiled template for a string, reused for identical (source, allowed) pairs"""
+    allowed = frozenset(allowed_placeholders) if allowed_placeholders is not None else None
+    return _compile_cached(source, allowed)
+
+_file_cache = {}
+_file_cache_lock = threading.Lock()
+
+def load_template_file(path, field=None, allowed_placeholders=None):
+    """Compiled template from a file, re-parsed only when its mtime changes.
+
+    With field set the file is JSON and the template is that key's value.
+    Raises OSError, json.JSONDecodeError or TemplateError when the file is
+    missing, malformed or uses placeholders outside allowed_placeholders.
+    """
+    mtime = os.stat(path).st_mtime_ns
+    key = (os.path.abspath(path), field, frozenset(allowed_placeholders) if allowed_placeholders is not None else None)
+
+    with _file_cache_lock:
+        cached = _file_cache.get(key)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+    with open(path, 'r', encoding='utf-8') as f:
+        source = json.load(f).get(field, '') if field else f.read()
+    template = CompiledTemplate(source, allowed_placeholders)
+
+    with _file_cache_lock:
+        _file_cache[key] = (mtime, template)
+    return template
@@ -0,0 +1,190 @@
+import os
+import json
+import time
+import threading
+import functools
+from collections import deque
+from contextlib import contextmanager
+from utils.metrics import LATENCY_BUCKETS, escape_label_value
+
+DEFAULT_TRACE_SINKS = "memory,prometheus"
+DEFAULT_TRACE_BUFFER_SIZE = 2000
+DEFAULT_TRACE_JSONL_PATH = os.path.join(".cache", "traces.jsonl")
+
+class RingBufferSink:
+    """Keeps the most recent spans in memory for the admin panel"""
+
+    def __init__(self, size=DEFAULT_TRACE_BUFFER_SIZE):
+        self._spans = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def emit(self, span):
+        with self._lock:
+            self._spans.append(span)
+
+    def spans(self, name=None):
+        with self._lock:
+            spans = list(self._spans)
+        return [s for s in spans if name is None or s['name'] == name]
+
+class JsonlSink:
+    """Appends one JSON line per span, for offline analysis"""
+
+    def __init__(self, path=DEFAULT_TRACE_JSONL_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def emit(self, span):
+        line = json.dumps(span, default=str, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + "\n")
+
+class PrometheusSink:
+    """Aggregates spans into per-stage latency histograms in Prometheus text format"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._stages = {}
+
+    def emit(self, span):
+        with self._lock:
+            stage = self._stages.get(span['name'])
+            if stage is None:
+                stage = self._stages[span['name']] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0, 'errors': 0}
+
+            for i, bound in enumerate(self.buckets):
+                if span['duration'] <= bound:
+                    stage['buckets'][i] += 1
+                    break
+            stage['sum'] += span['duration']
+            stage['count'] += 1
+            if not span['ok']:
+                stage['errors'] += 1
+
+    def render(self):
+        with self._lock:
+            stages = {name: dict(stage, buckets=list(stage['buckets'])) for name, stage in self._stages.items()}
+
+        lines = [
+            "# HELP letsconnect_stage_duration_seconds Time spent in each pipeline stage",
+            "# TYPE letsconnect_stage_duration_seconds histogram",
+        ]
+        for name in sorted(stages):
+            stage = stages[name]
+            label = escape_label_value(name)
+            cumulative = 0
+            for bound, count in zip(self.buckets, stage['buckets']):
+                cumulative += count
+                lines.append(f'letsconnect_stage_duration_seconds_bucket{{stage="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'letsconnect_stage_duration_seconds_bucket{{stage="{label}",le="+Inf"}} {stage["count"]}')
+            lines.append(f'letsconnect_stage_duration_seconds_sum{{stage="{label}"}} {stage["sum"]}')
+            lines.append(f'letsconnect_stage_duration_seconds_count{{stage="{label}"}} {stage["count"]}')
+
+        lines.append("# HELP letsconnect_stage_errors_total Pipeline stage calls that raised")
+        lines.append("# TYPE letsconnect_stage_errors_total counter")
+        for name in sorted(stages):
+            lines.append(f'letsconnect_stage_errors_total{{stage="{escape_label_value(name)}"}} {stages[name]["errors"]}')
+
+        return "\n".join(lines) + "\n"
+
+class Tracer:
+    """Times pipeline stages and hands each finished span to every sink.
+
+    A span is a plain dict: name, started_at (epoch seconds), duration
+    (seconds), ok, error and free-form attributes. A failing sink is reported
+    and skipped so tracing never breaks the traced code.
+    """
+
+    def __init__(self, sinks=None):
+        self.sinks = list(sinks or [])
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+
+    def find_sink(self, sink_type):
+        return next((s for s in self.sinks if isinstance(s, sink_type)), None)
+
+    def record(self, name, duration, ok=True, error=None, started_at=None, **attributes):
+        """Emit a span measured elsewhere (e.g. in a transport hook)"""
+        span = {
+            'name': name,
+            'started_at': started_at if started_at is not None else time.time() - duration,
+            'duration': duration,
+            'ok': ok,
+            'error': error,
+            'attributes': attributes,
+        }
+        self._emit(span)
+        return span
+
+    def _emit(self, span):
+        for sink in self.sinks:
+            try:
+                sink.emit(span)
+            except Exception as e:
+                print(f"Error emitting trace span to {type(sink).__name__}: {e}")
+
+    @contextmanager
+    def span(self, name, **attributes):
+        """Time the with-block; yields the span dict so callers can add attributes"""
+        span = {'name': name, 'started_at': time.time(), 'duration': None, 'ok': True, 'error': None, 'attributes': attributes}
+        started = time.perf_counter()
+        try:
+            yield span
+        # Only errors fail a span; Streamlit's rerun/stop, KeyboardInterrupt and GeneratorExit
+        # are BaseExceptions that pass through as control flow
+        except Exception as e:
+            span['ok'] = False
+            span['error'] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span['duration'] = time.perf_counter() - started
+            self._emit(span)
+
+def _create_sinks(names):
+    sinks = []
+    for name in names.split(','):
+        name = name.strip().lower()
+        if name == 'memory':
+            sinks.append(RingBufferSink(int(os.getenv("TRACE_BUFFER_SIZE", DEFAULT_TRACE_BUFFER_SIZE))))
+        elif name == 'jsonl':
+            sinks.append(JsonlSink(os.getenv("TRACE_JSONL_PATH", DEFAULT_TRACE_JSONL_PATH)))
+        elif name == 'prometheus':
+            sinks.append(PrometheusSink())
+        elif name:
+            print(f"Unknown trace sink '{name}' ignored")
+    return sinks
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+def get_tracer():
+    """Process-wide tracer with the sinks named in TRACE_SINKS (memory, jsonl, prometheus)"""
+    global _tracer
+
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = Tracer(_create_sinks(os.getenv("TRACE_SINKS", DEFAULT_TRACE_SINKS)))
+
+    return _tracer
+
+def span(name, **attributes):
+    """Shortcut for get_tracer().span(...)"""
+    return get_tracer().span(name, **attributes)
+
+def traced(name):
+    """Decorator wrapping every call of a function in a span"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator